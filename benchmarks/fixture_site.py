@@ -0,0 +1,115 @@
+import os
+import json
+from html import escape
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+from typing import Dict, Any, List
+
+
+SITE_DIR = os.path.join(os.path.dirname(__file__), "site")
+
+with open(os.path.join(SITE_DIR, "layout.html"), encoding="utf-8") as _f:
+    LAYOUT = _f.read()
+
+with open(os.path.join(SITE_DIR, "products.json"), encoding="utf-8") as _f:
+    PRODUCTS: List[Dict[str, Any]] = json.load(_f)
+
+STATIC_TYPES = {".js": "application/javascript; charset=utf-8", ".css": "text/css; charset=utf-8"}
+
+
+def _product_card(product: Dict[str, Any]) -> str:
+    return (
+        f'<article class="product-card" data-chg-product-id="{product["id"]}">'
+        f'<a class="product-card__title" href="/product/{product["id"]}">{escape(product["title"])}</a>'
+        f'<div class="product-card__author">{escape(product["author"])}</div>'
+        f'<span class="product-price__value">{product["price"]} ₽</span>'
+        f'<button class="chg-app-button" type="button"><div class="chg-app-button__content">Купить</div></button>'
+        f'</article>'
+    )
+
+
+def search(query: str) -> List[Dict[str, Any]]:
+    """Товары, в названии или авторе которых есть все слова запроса"""
+    words = query.lower().split()
+    return [
+        product for product in PRODUCTS
+        if all(word in f"{product['title']} {product['author']}".lower() for word in words)
+    ]
+
+
+class FixtureSiteHandler(BaseHTTPRequestHandler):
+    """
+    Статический сайт-стенд с разметкой, совместимой с page object
+    
+    Страницы: главная, /search?q=, /product/<id> и /cart (корзина
+    хранится в localStorage браузера), /static/<файл>.
+    """
+    
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    
+    def do_GET(self) -> None:
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query).get("q", [""])[0]
+        path = parts.path.rstrip("/") or "/"
+        
+        if path == "/":
+            cards = "".join(_product_card(product) for product in PRODUCTS[:8])
+            self._page("Главная", f'<h1>Популярные книги</h1><section class="products">{cards}</section>')
+        elif path == "/search":
+            found = search(query)
+            if found:
+                content = (
+                    f'<h1 class="search-title__head">Результаты поиска «{escape(query)}»</h1>'
+                    f'<section class="products">{"".join(_product_card(product) for product in found)}</section>'
+                )
+            else:
+                content = f'<div class="search-empty">По запросу «{escape(query)}» ничего не найдено</div>'
+            self._page("Поиск", content, query=query)
+        elif path.startswith("/product/"):
+            product = next((item for item in PRODUCTS if str(item["id"]) == path.rsplit("/", 1)[-1]), None)
+            if product is None:
+                self._send(404, "text/plain; charset=utf-8", "Not Found")
+                return
+            payload = escape(json.dumps(product, ensure_ascii=False))
+            self._page(product["title"], (
+                f'<h1 class="product-detail__title">{escape(product["title"])}</h1>'
+                f'<div class="product-detail__author">{escape(product["author"])}</div>'
+                f'<span class="product-price__value">{product["price"]} ₽</span>'
+                f'<button class="chg-app-button" type="button" onclick="addToCart(JSON.parse(this.dataset.product))" '
+                f'data-product="{payload}"><div class="chg-app-button__content">Купить</div></button>'
+            ))
+        elif path == "/cart":
+            self._page(
+                "Корзина",
+                '<h1>Корзина</h1><div class="cart-list"></div><div class="cart-total"></div>',
+                scripts='<script src="/static/cart.js"></script>'
+            )
+        elif path.startswith("/static/"):
+            file_name = os.path.basename(path)
+            file_path = os.path.join(SITE_DIR, file_name)
+            extension = os.path.splitext(file_name)[1]
+            if extension not in STATIC_TYPES or not os.path.isfile(file_path):
+                self._send(404, "text/plain; charset=utf-8", "Not Found")
+                return
+            with open(file_path, encoding="utf-8") as f:
+                self._send(200, STATIC_TYPES[extension], f.read())
+        else:
+            self._send(404, "text/plain; charset=utf-8", "Not Found")
+    
+    def _page(self, title: str, content: str, query: str = "", scripts: str = "") -> None:
+        self._send(200, "text/html; charset=utf-8", LAYOUT.format(
+            title=escape(title), query=escape(query), content=content, scripts=scripts
+        ))
+    
+    def _send(self, status: int, content_type: str, body: str) -> None:
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def log_message(self, format: str, *args) -> None:
+        pass
@@ -0,0 +1,274 @@
+"""
+Бенчмарк фреймворка на локальном сайте-стенде (headless Chrome)
+
+Сценарии: главная страница, поиск, извлечение результатов, добавление
+в корзину, проверка корзины. Для каждого сценария измеряются время,
+число команд WebDriver, пик памяти Python (tracemalloc) и JS heap
+страницы. Результаты сравниваются с benchmarks/baselines.json.
+
+    python -m benchmarks.run --iterations 5
+    python -m benchmarks.run --iterations 10 --update-baseline
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Dict, Any, List, Callable, Optional
+from config.settings import settings
+from utils.local_server import LocalServer
+from utils.stats import summarize
+from benchmarks.fixture_site import FixtureSiteHandler
+
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baselines.json")
+SEARCH_QUERY = "гарри поттер"
+
+
+class CommandCounter:
+    """Слушатель CommandInterceptor, считающий команды WebDriver"""
+    
+    def __init__(self):
+        self.count = 0
+    
+    def on_command(self, command, params, response, elapsed) -> None:
+        self.count += 1
+
+
+class Flows:
+    """Сценарии бенчмарка; выполняются по порядку, каждый продолжает предыдущий"""
+    
+    def __init__(self, driver, base_url: str):
+        from pages.main_page import MainPage
+        from pages.search_page import SearchPage
+        from pages.cart_page import CartPage
+        
+        self.base_url = base_url
+        self.main_page = MainPage(driver)
+        self.search_page = SearchPage(driver)
+        self.cart_page = CartPage(driver)
+    
+    def open_home(self) -> None:
+        self.main_page.open(self.base_url)
+    
+    def search(self) -> None:
+        self.main_page.search_for(SEARCH_QUERY)
+        if not self.search_page.wait_for_search_results():
+            raise AssertionError("Результаты поиска не загрузились")
+        self.search_page.wait_until_ready()
+    
+    def extract_results(self) -> None:
+        if not self.search_page.get_products():
+            raise AssertionError("Не найдено ни одного товара")
+    
+    def add_to_cart(self) -> None:
+        self.search_page.add_to_cart_by_index(0)
+    
+    def inspect_cart(self) -> None:
+        self.main_page.open_cart()
+        self.cart_page.wait_until_ready()
+        if not self.cart_page.get_cart_items():
+            raise AssertionError("Корзина пуста после добавления товара")
+    
+    def steps(self) -> List[tuple]:
+        return [
+            ("open_home", self.open_home),
+            ("search", self.search),
+            ("extract_results", self.extract_results),
+            ("add_to_cart", self.add_to_cart),
+            ("inspect_cart", self.inspect_cart)
+        ]
+
+
+def _js_heap_kb(driver) -> float:
+    """Используемый JS heap страницы в КБ (0, если метрика недоступна)"""
+    try:
+        metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+    except Exception:
+        return 0.0
+    used = next((metric["value"] for metric in metrics if metric["name"] == "JSHeapUsedSize"), 0)
+    return round(used / 1024, 1)
+
+
+def _measure(driver, counter: CommandCounter, action: Callable[[], None]) -> Dict[str, float]:
+    """Выполнить сценарий и снять метрики"""
+    tracemalloc.reset_peak()
+    commands_before = counter.count
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        action()
+    wall = time.perf_counter() - start
+    return {
+        "wall": round(wall, 4),
+        "commands": counter.count - commands_before,
+        "py_peak_kb": round(tracemalloc.get_traced_memory()[1] / 1024, 1),
+        "js_heap_kb": _js_heap_kb(driver)
+    }
+
+
+def run(iterations: int, warmup: int = 1) -> Dict[str, Dict[str, Any]]:
+    """
+    Запустить сценарии на сайте-стенде
+    
+    Args:
+        iterations: Число измеряемых повторов
+        warmup: Число повторов прогрева (не учитываются)
+        
+    Returns:
+        Dict[str, Dict[str, Any]]: Сценарий -> wall (count, min, max, mean, p50, p95),
+        commands (медиана), py_peak_kb и js_heap_kb (максимум)
+    """
+    from utils.driver_factory import DriverFactory
+    from utils.command_interceptor import CommandInterceptor
+    
+    settings.HEADLESS = True
+    settings.BLOCK_RESOURCES = False
+    samples: Dict[str, List[Dict[str, float]]] = {}
+    
+    with LocalServer(FixtureSiteHandler) as server:
+        settings.BASE_URL = server.url
+        driver = DriverFactory.create_chrome_driver(warm_profile=False)
+        try:
+            counter = CommandCounter()
+            CommandInterceptor.install(driver).add_listener(counter)
+            driver.execute_cdp_cmd("Performance.enable", {})
+            tracemalloc.start()
+            
+            for iteration in range(warmup + iterations):
+                driver.get(server.url)
+                driver.execute_script("localStorage.clear();")
+                for name, action in Flows(driver, server.url).steps():
+                    metrics = _measure(driver, counter, action)
+                    if iteration >= warmup:
+                        samples.setdefault(name, []).append(metrics)
+        finally:
+            tracemalloc.stop()
+            DriverFactory.close_driver(driver)
+    
+    results = {}
+    for name, runs in samples.items():
+        commands = sorted(run["commands"] for run in runs)
+        results[name] = {
+            "wall": {key: round(value, 4) for key, value in summarize([run["wall"] for run in runs], (50, 95)).items()},
+            "commands": commands[len(commands) // 2],
+            "py_peak_kb": max(run["py_peak_kb"] for run in runs),
+            "js_heap_kb": max(run["js_heap_kb"] for run in runs)
+        }
+    return results
+
+
+def baseline_metrics(result: Dict[str, Any]) -> Dict[str, float]:
+    """Метрики сценария, которые сравниваются с базовой линией"""
+    return {
+        "wall": result["wall"]["p50"],
+        "commands": result["commands"],
+        "py_peak_kb": result["py_peak_kb"],
+        "js_heap_kb": result["js_heap_kb"]
+    }
+
+
+def load_baseline(path: str = BASELINE_FILE) -> Optional[Dict[str, Any]]:
+    """Загрузить базовую линию (None, если ее нет)"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_baseline(results: Dict[str, Dict[str, Any]], iterations: int, path: str = BASELINE_FILE) -> None:
+    """Сохранить результаты как базовую линию"""
+    baseline = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "iterations": iterations,
+        "flows": {name: baseline_metrics(result) for name, result in results.items()}
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2)
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any],
+            threshold: float) -> List[Dict[str, Any]]:
+    """
+    Найти регрессии относительно базовой линии
+    
+    Args:
+        results: Результаты run()
+        baseline: Базовая линия из load_baseline()
+        threshold: Допустимый рост метрики (0.2 - на 20%)
+        
+    Returns:
+        List[Dict[str, Any]]: Регрессии: flow, metric, baseline, current, change
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get("flows", {}).get(name)
+        if not expected:
+            continue
+        for metric, current in baseline_metrics(result).items():
+            reference = expected.get(metric)
+            if not reference:
+                continue
+            change = (current - reference) / reference
+            if change > threshold:
+                regressions.append({
+                    "flow": name,
+                    "metric": metric,
+                    "baseline": reference,
+                    "current": current,
+                    "change": round(change, 3)
+                })
+    return regressions
+
+
+def format_results(results: Dict[str, Dict[str, Any]], baseline: Optional[Dict[str, Any]]) -> str:
+    """Таблица результатов с изменением медианы времени относительно базовой линии"""
+    lines = [f"{'сценарий':<16} {'p50, c':>8} {'p95, c':>8} {'команд':>7} {'py, КБ':>9} {'js, КБ':>9} {'Δ p50':>8}"]
+    for name, result in results.items():
+        reference = (baseline or {}).get("flows", {}).get(name, {}).get("wall")
+        delta = f"{(result['wall']['p50'] - reference) / reference:+.0%}" if reference else "-"
+        lines.append(
+            f"{name:<16} {result['wall']['p50']:>8.3f} {result['wall']['p95']:>8.3f} {result['commands']:>7} "
+            f"{result['py_peak_kb']:>9.1f} {result['js_heap_kb']:>9.1f} {delta:>8}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк фреймворка на локальном сайте-стенде")
+    parser.add_argument("--iterations", type=int, default=5, help="Число измеряемых повторов")
+    parser.add_argument("--warmup", type=int, default=1, help="Число повторов прогрева")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Допустимый рост метрики (0.2 = 20%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="Сохранить результаты как базовую линию")
+    args = parser.parse_args(argv)
+    
+    results = run(args.iterations, args.warmup)
+    baseline = load_baseline()
+    regressions = compare(results, baseline, args.threshold) if baseline else []
+    
+    print(format_results(results, baseline))
+    os.makedirs(settings.REPORTS_DIR, exist_ok=True)
+    with open(os.path.join(settings.REPORTS_DIR, "benchmark.json"), "w", encoding="utf-8") as f:
+        json.dump({"results": results, "regressions": regressions}, f, ensure_ascii=False, indent=2)
+    
+    if args.update_baseline:
+        save_baseline(results, args.iterations)
+        print(f"Базовая линия сохранена: {BASELINE_FILE}")
+        return 0
+    if baseline is None:
+        print("Базовой линии нет, сохраните ее с --update-baseline")
+        return 0
+    for regression in regressions:
+        print(
+            f"РЕГРЕССИЯ {regression['flow']}.{regression['metric']}: "
+            f"{regression['baseline']} -> {regression['current']} ({regression['change']:+.0%})"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
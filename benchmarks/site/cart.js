@@ -0,0 +1,22 @@
+(function () {
+  const container = document.querySelector('.cart-list');
+  const cart = readCart();
+  if (!cart.length) {
+    container.innerHTML = '<div class="cart-empty">Ваша корзина пуста</div>';
+    return;
+  }
+  let total = 0;
+  for (const item of cart) {
+    total += item.price * item.quantity;
+    const row = document.createElement('div');
+    row.className = 'cart-item';
+    row.innerHTML =
+      '<a class="cart-item__title" href="/product/' + item.id + '"></a>' +
+      '<div class="cart-item__price"></div>' +
+      '<input type="number" min="1" value="' + item.quantity + '">';
+    row.querySelector('.cart-item__title').textContent = item.title;
+    row.querySelector('.cart-item__price').textContent = item.price + ' ₽';
+    container.appendChild(row);
+  }
+  document.querySelector('.cart-total').textContent = 'Итого: ' + total + ' ₽';
+})();
@@ -1,5 +1,5 @@
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 
 class Settings:
@@ -7,30 +7,179 @@ class Settings:
     
     BASE_URL: str = "https://www.chitai-gorod.ru"
     
-    API_SEARCH_URL: str = f"{BASE_URL}/search"
+    API_TIMEOUT: int = 10
+    API_POOL_SIZE: int = 10
+    API_MAX_RETRIES: int = 2
+    API_BACKOFF_FACTOR: float = 0.3
+    ASYNC_API_CONCURRENCY: int = 20
+    ASYNC_API_LIMIT_PER_HOST: int = 10
+    ASYNC_PROBE_MAX_ERROR_RATE: float = 0.05
+    ASYNC_PROBE_P95_LIMIT: float = 5.0
+    LOAD_RPS: float = 20
+    LOAD_CONCURRENCY: int = 10
+    LOAD_DURATION: float = 10
+    LOAD_STUB_DELAY: float = 0.005
+    LOAD_MAX_ERROR_RATE: float = 0.01
     
    
     IMPLICIT_WAIT: int = 5
     EXPLICIT_WAIT: int = 15
     PAGE_LOAD_TIMEOUT: int = 30
+    # "normal" - ждать load, "eager" - DOMContentLoaded, "none" - не ждать;
+    # в eager/none open() ждет только условия готовности страницы (READY_LOCATORS);
+    # PAGE_LOAD_STRATEGY=eager pytest ... - включить
+    PAGE_LOAD_STRATEGY: str = os.environ.get("PAGE_LOAD_STRATEGY", "normal")
+    SCRIPT_TIMEOUT: int = 30
+    
+    # Навигация: "ui" - через интерфейс (главная, каталог, поле поиска, кнопка корзины),
+    # "fast" - прямой переход по URL (utils/url_router.py), где путь через UI не проверяется
+    NAVIGATION_MODE: str = os.environ.get("NAVIGATION_MODE", "ui")
+    # Шаблоны адресов относительно BASE_URL ({query} и {slug} экранируются)
+    ROUTES: Dict[str, str] = {
+        "home": "/",
+        "search": "/search?phrase={query}",
+        "product": "/product/{slug}",
+        "cart": "/cart"
+    }
+    
+    ADAPTIVE_TIMEOUTS: bool = True
+    TIMEOUT_SAFETY_MARGIN: float = 1.5
+    TIMEOUT_FLOOR: float = 1.0
+    TIMING_MIN_SAMPLES: int = 5
+    TIMING_MAX_SAMPLES: int = 200
+    TEST_TIME_BUDGET: int = 300
+    
+    # "polling" - WebDriverWait, "mutation" - ожидание по MutationObserver за один вызов
+    WAIT_ENGINE: str = os.environ.get("WAIT_ENGINE", "polling")
     
     BROWSER: str = "chrome"
     HEADLESS: bool = False
     WINDOW_SIZE: str = "1920x1080"
     
-    CHROME_DRIVER_PATH: str = r"C:\Program Files\chromedriver-win64\chromedriver.exe"
+    CHROME_DRIVER_PATH: str = os.environ.get(
+        "CHROME_DRIVER_PATH", r"C:\Program Files\chromedriver-win64\chromedriver.exe"
+    )
+    
+    # Блокировка ресурсов, на которые тесты не смотрят (BLOCK_RESOURCES=0 - выключить)
+    BLOCK_RESOURCES: bool = os.environ.get("BLOCK_RESOURCES", "1") != "0"
+    BLOCKED_URL_PATTERNS: List[str] = [
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*mc.yandex.ru*",
+        "*an.yandex.ru*",
+        "*top-fwz1.mail.ru*",
+        "*vk.com/rtrg*",
+        "*connect.facebook.net*",
+        "*criteo.*",
+        "*flocktory.com*",
+        "*mindbox.ru*",
+        "*adriver.ru*"
+    ]
+    # Типы ресурсов: image, font, media, stylesheet, script
+    BLOCKED_RESOURCE_TYPES: List[str] = ["image", "font", "media"]
+    # Отчет о запросах по страницам из performance лога Chrome (RESOURCE_REPORT=1 - включить);
+    # размеры заблокированных URL известны после калибровочного запуска с BLOCK_RESOURCES=0
+    RESOURCE_REPORT: bool = os.environ.get("RESOURCE_REPORT", "0") == "1"
+    RESOURCE_SIZES_LIMIT: int = 5000
+    
+    # Теплый профиль: шаблон с принятыми cookie, выбранным регионом и прогретым кэшем (WARM_PROFILE=0 - выключить)
+    WARM_PROFILE: bool = os.environ.get("WARM_PROFILE", "1") != "0"
+    PROFILE_TEMPLATE_MAX_AGE: int = 24 * 60 * 60
+    PROFILE_SEED_URLS: List[str] = ["/", "/search?q=книга"]
+    PROFILE_SEED_SETTLE_TIME: float = 3.0
+    PROFILE_SEED_CLICKS: List[str] = [
+        "[data-testid='cookie-notification-close']",
+        ".cookie-notification__close",
+        ".js-cookie-notification-close",
+        ".change-city__button--accept",
+        "[data-testid='city-confirm']",
+        ".header-city__confirm"
+    ]
+    # Части имен cookie и ключей localStorage согласия и региона: они снимаются после
+    # прогрева и восстанавливаются после сброса драйвера между тестами
+    PROFILE_STATE_KEYS: List[str] = ["cookie", "consent", "agree", "city", "region", "location", "geo"]
+    
+    DRIVER_POOL_SIZE: int = 1
+    DRIVER_MAX_LEASES: int = 20
     
     TEST_DATA_DIR: str = os.path.join(os.path.dirname(__file__), "..", "test_data")
     
-    @classmethod
-    def get_api_headers(cls) -> Dict[str, str]:
+    # "off" - живой сайт, "record" - прокси с записью ответов, "replay" - только записанные ответы
+    REPLAY_MODE: str = os.environ.get("REPLAY_MODE", "off")
+    REPLAY_ARCHIVE: str = os.environ.get("REPLAY_ARCHIVE", os.path.join(TEST_DATA_DIR, "replay.json.gz"))
+    # Сторонние хосты (API, CDN), которые записываются и воспроизводятся вместе с сайтом
+    REPLAY_HOSTS: List[str] = ["*.chitai-gorod.ru", "chitai-gorod.ru"]
+    
+    CACHE_DIR: str = os.path.join(os.path.dirname(__file__), "..", ".cache")
+    DURATIONS_FILE: str = os.path.join(CACHE_DIR, "durations.json")
+    # Порядок тестов: "file" - как в файлах, "duration" - сначала самые долгие,
+    # "failed-first" - сначала упавшие в прошлый раз, затем самые быстрые
+    TEST_ORDER: str = os.environ.get("TEST_ORDER", "file")
+    LOCATOR_CACHE_FILE: str = os.path.join(CACHE_DIR, "locator_cache.json")
+    LOCATOR_CACHE_DECAY: float = 0.5
+    TIMINGS_FILE: str = os.path.join(CACHE_DIR, "timings.json")
+    RESOURCES_FILE: str = os.path.join(CACHE_DIR, "resources.json")
+    DRIVER_CACHE_FILE: str = os.path.join(CACHE_DIR, "chromedriver.json")
+    PROFILE_TEMPLATE_DIR: str = os.path.join(CACHE_DIR, "profile_template")
+    
+    REPORTS_DIR: str = os.path.join(os.path.dirname(__file__), "..", "reports")
+    PROFILES_DIR: str = os.path.join(REPORTS_DIR, "profiles")
+    COMMAND_TRACES_DIR: str = os.path.join(REPORTS_DIR, "commands")
+    RESOURCES_RUN_DIR: str = os.path.join(REPORTS_DIR, "resources")
+    SCREENSHOTS_DIR: str = os.path.join(REPORTS_DIR, "screenshots")
+    
+    # Журнал фреймворка: уровень и файл JSON lines (у воркеров xdist - framework-gwN.jsonl)
+    LOG_LEVEL: str = os.environ.get("LOG_LEVEL", "INFO")
+    LOG_FILE: str = os.environ.get("LOG_FILE", os.path.join(REPORTS_DIR, "framework.jsonl"))
+    
+    # Скриншоты: "png", "jpeg" или "webp". Сжатие в jpeg/webp, уменьшение до
+    # SCREENSHOT_MAX_WIDTH и поиск почти одинаковых кадров (расстояние dHash
+    # SCREENSHOT_HASH_SIZE x SCREENSHOT_HASH_SIZE бит <= SCREENSHOT_DEDUP_DISTANCE)
+    # работают, если установлен Pillow (необязательная зависимость); без него кадры
+    # сохраняются в PNG как есть. SCREENSHOT_STORAGE_LIMIT_MB - лимит каталога на процесс
+    SCREENSHOT_FORMAT: str = os.environ.get("SCREENSHOT_FORMAT", "png")
+    SCREENSHOT_MAX_WIDTH: int = int(os.environ.get("SCREENSHOT_MAX_WIDTH", "1280"))
+    SCREENSHOT_QUALITY: int = 75
+    SCREENSHOT_HASH_SIZE: int = 16
+    SCREENSHOT_DEDUP_DISTANCE: int = 2
+    SCREENSHOT_STORAGE_LIMIT_MB: float = float(os.environ.get("SCREENSHOT_STORAGE_LIMIT_MB", "50"))
+    SCREENSHOT_WORKERS: int = 2
+    
+    # Буфер последних SNAPSHOT_BUFFER_SIZE снимков на границах шагов page object
+    # (DOM, URL, консоль, миниатюра); прикладывается к Allure только при падении
+    # (SNAPSHOTS=1 - включить)
+    SNAPSHOTS: bool = os.environ.get("SNAPSHOTS", "0") == "1"
+    SNAPSHOT_BUFFER_SIZE: int = int(os.environ.get("SNAPSHOT_BUFFER_SIZE", "10"))
+    SNAPSHOT_CONSOLE_LINES: int = 20
+    SNAPSHOT_THUMBNAIL_SCALE: float = 0.25
+    SNAPSHOT_THUMBNAIL_QUALITY: int = 40
+    
+    # Профилирование шагов page object (PROFILE_STEPS=0 - выключить)
+    PROFILE_STEPS: bool = os.environ.get("PROFILE_STEPS", "1") != "0"
+    
+    # Трассировка команд WebDriver и бюджет команд на тест (TRACE_COMMANDS=1 - включить;
+    # маркер @pytest.mark.command_budget(N, mode="fail") переопределяет бюджет)
+    TRACE_COMMANDS: bool = os.environ.get("TRACE_COMMANDS", "0") == "1"
+    COMMAND_BUDGET: int = int(os.environ.get("COMMAND_BUDGET", "1500"))
+    # "off", "warn" - предупреждение, "fail" - ошибка теста
+    COMMAND_BUDGET_MODE: str = os.environ.get("COMMAND_BUDGET_MODE", "warn")
+    
+    ALLURE_WORKERS_DIR: str = ".workers"
+    
+    @property
+    def API_SEARCH_URL(self) -> str:
+        """Адрес поиска от текущего BASE_URL (conftest подменяет его в режимах record/replay)"""
+        return f"{self.BASE_URL}/search"
+    
+    def get_api_headers(self) -> Dict[str, str]:
         """Получить заголовки для API запросов"""
         return {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
             "Accept": "application/json, text/plain, */*",
             "Accept-Language": "ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7",
             "Content-Type": "application/json",
-            "Referer": f"{cls.BASE_URL}/"
+            "Referer": f"{self.BASE_URL}/"
         }
 
 
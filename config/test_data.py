@@ -14,6 +14,13 @@ class TestData:
         "catalog_search": "алмазная мозаика"
     }
     
+    SEARCH_PROBE_QUERIES: List[str] = [
+        "гарри поттер", "harry potter", "1984", "12 стульев", "мастер и маргарита",
+        "война и мир", "преступление и наказание", "алмазная мозаика", "раскраска",
+        "python", "java", "C#", "азбука", "энциклопедия", "атлас", "словарь",
+        "толкин", "пушкин", "чехов", "булгаков", "кинг", "роулинг", "оруэлл",
+        "комиксы", "манга", "детектив", "фантастика", "психология", "пазлы", "ежедневник"
+    ]
 
     CATEGORY_PATH: List[str] = ["Творчество и хобби", "Мозаика", "Алмазная мозаика"]
    
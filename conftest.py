@@ -1,7 +1,33 @@
+import asyncio
+import inspect
+import shutil
+import warnings
 import pytest
 import allure
 from datetime import datetime
 import os
+import json
+from config.settings import settings
+from pages.main_page import MainPage
+from pages.search_page import SearchPage
+from pages.cart_page import CartPage
+from utils.driver_factory import DriverPool
+from utils.helpers import APIHelper
+from utils.local_server import LocalServer, StubSearchHandler
+from utils.replay_server import ReplayServer, write_replay_report
+from utils.durations import DurationStore, DurationRecorder
+from utils.parallel import DurationScheduling, worker_allure_dir, merge_allure_results
+from utils.locator_cache import locator_cache
+from utils.timing_store import timing_store, test_budget
+from utils.resource_blocking import resource_monitor
+from utils.driver_resolver import driver_resolver
+from utils.profiler import step_profiler, add_step_listener, merge_tree, format_flame, write_profile, summarize_profiles
+from utils.screenshots import screenshot_service
+from utils.snapshots import snapshot_buffer
+from utils.logger import setup_logging, shutdown_logging
+from utils.command_tracer import (
+    command_tracer, CommandBudgetWarning, format_trace_summary, write_trace, summarize_traces
+)
 
 
 def pytest_addoption(parser):
@@ -9,10 +35,27 @@ def pytest_addoption(parser):
     parser.addoption("--ui", action="store_true", help="Запустить только UI тесты")
     parser.addoption("--api", action="store_true", help="Запустить только API тесты")
     parser.addoption("--all", action="store_true", help="Запустить все тесты")
+    parser.addoption("--load", action="store_true", help="Запустить нагрузочные тесты поиска")
+    parser.addoption("--load-rps", type=float, default=settings.LOAD_RPS,
+                     help="Целевая частота запросов в секунду (0 - без ограничения)")
+    parser.addoption("--load-concurrency", type=int, default=settings.LOAD_CONCURRENCY,
+                     help="Число параллельных потоков нагрузки")
+    parser.addoption("--load-duration", type=float, default=settings.LOAD_DURATION,
+                     help="Длительность нагрузки в секундах")
+    parser.addoption("--load-url", default=None,
+                     help="Адрес для нагрузки (по умолчанию локальная заглушка)")
+    parser.addoption("--test-order", default=settings.TEST_ORDER, choices=DurationStore.ORDER_MODES,
+                     help="Порядок тестов: file, duration (долгие первыми), failed-first (упавшие первыми)")
 
 
 def pytest_collection_modifyitems(config, items):
     """Модификация коллекции тестов на основе опций"""
+    if not config.getoption("--load"):
+        skip_load = pytest.mark.skip(reason="Нагрузочные тесты запускаются с --load")
+        for item in items:
+            if "load" in item.keywords:
+                item.add_marker(skip_load)
+    
     if config.getoption("--ui"):
         skip_marker = pytest.mark.skip(reason="Запущены только UI тесты")
         for item in items:
@@ -27,26 +70,176 @@ def pytest_collection_modifyitems(config, items):
     
     elif config.getoption("--all"):
         pass
+    
+    store = config._duration_store
+    by_nodeid = {item.nodeid: item for item in items}
+    items[:] = [by_nodeid[nodeid] for nodeid in store.order(list(by_nodeid), config.getoption("--test-order"))]
+    config._duration_estimate = store.estimate(
+        item.nodeid for item in items if not item.get_closest_marker("skip")
+    )
+
+
+def pytest_report_collectionfinish(config, start_path, items):
+    """Оценка длительности прогона по истории до начала выполнения"""
+    estimate = getattr(config, "_duration_estimate", None)
+    if not estimate or not estimate["tests"]:
+        return None
+    return (
+        f"Порядок тестов: {config.getoption('--test-order')}; ожидаемая длительность "
+        f"{estimate['total']:.1f} c ({estimate['tests']} тестов, с историей {estimate['known']}, "
+        f"самый долгий {estimate['longest']:.1f} c, упали в прошлый раз {estimate['failed']})"
+    )
+
+
+def _is_xdist_worker(config) -> bool:
+    """Проверить, что текущий процесс - воркер pytest-xdist"""
+    return hasattr(config, "workerinput")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Настройка журнала, хранилища длительностей, буфера снимков, каталога Allure воркера и сервера записи/воспроизведения"""
+    if settings.REPLAY_MODE != "off":
+        config._replay_server = ReplayServer()
+        settings.BASE_URL = config._replay_server.start()
+    
+    config.addinivalue_line("markers", "time_budget(seconds): Budget for all waits in the test")
+    config.addinivalue_line("markers", "load: Load tests, run only with --load")
+    config.addinivalue_line("markers", "async_loop: Run async def test in its own event loop (no pytest-asyncio needed)")
+    config.addinivalue_line("markers", 'command_budget(count, mode): Max WebDriver commands per test, mode "warn" or "fail"')
+    
+    setup_logging()
+    config._duration_store = DurationStore()
+    if settings.SNAPSHOTS:
+        add_step_listener(snapshot_buffer)
+    report_dir = getattr(config.option, "allure_report_dir", None)
+    if _is_xdist_worker(config):
+        if report_dir:
+            config.option.allure_report_dir = worker_allure_dir(report_dir)
+    else:
+        shutil.rmtree(settings.PROFILES_DIR, ignore_errors=True)
+        shutil.rmtree(settings.COMMAND_TRACES_DIR, ignore_errors=True)
+        shutil.rmtree(settings.RESOURCES_RUN_DIR, ignore_errors=True)
+        shutil.rmtree(settings.SCREENSHOTS_DIR, ignore_errors=True)
+        config.pluginmanager.register(DurationRecorder(config._duration_store), "duration_recorder")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """Запуск async def тестов с маркером async_loop в собственном цикле событий"""
+    if not inspect.iscoroutinefunction(pyfuncitem.obj) or not pyfuncitem.get_closest_marker("async_loop"):
+        return None
+    
+    funcargs = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+    asyncio.run(pyfuncitem.obj(**funcargs))
+    return True
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """Раздача тестов по воркерам с учетом исторической длительности (pytest -n N)"""
+    if DurationScheduling is not None and config.getoption("dist") == "load":
+        return DurationScheduling(config, log, store=config._duration_store)
+    return None
+
+
+def _write_locator_cache_report() -> str:
+    """Сохранить отчет кэша локаторов в каталог отчетов"""
+    locator_lists = {}
+    for page_class in (MainPage, SearchPage, CartPage):
+        locator_lists.update(page_class.locator_lists())
+    
+    os.makedirs(settings.REPORTS_DIR, exist_ok=True)
+    report_path = os.path.join(settings.REPORTS_DIR, "locator_cache.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(locator_cache.report(locator_lists), f, ensure_ascii=False, indent=2)
+    return report_path
+
+
+def _write_timings_report() -> str:
+    """Сохранить перцентили длительностей ожиданий в каталог отчетов"""
+    os.makedirs(settings.REPORTS_DIR, exist_ok=True)
+    report_path = os.path.join(settings.REPORTS_DIR, "timings.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(timing_store.summary(), f, ensure_ascii=False, indent=2)
+    return report_path
+
+
+def _write_resources_report() -> str:
+    """Сохранить статистику заблокированных ресурсов текущего запуска по страницам в каталог отчетов"""
+    os.makedirs(settings.REPORTS_DIR, exist_ok=True)
+    report_path = os.path.join(settings.REPORTS_DIR, "blocked_resources.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(resource_monitor.summary(), f, ensure_ascii=False, indent=2)
+    return report_path
+
+
+def _write_step_profile_report() -> str:
+    """Сохранить сводку профилей шагов всех тестов в каталог отчетов"""
+    os.makedirs(settings.REPORTS_DIR, exist_ok=True)
+    report_path = os.path.join(settings.REPORTS_DIR, "step_profile.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(summarize_profiles(), f, ensure_ascii=False, indent=2)
+    return report_path
+
+
+def _write_command_counts_report() -> str:
+    """Сохранить число команд WebDriver по тестам в каталог отчетов"""
+    os.makedirs(settings.REPORTS_DIR, exist_ok=True)
+    report_path = os.path.join(settings.REPORTS_DIR, "command_counts.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(summarize_traces(), f, ensure_ascii=False, indent=2)
+    return report_path
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Сохранение длительностей, кэша локаторов и таймингов, слияние результатов Allure воркеров"""
+    config = session.config
+    locator_cache.save()
+    timing_store.save()
+    resource_monitor.save()
+    screenshot_service.shutdown()
+    shutdown_logging()
+    replay_server = getattr(config, "_replay_server", None)
+    if replay_server is not None:
+        replay_server.stop()
+        write_replay_report(replay_server)
+    if _is_xdist_worker(config):
+        return
+    
+    config._duration_store.save()
+    _write_locator_cache_report()
+    _write_timings_report()
+    if settings.RESOURCE_REPORT:
+        _write_resources_report()
+    if settings.PROFILE_STEPS:
+        _write_step_profile_report()
+    if settings.TRACE_COMMANDS:
+        _write_command_counts_report()
+    report_dir = getattr(config.option, "allure_report_dir", None)
+    if report_dir:
+        merge_allure_results(report_dir)
 
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
-    """Хук для создания скриншотов при падении UI тестов"""
+    """Хук для скриншота и буфера снимков при падении UI тестов и вложения снятых кадров в отчет"""
     outcome = yield
     report = outcome.get_result()
     
-    if report.when == "call" and report.failed:
-        if "test_ui" in item.nodeid:
-            try:
-                from tests.test_ui import TestUI
-                if hasattr(TestUI, 'driver'):
-                    allure.attach(
-                        TestUI.driver.get_screenshot_as_png(),
-                        name="screenshot",
-                        attachment_type=allure.attachment_type.PNG
-                    )
-            except:
-                pass
+    if report.when == "call" and report.passed and settings.TRACE_COMMANDS:
+        budget, mode = _command_budget(item)
+        total = command_tracer.count()
+        if mode == "fail" and total > budget:
+            report.outcome = "failed"
+            report.longrepr = f"Тест выполнил {total} команд WebDriver при бюджете {budget}"
+    
+    if report.failed:
+        driver = getattr(item.instance, "driver", None)
+        if report.when == "call" and driver is not None:
+            screenshot_service.capture(driver, "screenshot", dedup=False)
+        snapshot_buffer.flush()
+    screenshot_service.flush()
 
 
 @pytest.fixture(autouse=True)
@@ -56,3 +249,152 @@ def allure_environment(request, pytestconfig):
         request.config._metadata['Test Suite'] = 'Chitai-Gorod Tests'
         request.config._metadata['Python Version'] = '3.8+'
         request.config._metadata['Timestamp'] = datetime.now().isoformat()
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request):
+    """Пул WebDriver на всю сессию: Chrome запускается один раз, а не на каждый тест"""
+    pool = DriverPool()
+    yield pool
+    pool.close_all()
+    request.config._driver_pool_summary = pool.summary()
+
+
+@pytest.fixture(scope="session")
+def api_helper():
+    """APIHelper на всю сессию: соединения с сайтом переиспользуются между тестами"""
+    helper = APIHelper()
+    yield helper
+    APIHelper.close_session()
+
+
+@pytest.fixture(scope="session")
+def load_target(pytestconfig):
+    """Адрес для нагрузки: --load-url или локальная заглушка поиска"""
+    url = pytestconfig.getoption("--load-url")
+    if url:
+        yield url
+        return
+    
+    with LocalServer(StubSearchHandler) as server:
+        yield server.url
+
+
+@pytest.fixture
+def load_options(pytestconfig):
+    """Параметры нагрузки из опций командной строки"""
+    return {
+        "rps": pytestconfig.getoption("--load-rps"),
+        "concurrency": pytestconfig.getoption("--load-concurrency"),
+        "duration": pytestconfig.getoption("--load-duration")
+    }
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Вывод статистики пула WebDriver, скриншотов и сервера записи/воспроизведения в конце сессии"""
+    replay_server = getattr(config, "_replay_server", None)
+    if replay_server is not None:
+        stats = replay_server.stats()
+        terminalreporter.write_sep("-", f"Replay ({stats['mode']})")
+        terminalreporter.write_line(
+            f"Ответов в архиве: {stats['entries']}, отдано: {stats['hits']}, "
+            f"не найдено: {len(stats['misses'])} (список в reports/replay.json)"
+        )
+    
+    shots = screenshot_service.summary()
+    if shots["captured"]:
+        terminalreporter.write_sep("-", "Screenshots")
+        terminalreporter.write_line(
+            f"Снято: {shots['captured']}, дубликатов: {shots['duplicates']}, вытеснено: {shots['evicted']}; "
+            f"{shots['raw_bytes'] // 1024} КБ PNG -> {shots['written_bytes'] // 1024} КБ {shots['format']}"
+        )
+    
+    summary = getattr(config, "_driver_pool_summary", None)
+    if not summary or not summary["leases"]:
+        return
+    
+    terminalreporter.write_sep("-", "WebDriver pool")
+    terminalreporter.write_line(
+        f"Запусков Chrome: {summary['created']}, выдач драйвера: {summary['leases']}, "
+        f"пересоздано: {summary['recycled']}, упало: {summary['crashed']}"
+    )
+    terminalreporter.write_line(
+        f"Среднее время запуска: {summary['avg_startup_time']:.2f} c, "
+        f"сэкономлено за сессию: {summary['startup_time_saved']:.2f} c"
+    )
+    resolution = driver_resolver.report()
+    if resolution:
+        terminalreporter.write_line(
+            f"chromedriver: {resolution['path']} ({resolution['source']}), поиск {resolution['elapsed']:.3f} c"
+        )
+
+
+def _command_budget(item) -> tuple:
+    """Бюджет команд WebDriver теста и режим проверки (маркер command_budget или настройки)"""
+    marker = item.get_closest_marker("command_budget")
+    budget = marker.args[0] if marker and marker.args else settings.COMMAND_BUDGET
+    mode = marker.kwargs.get("mode", settings.COMMAND_BUDGET_MODE) if marker else settings.COMMAND_BUDGET_MODE
+    return budget, mode
+
+
+@pytest.fixture(autouse=True)
+def command_trace(request):
+    """Трасса команд WebDriver теста и проверка бюджета команд (COMMAND_BUDGET, маркер command_budget)"""
+    if not settings.TRACE_COMMANDS:
+        yield None
+        return
+    
+    command_tracer.start(request.node.nodeid)
+    yield command_tracer
+    trace = command_tracer.stop()
+    total = trace["summary"]["total"]["count"]
+    if not total:
+        return
+    write_trace(trace)
+    allure.attach(
+        format_trace_summary(trace["summary"]),
+        name="WebDriver Commands",
+        attachment_type=allure.attachment_type.TEXT
+    )
+    
+    # Режим "fail" проверяется в pytest_runtest_makereport: там превышение
+    # становится падением самого теста, а не ошибкой teardown фикстуры
+    budget, mode = _command_budget(request.node)
+    if mode == "warn" and total > budget:
+        warnings.warn(f"Тест выполнил {total} команд WebDriver при бюджете {budget}", CommandBudgetWarning)
+
+
+@pytest.fixture(autouse=True)
+def snapshot_trail(request):
+    """Буфер снимков на границах шагов page object; прикладывается к отчету только при падении"""
+    if not settings.SNAPSHOTS:
+        yield None
+        return
+    
+    snapshot_buffer.start()
+    yield snapshot_buffer
+    snapshot_buffer.discard()
+
+
+@pytest.fixture(autouse=True)
+def step_profile(request):
+    """Профиль шагов page object на время теста: JSON в reports/profiles и flame-отчет в Allure"""
+    if not settings.PROFILE_STEPS:
+        yield None
+        return
+    
+    step_profiler.start(request.node.nodeid)
+    yield step_profiler
+    tree = merge_tree(step_profiler.stop())
+    write_profile(request.node.nodeid, tree)
+    if tree["children"]:
+        allure.attach(format_flame(tree), name="Step Profile", attachment_type=allure.attachment_type.TEXT)
+
+
+@pytest.fixture(autouse=True)
+def time_budget(request):
+    """Общий бюджет времени на ожидания в тесте (маркер time_budget переопределяет TEST_TIME_BUDGET)"""
+    marker = request.node.get_closest_marker("time_budget")
+    test_budget.start(marker.args[0] if marker else settings.TEST_TIME_BUDGET)
+    yield test_budget
+    test_budget.stop()
@@ -1,16 +1,46 @@
 from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, WebDriverException
 import allure
-from typing import Optional, Tuple, List
+import time
+from contextlib import contextmanager
+from typing import Optional, Tuple, List, Iterator, Dict, Callable, Any
 from config.settings import settings
+from utils.js_scripts import RESOLVE_FIRST, EXTRACT_CARDS
+from utils.waits import MutationWait, locators_spec, ready_state_spec
+from utils.locator_cache import locator_cache
+from utils.timing_store import timing_store, test_budget
+from utils.resource_blocking import resource_monitor
+from utils.profiler import step_profiler, profile_class
+from utils.screenshots import screenshot_service
+from utils.logger import get_logger
+from utils.page_state import PageState, cards_query
 
 
 class BasePage:
     """Базовый класс для всех страниц"""
     
+    POPUP_CLOSE_BUTTONS = [
+        (By.CSS_SELECTOR, "[data-testid='cookie-notification-close']"),
+        (By.CSS_SELECTOR, ".cookie-notification__close"),
+        (By.CSS_SELECTOR, ".js-cookie-notification-close"),
+        (By.CSS_SELECTOR, "[aria-label='Закрыть']"),
+        (By.CSS_SELECTOR, ".popup-close")
+    ]
+    
+    # Методы, которые не оборачиваются профилировщиком шагов (возвращают итераторы)
+    PROFILE_EXCLUDE: Tuple[str, ...] = ("iter_first",)
+    
+    # Условие готовности страницы: первый из локаторов в состоянии READY_CONDITION
+    READY_LOCATORS: List[Tuple[By, str]] = []
+    READY_CONDITION: str = "visible"
+    
+    # Именованные запросы состояния страницы для page_state() (см. utils/page_state.py)
+    STATE_QUERIES: Dict[str, Dict[str, Any]] = {}
+    
     def __init__(self, driver: WebDriver):
         """
         Инициализация базовой страницы
@@ -21,6 +51,13 @@ class BasePage:
         self.driver = driver
         self.wait = WebDriverWait(driver, settings.EXPLICIT_WAIT)
         self.base_url = settings.BASE_URL
+        self.log = get_logger(f"pages.{type(self).__name__}", page=type(self).__name__)
+        self.state = PageState(driver)
+    
+    def __init_subclass__(cls, **kwargs):
+        """Профилирование методов страниц-наследников"""
+        super().__init_subclass__(**kwargs)
+        profile_class(cls, exclude=cls.PROFILE_EXCLUDE)
     
     @allure.step("Открыть страницу {url}")
     def open(self, url: str) -> None:
@@ -30,31 +67,408 @@ class BasePage:
         Args:
             url: URL для открытия
         """
-        self.driver.get(url)
-        self.wait_for_page_load()
+        start = time.perf_counter()
+        self._navigate(url)
+        self.wait_until_ready()
+        self._report_time_to_ready(url, time.perf_counter() - start)
         self.close_popups()
+        self.report_resources()
+    
+    def _navigate(self, url: str) -> None:
+        """
+        Перейти по URL
+        
+        При стратегии "none" driver.get возвращается сразу, поэтому
+        дополнительно ждем, пока старый документ сменится новым, иначе
+        условие готовности может выполниться на предыдущей странице.
+        
+        Новый документ определяется по пропавшей метке или по смене
+        performance.timeOrigin. Переход внутри документа (другой "#..."
+        в адресе) документ не меняет, поэтому он считается завершенным,
+        когда адрес страницы совпал с url и отличается от прежнего
+        (или url содержит "#": повторный переход к тому же якорю).
+        """
+        if settings.PAGE_LOAD_STRATEGY != "none":
+            self.driver.get(url)
+            return
+        
+        previous = self.driver.execute_script(
+            "window.__previousDocument = true;"
+            "return {href: location.href, origin: performance.timeOrigin};"
+        )
+        self.driver.get(url)
+        WebDriverWait(self.driver, settings.PAGE_LOAD_TIMEOUT, ignored_exceptions=[WebDriverException]).until(
+            lambda driver: driver.execute_script(
+                "var target = new URL(arguments[0], location.href).href;"
+                "if (window.__previousDocument !== true) return true;"
+                "if (performance.timeOrigin !== arguments[2]) return true;"
+                "return location.href === target && (target !== arguments[1] || target.indexOf('#') >= 0);",
+                url, previous["href"], previous["origin"]
+            )
+        )
+    
+    @allure.step("Ожидание готовности страницы")
+    def wait_until_ready(self, timeout: int = settings.PAGE_LOAD_TIMEOUT) -> None:
+        """
+        Ожидать условия готовности страницы
+        
+        Страница готова, когда виден (READY_CONDITION) хотя бы один из
+        READY_LOCATORS. Если условие не задано, ожидается загрузка документа.
+        
+        Args:
+            timeout: Время ожидания в секундах
+            
+        Raises:
+            TimeoutException: Если страница не готова за timeout
+        """
+        if not self.READY_LOCATORS:
+            self.wait_for_page_load(timeout)
+            return
+        self.find_first(self.READY_LOCATORS, condition=self.READY_CONDITION, timeout=timeout, name="READY_LOCATORS")
+    
+    def _report_time_to_ready(self, url: str, elapsed: float) -> None:
+        """Записать время до готовности страницы (в reports/timings.json и Allure)"""
+        timing_store.record(type(self).__name__, f"time_to_ready[{settings.PAGE_LOAD_STRATEGY}]", "found", elapsed)
+        allure.attach(
+            f"{url}: {elapsed:.2f} c (page_load_strategy={settings.PAGE_LOAD_STRATEGY})",
+            name="Time to Ready",
+            attachment_type=allure.attachment_type.TEXT
+        )
+    
+    def report_resources(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Приложить к отчету статистику заблокированных ресурсов с последнего вызова
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Сводка по страницам из ResourceMonitor.collect
+        """
+        pages = resource_monitor.collect(self.driver)
+        if any(stats["blocked"] for stats in pages.values()):
+            allure.attach(
+                resource_monitor.format_report(pages),
+                name="Blocked Resources",
+                attachment_type=allure.attachment_type.TEXT
+            )
+        return pages
+    
+    def take_screenshot(self, name: str = "screenshot") -> None:
+        """
+        Снять скриншот текущей страницы для отчета
+        
+        Сжатие и запись выполняются в фоне, кадр прикладывается к отчету
+        в конце фазы теста (см. ScreenshotService).
+        
+        Args:
+            name: Название вложения
+        """
+        screenshot_service.capture(self.driver, name)
     
     @allure.step("Закрыть всплывающие окна")
     def close_popups(self) -> None:
-        """Закрытие всплывающих окон и уведомлений"""
-        popup_selectors = [
-            "[data-testid='cookie-notification-close']",
-            ".cookie-notification__close",
-            ".js-cookie-notification-close",
-            "[aria-label='Закрыть']",
-            ".popup-close"
-        ]
-        
-        for selector in popup_selectors:
+        """
+        Закрытие всплывающих окон и уведомлений
+        
+        С теплым профилем (cookie и регион уже приняты) окна не ожидаются,
+        выполняется одна мгновенная проверка. DriverPool._reset восстанавливает
+        согласие и регион после очистки cookie, а если это не удалось,
+        снимает признак теплого профиля.
+        """
+        timeout = 0 if getattr(self.driver, "warm_profile", False) else 3
+        try:
+            close_btn, index = self.find_first(
+                self.POPUP_CLOSE_BUTTONS, condition="clickable", timeout=timeout, name="POPUP_CLOSE_BUTTONS"
+            )
+            close_btn.click()
+            self.log.info("Закрыто всплывающее окно", locator=self.POPUP_CLOSE_BUTTONS[index])
+        except TimeoutException:
+            pass
+    
+    def page_state(self, *names: str) -> Dict[str, Any]:
+        """
+        Состояние страницы по запросам STATE_QUERIES
+        
+        Все запросы считаются одним вызовом execute_script и кэшируются
+        до мутации DOM или смены URL, поэтому повторные проверки на
+        неизменной странице стоят один короткий вызов без пересчета.
+        
+        Args:
+            *names: Имена запросов (по умолчанию - все STATE_QUERIES)
+            
+        Returns:
+            Dict[str, Any]: url и значения запросов по именам
+        """
+        names = names or tuple(self.STATE_QUERIES)
+        return self.state.query({name: self.STATE_QUERIES[name] for name in names})
+    
+    @staticmethod
+    def _uses_mutation_waits() -> bool:
+        """Проверить, включен ли движок ожиданий на MutationObserver"""
+        return settings.WAIT_ENGINE == "mutation"
+    
+    @contextmanager
+    def probe(self) -> Iterator[None]:
+        """
+        Режим быстрых проверок: неявное ожидание временно отключено
+        
+        Поиск без результата при IMPLICIT_WAIT > 0 блокируется на все время
+        неявного ожидания, поэтому проверки наличия и явные ожидания
+        выполняются внутри probe(). Вложенные вызовы ничего не переключают.
+        """
+        meter = getattr(self.driver, "implicit_wait_meter", None)
+        previous = meter.implicit_wait if meter else settings.IMPLICIT_WAIT
+        if not previous:
+            yield
+            return
+        
+        self.driver.implicitly_wait(0)
+        try:
+            yield
+        finally:
+            self.driver.implicitly_wait(previous)
+    
+    def find_elements_now(self, locator: Tuple[By, str], root: Optional[WebElement] = None) -> List[WebElement]:
+        """
+        Найти элементы без ожидания
+        
+        Args:
+            locator: Кортеж (By, locator)
+            root: Элемент, внутри которого искать (по умолчанию вся страница)
+            
+        Returns:
+            List[WebElement]: Найденные элементы (пустой список, если их нет)
+        """
+        with self.probe():
+            return (root or self.driver).find_elements(*locator)
+    
+    def is_element_present(self, locator: Tuple[By, str]) -> bool:
+        """
+        Проверить наличие элемента без ожидания
+        
+        Args:
+            locator: Кортеж (By, locator)
+            
+        Returns:
+            bool: True если элемент есть в DOM
+        """
+        return len(self.find_elements_now(locator)) > 0
+    
+    def extract_cards(self, cards: Optional[str], links: Optional[str] = None,
+                      title: Optional[List[str]] = None, price: Optional[List[str]] = None,
+                      quantity: Optional[List[str]] = None,
+                      available_texts: Optional[List[str]] = None,
+                      unavailable_texts: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Извлечь данные всех карточек товаров одним вызовом execute_script
+        
+        Если задан links, товары собираются по ссылкам (одна запись на href),
+        а карточкой считается ближайший предок, подходящий под cards.
+        Иначе берутся карточки верхнего уровня по селектору cards.
+        
+        Args:
+            cards: CSS селектор карточки товара
+            links: CSS селектор ссылки на товар
+            title: CSS селекторы названия внутри карточки (по приоритету)
+            price: CSS селекторы цены внутри карточки
+            quantity: CSS селекторы количества внутри карточки
+            available_texts: Фразы, означающие наличие товара
+            unavailable_texts: Фразы, означающие отсутствие товара
+            
+        Returns:
+            List[Dict[str, Any]]: Записи {title, href, price, quantity, available};
+            пустой список, если скрипт не выполнился
+        """
+        options = cards_query(cards, links, title, price, quantity, available_texts, unavailable_texts)["options"]
+        try:
+            return self.driver.execute_script(EXTRACT_CARDS, options) or []
+        except WebDriverException:
+            return []
+    
+    @staticmethod
+    def _locator_key(locator: Tuple[By, str]) -> str:
+        """Строковое представление локатора для кэшей и статистики"""
+        return locator_cache.selector_key(locator)
+    
+    def _adaptive_timeout(self, key: str, timeout: Optional[float]) -> float:
+        """
+        Таймаут ожидания с учетом наблюдаемых задержек и бюджета теста
+        
+        Args:
+            key: Идентификатор ожидания (локатор или список локаторов)
+            timeout: Таймаут, заданный вызывающим кодом (None - EXPLICIT_WAIT)
+            
+        Returns:
+            float: Таймаут в секундах
+        """
+        timeout = settings.EXPLICIT_WAIT if timeout is None else timeout
+        if settings.ADAPTIVE_TIMEOUTS:
+            timeout = timing_store.suggest_timeout(type(self).__name__, key, timeout)
+        return test_budget.clamp(timeout)
+    
+    def _timed_wait(self, key: str, timeout: Optional[float], wait_fn: Callable[[float], Any]) -> Any:
+        """
+        Выполнить ожидание с адаптивным таймаутом и записать его длительность
+        
+        Выученный таймаут - жесткий предел: ожидание, закончившееся
+        таймаутом, не продолжается до таймаута вызывающего кода, иначе
+        отрицательные проверки ждали бы дольше, чем без адаптации.
+        
+        Args:
+            key: Идентификатор ожидания для хранилища длительностей
+            timeout: Таймаут, заданный вызывающим кодом
+            wait_fn: Функция ожидания, принимающая итоговый таймаут
+            
+        Returns:
+            Any: Результат wait_fn
+        """
+        page = type(self).__name__
+        timeout = self._adaptive_timeout(key, timeout)
+        start = time.perf_counter()
+        try:
+            result = self._run_wait(wait_fn, timeout)
+        except TimeoutException:
+            elapsed = time.perf_counter() - start
+            timing_store.record(page, key, "timeout", elapsed)
+            step_profiler.add_wait(elapsed, timed_out=True)
+            raise
+        elapsed = time.perf_counter() - start
+        timing_store.record(page, key, "found", elapsed)
+        step_profiler.add_wait(elapsed, timed_out=False)
+        return result
+    
+    def _run_wait(self, wait_fn: Callable[[float], Any], timeout: float) -> Any:
+        """Выполнить wait_fn (при ожидании опросом - без неявного ожидания драйвера)"""
+        if self._uses_mutation_waits():
+            return wait_fn(timeout)
+        with self.probe():
+            return wait_fn(timeout)
+    
+    def _wait_for(self, spec: dict, condition, timeout: Optional[float], key: str):
+        """
+        Дождаться условия движком, выбранным в settings.WAIT_ENGINE
+        
+        Args:
+            spec: Описание условия для MutationWait
+            condition: Эквивалентное условие для WebDriverWait
+            timeout: Время ожидания в секундах
+            key: Идентификатор ожидания для хранилища длительностей
+            
+        Returns:
+            Результат условия (для локаторов - WebElement)
+        """
+        def wait_fn(wait_timeout: float):
+            if self._uses_mutation_waits():
+                result = MutationWait(self.driver, wait_timeout).until(spec)
+                return result[0] if spec["type"] == "locators" else result
+            return WebDriverWait(self.driver, wait_timeout).until(condition)
+        
+        return self._timed_wait(key, timeout, wait_fn)
+    
+    @classmethod
+    def locator_lists(cls) -> Dict[str, List[Tuple[By, str]]]:
+        """
+        Получить все списки альтернативных локаторов страницы
+        
+        Returns:
+            Dict[str, List[Tuple[By, str]]]: Списки по ключам вида "MainPage.CART_BUTTONS"
+        """
+        return {
+            f"{cls.__name__}.{name}": getattr(cls, name)
+            for name in dir(cls)
+            if name.isupper() and isinstance(getattr(cls, name), list)
+        }
+    
+    def _locator_order(self, locators: List[Tuple[By, str]], name: Optional[str]) -> List[int]:
+        """Порядок проверки локаторов: сначала самые успешные по кэшу"""
+        if name is None:
+            return list(range(len(locators)))
+        return locator_cache.order(f"{type(self).__name__}.{name}", locators)
+    
+    def _resolve_first(self, locators: List[Tuple[By, str]], order: List[int], condition: str,
+                       timeout: Optional[float], text: Optional[str], key: str) -> Tuple[WebElement, int]:
+        """Найти первый подходящий элемент среди локаторов в порядке order"""
+        ordered = [locators[index] for index in order]
+        locator_args = [list(locator) for locator in ordered]
+        
+        def wait_fn(wait_timeout: float):
+            if self._uses_mutation_waits():
+                return MutationWait(self.driver, wait_timeout).until(locators_spec(ordered, condition, text))
+            return WebDriverWait(self.driver, wait_timeout).until(
+                lambda driver: driver.execute_script(RESOLVE_FIRST, locator_args, condition, text) or False
+            )
+        
+        element, position = self._timed_wait(key, timeout, wait_fn)
+        return element, int(position)
+    
+    @allure.step("Найти первый подходящий элемент из списка локаторов")
+    def find_first(self, locators: List[Tuple[By, str]], condition: str = "visible",
+                   timeout: Optional[int] = None, text: Optional[str] = None,
+                   name: Optional[str] = None) -> Tuple[WebElement, int]:
+        """
+        Найти первый подходящий элемент сразу по всему списку локаторов
+        
+        Все локаторы проверяются в браузере одним вызовом execute_script
+        на каждой итерации ожидания, поэтому время поиска не растет
+        с длиной списка альтернативных селекторов.
+        
+        Args:
+            locators: Список кортежей (By, locator) в порядке приоритета
+            condition: "present", "visible" или "clickable"
+            timeout: Время ожидания в секундах
+            text: Подстрока, которую должен содержать текст элемента
+            name: Имя списка в классе страницы (например "CART_BUTTONS") -
+                включает кэш сработавших локаторов
+            
+        Returns:
+            Tuple[WebElement, int]: Элемент и индекс сработавшего локатора
+            
+        Raises:
+            TimeoutException: Если ни один локатор не сработал за timeout
+        """
+        return next(self._iter_matches(locators, condition, timeout, text, name, raise_on_timeout=True))
+    
+    def iter_first(self, locators: List[Tuple[By, str]], condition: str = "visible",
+                   timeout: Optional[int] = None, text: Optional[str] = None,
+                   name: Optional[str] = None) -> Iterator[Tuple[WebElement, int]]:
+        """
+        Перебрать подходящие элементы по списку локаторов
+        
+        Сначала выдается первый сработавший локатор, затем поиск продолжается
+        по локаторам после него - для случаев, когда найденный элемент
+        не подошел (например, клик не дал результата).
+        
+        Args:
+            locators: Список кортежей (By, locator) в порядке приоритета
+            condition: "present", "visible" или "clickable"
+            timeout: Время ожидания каждого поиска в секундах
+            text: Подстрока, которую должен содержать текст элемента
+            name: Имя списка в классе страницы для кэша локаторов
+            
+        Yields:
+            Tuple[WebElement, int]: Элемент и индекс локатора в исходном списке
+        """
+        return self._iter_matches(locators, condition, timeout, text, name, raise_on_timeout=False)
+    
+    def _iter_matches(self, locators: List[Tuple[By, str]], condition: str, timeout: Optional[int],
+                      text: Optional[str], name: Optional[str],
+                      raise_on_timeout: bool) -> Iterator[Tuple[WebElement, int]]:
+        """Общая реализация find_first/iter_first с учетом кэша локаторов"""
+        remaining = self._locator_order(locators, name)
+        key = name or "; ".join(self._locator_key(locator) for locator in locators)
+        while remaining:
             try:
-                close_btn = WebDriverWait(self.driver, 3).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                )
-                close_btn.click()
-                print(f"Закрыто всплывающее окно с селектором: {selector}")
-                break
+                element, position = self._resolve_first(locators, remaining, condition, timeout, text, key)
             except TimeoutException:
-                continue
+                if name is not None:
+                    locator_cache.record_miss(f"{type(self).__name__}.{name}", locators, remaining)
+                if raise_on_timeout:
+                    raise
+                return
+            
+            index = remaining[position]
+            if name is not None:
+                locator_cache.record_hit(f"{type(self).__name__}.{name}", locators, index, remaining[:position])
+            yield element, index
+            remaining = remaining[position + 1:]
     
     @allure.step("Найти элемент {locator}")
     def find_element(self, locator: Tuple[By, str], timeout: Optional[int] = None):
@@ -68,8 +482,10 @@ class BasePage:
         Returns:
             WebElement: Найденный элемент
         """
-        wait = self.wait if timeout is None else WebDriverWait(self.driver, timeout)
-        return wait.until(EC.presence_of_element_located(locator))
+        return self._wait_for(
+            locators_spec([locator], "present"), EC.presence_of_element_located(locator),
+            timeout, self._locator_key(locator)
+        )
     
     @allure.step("Найти кликабельный элемент {locator}")
     def find_clickable_element(self, locator: Tuple[By, str], timeout: Optional[int] = None):
@@ -83,8 +499,10 @@ class BasePage:
         Returns:
             WebElement: Найденный элемент
         """
-        wait = self.wait if timeout is None else WebDriverWait(self.driver, timeout)
-        return wait.until(EC.element_to_be_clickable(locator))
+        return self._wait_for(
+            locators_spec([locator], "clickable"), EC.element_to_be_clickable(locator),
+            timeout, self._locator_key(locator)
+        )
     
     @allure.step("Найти все элементы {locator}")
     def find_elements(self, locator: Tuple[By, str], timeout: Optional[int] = None) -> List:
@@ -98,8 +516,11 @@ class BasePage:
         Returns:
             List[WebElement]: Список найденных элементов
         """
-        wait = self.wait if timeout is None else WebDriverWait(self.driver, timeout)
-        return wait.until(EC.presence_of_all_elements_located(locator))
+        if self._uses_mutation_waits():
+            self._wait_for(locators_spec([locator], "present"), None, timeout, self._locator_key(locator))
+            return self.driver.find_elements(*locator)
+        
+        return self._wait_for(None, EC.presence_of_all_elements_located(locator), timeout, self._locator_key(locator))
     
     @allure.step("Кликнуть на элемент {locator}")
     def click_element(self, locator: Tuple[By, str], timeout: Optional[int] = None) -> None:
@@ -161,8 +582,10 @@ class BasePage:
             bool: True если элемент видим
         """
         try:
-            wait = self.wait if timeout is None else WebDriverWait(self.driver, timeout)
-            wait.until(EC.visibility_of_element_located(locator))
+            self._wait_for(
+                locators_spec([locator], "visible"), EC.visibility_of_element_located(locator),
+                timeout, self._locator_key(locator)
+            )
             return True
         except TimeoutException:
             return False
@@ -170,14 +593,20 @@ class BasePage:
     @allure.step("Ожидание загрузки страницы")
     def wait_for_page_load(self, timeout: int = settings.PAGE_LOAD_TIMEOUT) -> None:
         """
-        Ожидать полной загрузки страницы
+        Ожидать загрузки документа
+        
+        При стратегии "normal" ждем readyState "complete", при "eager"/"none"
+        достаточно "interactive" (DOM построен, подресурсы не ждем).
         
         Args:
             timeout: Время ожидания в секундах
         """
-        wait = WebDriverWait(self.driver, timeout)
-        wait.until(
-            lambda driver: driver.execute_script("return document.readyState") == "complete"
+        states = ["complete"] if settings.PAGE_LOAD_STRATEGY == "normal" else ["interactive", "complete"]
+        self._wait_for(
+            ready_state_spec(states),
+            lambda driver: driver.execute_script("return document.readyState") in states,
+            timeout,
+            "document.readyState"
         )
     
     @allure.step("Ожидание изменения URL")
@@ -196,3 +625,6 @@ class BasePage:
         return wait.until(
             lambda driver: driver.current_url != original_url
         )
+
+
+profile_class(BasePage, exclude=BasePage.PROFILE_EXCLUDE)
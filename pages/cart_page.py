@@ -1,8 +1,8 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 import allure
-from typing import List
+from typing import List, Dict, Any
+from utils.page_state import cards_query, texts_query, visible_query, text_query
 from .base_page import BasePage
 
 
@@ -20,6 +20,11 @@ class CartPage(BasePage):
     
     ITEM_TITLE = (By.CSS_SELECTOR, ".product-title, .item-title, [data-testid='product-title']")
     
+    ITEM_TITLE_CSS = [".product-title", ".item-title", ".cart-item__title", ".basket-item__name", "h3", "a"]
+    ITEM_PRICE_CSS = [".product-price__value", ".cart-item__price", ".basket-item__price", "[class*='price']"]
+    ITEM_QUANTITY_CSS = ["input[type='number']", "[class*='quantity'] input", "[class*='quantity']", "[class*='count']"]
+    CART_TOTAL_CSS = [".cart-total", ".cart-sidebar__total", ".basket-total"]
+    
     EMPTY_CART_SELECTORS = [
         (By.XPATH, "//*[contains(text(), 'корзина пуста')]"),
         (By.XPATH, "//*[contains(text(), 'пустая корзина')]"),
@@ -27,6 +32,48 @@ class CartPage(BasePage):
         (By.CSS_SELECTOR, ".cart-empty, .empty-cart, .basket-empty")
     ]
     
+    CART_TITLE = (By.XPATH, "//h1[contains(., 'Корзина')]")
+    
+    READY_LOCATORS = CART_ITEMS + EMPTY_CART_SELECTORS + [CART_TITLE]
+    
+    CART_URL_INDICATORS = ["cart", "basket", "korzin", "корзин"]
+    
+    CART_ITEMS_CSS = ", ".join(value for by, value in CART_ITEMS if by == By.CSS_SELECTOR)
+    
+    STATE_QUERIES = {
+        "items": cards_query(CART_ITEMS_CSS, title=ITEM_TITLE_CSS, price=ITEM_PRICE_CSS, quantity=ITEM_QUANTITY_CSS),
+        "item_texts": texts_query(CART_ITEMS_CSS),
+        "empty": visible_query(EMPTY_CART_SELECTORS),
+        "heading": text_query([CART_TITLE]),
+        "total": text_query([(By.CSS_SELECTOR, css) for css in CART_TOTAL_CSS])
+    }
+    
+    def cart_state(self) -> Dict[str, Any]:
+        """
+        Снимок состояния корзины
+        
+        Товары (название, цена, количество), тексты карточек, признак
+        пустой корзины, заголовок и итоговая сумма извлекаются одним
+        вызовом page_state() и кэшируются до следующей мутации DOM.
+        
+        Returns:
+            Dict[str, Any]: url, items (записи как у extract_cards), item_texts,
+            count, empty, heading, total
+        """
+        state = self.page_state()
+        state["count"] = len(state["items"])
+        return state
+    
+    @allure.step("Получить товары в корзине")
+    def get_cart_products(self) -> List[Dict[str, Any]]:
+        """
+        Получить данные всех товаров корзины (из снимка cart_state)
+        
+        Returns:
+            List[Dict[str, Any]]: Записи {title, href, price, quantity, available}
+        """
+        return self.cart_state()["items"]
+    
     @allure.step("Получить список товаров в корзине")
     def get_cart_items(self) -> List[str]:
         """
@@ -35,40 +82,31 @@ class CartPage(BasePage):
         Returns:
             List[str]: Список названий товаров
         """
+        items = [product["title"] for product in self.get_cart_products() if product.get("title")]
+        if items:
+            return items
+        
+        return self._get_cart_items_per_element()
+    
+    def _get_cart_items_per_element(self) -> List[str]:
+        """Получить названия товаров поэлементно (запасной путь, если скрипт не сработал)"""
         items = []
-        for cart_selector in self.CART_ITEMS:
-            try:
-                cart_elements = self.driver.find_elements(*cart_selector)
-                
-                for item in cart_elements:
+        try:
+            _, index = self.find_first(self.CART_ITEMS, condition="present", timeout=0, name="CART_ITEMS")
+        except TimeoutException:
+            return items
+        
+        with self.probe():
+            for item in self.driver.find_elements(*self.CART_ITEMS[index]):
+                for title_selector in self.ITEM_TITLE_CSS:
                     try:
-                        title_selectors = [
-                            ".product-title",
-                            ".item-title", 
-                            ".cart-item__title",
-                            ".basket-item__name",
-                            "h3",
-                            "a"
-                        ]
-                        
-                        for title_selector in title_selectors:
-                            try:
-                                title_element = item.find_element(By.CSS_SELECTOR, title_selector)
-                                title_text = title_element.text.strip()
-                                if title_text:
-                                    items.append(title_text)
-                                    break
-                            except:
-                                continue
-                                
+                        title_element = item.find_element(By.CSS_SELECTOR, title_selector)
+                        title_text = title_element.text.strip()
+                        if title_text:
+                            items.append(title_text)
+                            break
                     except:
                         continue
-                        
-                if items:
-                    break
-                    
-            except:
-                continue
         
         return items
     
@@ -80,14 +118,15 @@ class CartPage(BasePage):
         Returns:
             bool: True если корзина пуста
         """
-        for selector in self.EMPTY_CART_SELECTORS:
+        state = self.cart_state()
+        if not state["empty"] and not state["count"]:
             try:
-                if self.is_element_visible(selector, timeout=3):
-                    return True
-            except:
-                continue
+                self.find_first(self.CART_ITEMS + self.EMPTY_CART_SELECTORS, condition="present", timeout=3)
+            except TimeoutException:
+                pass
+            state = self.cart_state()
         
-        return len(self.get_cart_items()) == 0
+        return state["empty"] or state["count"] == 0
     
     @allure.step("Проверить наличие товара {product_name} в корзине")
     def is_product_in_cart(self, product_name: str) -> bool:
@@ -101,23 +140,23 @@ class CartPage(BasePage):
             bool: True если товар присутствует в корзине
         """
         try:
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".cart-item, .basket-item, .cart-product, .cart__item"))
-            )
-        except:
-            print("Элементы корзины не найдены, продолжаем проверку...")
-        cart_text = self.driver.find_element(By.TAG_NAME, "body").text.lower()
-        product_in_text = product_name.lower() in cart_text
+            self.find_first(self.CART_ITEMS, condition="present", timeout=10, name="CART_ITEMS")
+        except TimeoutException:
+            self.log.debug("Элементы корзины не найдены, продолжаем проверку")
         
-        cart_items = self.get_cart_items()
-        product_in_items = any(product_name.lower() in item.lower() for item in cart_items)
+        state = self.cart_state()
+        name = product_name.lower()
+        cart_items = [product["title"] for product in state["items"] if product.get("title")]
+        product_in_items = any(name in item.lower() for item in cart_items)
+        product_in_text = any(name in text.lower() for text in state["item_texts"])
         
-        print(f"Проверка товара в корзине: '{product_name}'")
-        print(f"В тексте страницы: {product_in_text}")
-        print(f"В элементах корзины: {product_in_items}")
-        print(f"Товары в корзине: {cart_items}")
+        self.log.info(
+            "Проверка товара '%s' в корзине: в названиях %s, в карточках %s",
+            product_name, product_in_items, product_in_text, items=state["count"]
+        )
+        self.log.debug("Товары в корзине: %s", cart_items)
         
-        return product_in_text or product_in_items
+        return product_in_items or product_in_text
     
     @allure.step("Получить количество товаров в корзине")
     def get_cart_items_count(self) -> int:
@@ -127,29 +166,23 @@ class CartPage(BasePage):
         Returns:
             int: Количество товаров
         """
-        try:
-            for cart_selector in self.CART_ITEMS:
-                cart_items = self.driver.find_elements(*cart_selector)
-                if cart_items:
-                    return len(cart_items)
-        except:
-            pass
-        return 0
+        return self.cart_state()["count"]
     
     @allure.step("Проверить, что находимся на странице корзины")
     def is_cart_page(self) -> bool:
         """
         Проверить, что текущая страница - корзина
         
+        Страница считается корзиной по URL или по содержимому снимка
+        cart_state: заголовок "Корзина", товары, сообщение о пустой
+        корзине или итоговая сумма.
+        
         Returns:
             bool: True если это страница корзины
         """
-        current_url = self.driver.current_url.lower()
-        cart_indicators = ["cart", "basket", "korzin", "корзин"]
-        is_cart_url = any(indicator in current_url for indicator in cart_indicators)
-        
-        page_text = self.driver.find_element(By.TAG_NAME, "body").text.lower()
-        cart_text_indicators = ["корзина", "оформление заказа", "итого", "сумма"]
-        has_cart_content = any(indicator in page_text for indicator in cart_text_indicators)
+        state = self.cart_state()
+        current_url = state["url"].lower()
+        is_cart_url = any(indicator in current_url for indicator in self.CART_URL_INDICATORS)
+        has_cart_content = bool(state["heading"] or state["count"] or state["empty"] or state["total"])
         
         return is_cart_url or has_cart_content
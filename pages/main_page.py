@@ -2,9 +2,13 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 import allure
 from typing import List
+from utils.url_router import url_router
 from .base_page import BasePage
+from .cart_page import CartPage
+from .search_page import SearchPage
 
 
 class MainPage(BasePage):
@@ -38,6 +42,9 @@ class MainPage(BasePage):
         (By.CSS_SELECTOR, "[data-testid='cart-button']")
     ]
     
+    READY_LOCATORS = [SEARCH_INPUT]
+    READY_CONDITION = "clickable"
+    
     CATALOG_MODAL_SELECTORS = [
         (By.CSS_SELECTOR, "div.ui-modal.vfm.vfm--fixed.vfm--inset"),
         (By.CSS_SELECTOR, ".catalog-modal"),
@@ -69,7 +76,7 @@ class MainPage(BasePage):
         search_input.send_keys(search_text)
         search_input.send_keys(Keys.RETURN)
         
-        print(f"✓ Поиск выполнен: '{search_text}'")
+        self.log.info("Поиск выполнен: '%s'", search_text)
 
     @allure.step("Открыть каталог")
     def open_catalog(self) -> bool:
@@ -79,20 +86,21 @@ class MainPage(BasePage):
         Returns:
             bool: True если каталог успешно открыт
         """
-        for catalog_button in self.CATALOG_ALTERNATIVES:
+        for element, index in self.iter_first(self.CATALOG_ALTERNATIVES, condition="clickable",
+                                              timeout=5, name="CATALOG_ALTERNATIVES"):
+            catalog_button = self.CATALOG_ALTERNATIVES[index]
             try:
-                element = self.find_clickable_element(catalog_button, timeout=5)
                 element.click()
-                print(f"✓ Кнопка каталога найдена по селектору: {catalog_button}")
+                self.log.info("Кнопка каталога найдена", locator=catalog_button)
                 
                 if self.is_catalog_opened():
                     return True
                     
             except Exception as e:
-                print(f"✗ Не удалось открыть каталог по селектору {catalog_button}: {e}")
+                self.log.debug("Не удалось открыть каталог: %s", e, locator=catalog_button)
                 continue
         
-        print("✗ Не удалось открыть каталог ни одним из способов")
+        self.log.warning("Не удалось открыть каталог ни одним из способов")
         return False
 
     @allure.step("Проверить открытие каталога")
@@ -103,46 +111,80 @@ class MainPage(BasePage):
         Returns:
             bool: True если каталог открыт
         """
-        for modal_selector in self.CATALOG_MODAL_SELECTORS:
-            if self.is_element_visible(modal_selector, timeout=3):
-                print(f"✓ Меню каталога открылось (селектор: {modal_selector})")
-                return True
+        try:
+            _, index = self.find_first(
+                self.CATALOG_MODAL_SELECTORS, condition="visible", timeout=3, name="CATALOG_MODAL_SELECTORS"
+            )
+            self.log.info("Меню каталога открылось", locator=self.CATALOG_MODAL_SELECTORS[index])
+            return True
+        except TimeoutException:
+            pass
         
-        for category_selector in self.CATEGORY_SELECTORS:
-            try:
-                categories = self.driver.find_elements(*category_selector)
-                if categories and len(categories) > 0:
-                    print(f"✓ Найдены категории каталога (селектор: {category_selector})")
-                    return True
-            except:
-                continue
+        try:
+            _, index = self.find_first(
+                self.CATEGORY_SELECTORS, condition="present", timeout=0, name="CATEGORY_SELECTORS"
+            )
+            self.log.info("Найдены категории каталога", locator=self.CATEGORY_SELECTORS[index])
+            return True
+        except TimeoutException:
+            pass
         
         current_url = self.driver.current_url.lower()
         if "catalog" in current_url or "categories" in current_url:
-            print("✓ Каталог открылся как отдельная страница")
+            self.log.info("Каталог открылся как отдельная страница")
             return True
         
-        print("✗ Меню каталога не открылось")
+        self.log.info("Меню каталога не открылось")
         return False
 
     @allure.step("Открыть корзину")
     def open_cart(self) -> None:
         """
         Открыть корзину с альтернативными селекторами
+        
+        В режиме NAVIGATION_MODE="fast" - сразу прямой переход по адресу корзины
+        с ожиданием готовности CartPage и закрытием всплывающих окон, как в open()
         """
-        for cart_button in self.CART_BUTTONS:
+        if url_router.fast:
+            CartPage(self.driver).open(url_router.cart())
+            self.log.info("Прямой переход в корзину")
+            return
+        
+        for element, index in self.iter_first(self.CART_BUTTONS, condition="clickable",
+                                              timeout=5, name="CART_BUTTONS"):
+            cart_button = self.CART_BUTTONS[index]
             try:
-                element = self.find_clickable_element(cart_button, timeout=5)
                 element.click()
-                print(f"✓ Корзина найдена по селектору: {cart_button}")
+                self.log.info("Корзина найдена", locator=cart_button)
                 return
             except Exception as e:
-                print(f"✗ Не удалось найти корзину по селектору {cart_button}: {e}")
+                self.log.debug("Не удалось кликнуть по корзине: %s", e, locator=cart_button)
                 continue
         
-        print("✓ Пробуем прямой переход в корзину")
-        self.driver.get(f"{self.base_url}/cart")
+        self.log.info("Кнопка корзины не найдена, прямой переход в корзину")
+        CartPage(self.driver).open(url_router.cart())
 
+    @allure.step("Перейти к результатам поиска: {search_text}")
+    def go_to_search_results(self, search_text: str) -> None:
+        """
+        Открыть результаты поиска
+        
+        В режиме NAVIGATION_MODE="fast" - прямой переход по адресу поиска
+        через SearchPage.open (готовность страницы и всплывающие окна),
+        в режиме "ui" - главная страница и поле поиска. Готовность
+        результатов проверяет SearchPage.wait_for_search_results.
+        
+        Args:
+            search_text: Текст для поиска
+        """
+        if url_router.fast:
+            SearchPage(self.driver).open(url_router.search(search_text))
+            self.log.info("Прямой переход к результатам поиска: '%s'", search_text)
+            return
+        
+        self.open(url_router.home())
+        self.search_for(search_text)
+    
     @allure.step("Получить текст поля поиска")
     def get_search_text(self) -> str:
         """
@@ -169,7 +211,7 @@ class MainPage(BasePage):
             bool: True если категория выбрана успешно
         """
         if not self.is_catalog_opened():
-            print("✗ Каталог не открыт")
+            self.log.warning("Каталог не открыт")
             return False
         
         category_xpaths = [
@@ -181,22 +223,22 @@ class MainPage(BasePage):
         
         for xpath in category_xpaths:
             try:
-                category_elements = self.driver.find_elements(By.XPATH, xpath)
+                category_elements = self.find_elements_now((By.XPATH, xpath))
                 for element in category_elements:
                     if category_name.lower() in element.text.lower():
                         try:
                             element.click()
-                            print(f"✓ Категория '{category_name}' выбрана")
+                            self.log.info("Категория '%s' выбрана", category_name, locator=xpath)
                             return True
                         except:
                             self.driver.execute_script("arguments[0].click();", element)
-                            print(f"✓ Категория '{category_name}' выбрана (через JS)")
+                            self.log.info("Категория '%s' выбрана (через JS)", category_name, locator=xpath)
                             return True
             except Exception as e:
-                print(f"✗ Не удалось выбрать категорию по XPath {xpath}: {e}")
+                self.log.debug("Не удалось выбрать категорию: %s", e, locator=xpath)
                 continue
         
-        print(f"✗ Не удалось найти категорию '{category_name}'")
+        self.log.warning("Не удалось найти категорию '%s'", category_name)
         return False
 
     @allure.step("Закрыть каталог")
@@ -219,20 +261,21 @@ class MainPage(BasePage):
             try:
                 close_btn = self.find_clickable_element(selector, timeout=3)
                 close_btn.click()
-                print("✓ Каталог закрыт")
+                self.log.info("Каталог закрыт", locator=selector)
                 return True
             except:
                 continue
         
-        try:
-            overlay = self.driver.find_element(By.CSS_SELECTOR, ".ui-modal.vfm.vfm--fixed.vfm--inset")
-            self.driver.execute_script("arguments[0].click();", overlay)
-            print("✓ Каталог закрыт (клик по оверлею)")
-            return True
-        except:
-            pass
+        overlays = self.find_elements_now((By.CSS_SELECTOR, ".ui-modal.vfm.vfm--fixed.vfm--inset"))
+        if overlays:
+            try:
+                self.driver.execute_script("arguments[0].click();", overlays[0])
+                self.log.info("Каталог закрыт (клик по оверлею)")
+                return True
+            except:
+                pass
         
-        print("✗ Не удалось закрыть каталог")
+        self.log.warning("Не удалось закрыть каталог")
         return False
 
     @allure.step("Проверить наличие ключевых элементов на главной странице")
@@ -254,10 +297,11 @@ class MainPage(BasePage):
             try:
                 is_present = self.is_element_visible(locator, timeout=5)
                 elements_status[element_name] = is_present
-                print(f"✓ Элемент {element_name}: {'присутствует' if is_present else 'отсутствует'}")
+                self.log.info("Элемент %s: %s", element_name, "присутствует" if is_present else "отсутствует",
+                              locator=locator)
             except:
                 elements_status[element_name] = False
-                print(f"✗ Элемент {element_name}: отсутствует")
+                self.log.info("Элемент %s: отсутствует", element_name, locator=locator)
         
         return elements_status
 
@@ -278,14 +322,14 @@ class MainPage(BasePage):
         self.driver.get(original_url)
         self.wait_for_page_load()
         
-        print(f"✓ Поиск '{search_text}' выполнен и возврат на главную")
+        self.log.info("Поиск '%s' выполнен и возврат на главную", search_text)
 
     @allure.step("Обновить страницу")
     def refresh_page(self) -> None:
         """Обновить текущую страницу"""
         self.driver.refresh()
         self.wait_for_page_load()
-        print("✓ Страница обновлена")
+        self.log.info("Страница обновлена")
 
     @allure.step("Получить текущий URL")
     def get_current_url(self) -> str:
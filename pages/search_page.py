@@ -1,8 +1,13 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 import allure
+import time
 from typing import List, Dict, Any
+from utils.logger import DEBUG
+from utils.page_state import count_query, visible_query, cards_query
+from utils.url_router import url_router
+from utils.waits import MutationWait, any_spec, locators_spec, url_contains_spec
 from .base_page import BasePage
 
 
@@ -13,6 +18,12 @@ class SearchPage(BasePage):
     PRODUCT_LINKS = (By.CSS_SELECTOR, "a[href*='/product/']")
     PRODUCT_TITLE = (By.CSS_SELECTOR, ".product-card__title, .book-title, .title")
     
+    PRODUCT_CARD_CSS = ".product-card, .book-card, [data-chg-product-id]"
+    PRODUCT_TITLE_CSS = [".product-card__title", ".book-title", ".title", "h3", "a"]
+    PRODUCT_PRICE_CSS = [".product-price__value", ".product-card__price", "[class*='price']"]
+    AVAILABLE_TEXTS = ["Купить", "В корзину"]
+    UNAVAILABLE_TEXTS = ["Нет в наличии", "Сообщить о поступлении"]
+    
     NO_RESULTS_SELECTORS = [
         (By.XPATH, "//*[contains(text(), 'ничего не найдено')]"),
         (By.XPATH, "//*[contains(text(), 'не найдено')]"),
@@ -23,6 +34,8 @@ class SearchPage(BasePage):
     
     SEARCH_TITLE = (By.CSS_SELECTOR, ".search-title__head")
     
+    READY_LOCATORS = [SEARCH_RESULTS] + NO_RESULTS_SELECTORS
+    
     ADD_TO_CART_SELECTORS = [
         (By.XPATH, "//div[contains(@class, 'chg-app-button__content') and contains(text(), 'Купить')]"),
         (By.XPATH, "//button[.//div[contains(text(), 'Купить')]]"),
@@ -32,11 +45,26 @@ class SearchPage(BasePage):
         (By.CSS_SELECTOR, "[class*='chg-app-button']"),
     ]
     
-    SUCCESS_SELECTORS = [
+    SUCCESS_MESSAGES = [
         (By.XPATH, "//*[contains(text(), 'Добавлено')]"),
         (By.XPATH, "//*[contains(text(), 'добавлен')]"),
         (By.XPATH, "//*[contains(text(), 'В корзине')]"),
-        (By.XPATH, "//*[contains(text(), 'корзину')]"),
+        (By.XPATH, "//*[contains(text(), 'корзину')]")
+    ]
+    
+    SEARCH_URL_INDICATORS = ["search", "query", "q="]
+    
+    STATE_QUERIES = {
+        "results_count": count_query([SEARCH_RESULTS]),
+        "product_links_count": count_query([PRODUCT_LINKS]),
+        "no_results": visible_query(NO_RESULTS_SELECTORS),
+        "products": cards_query(
+            PRODUCT_CARD_CSS, links=PRODUCT_LINKS[1], title=PRODUCT_TITLE_CSS, price=PRODUCT_PRICE_CSS,
+            available_texts=AVAILABLE_TEXTS, unavailable_texts=UNAVAILABLE_TEXTS
+        )
+    }
+    
+    SUCCESS_SELECTORS = SUCCESS_MESSAGES + [
         (By.CSS_SELECTOR, "[class*='success']"),
         (By.CSS_SELECTOR, "[class*='added']")
     ]
@@ -52,14 +80,26 @@ class SearchPage(BasePage):
         Returns:
             bool: True если результаты загружены
         """
+        if self._uses_mutation_waits():
+            try:
+                MutationWait(self.driver, timeout).until(any_spec(
+                    locators_spec([self.SEARCH_RESULTS, self.PRODUCT_LINKS], "present"),
+                    url_contains_spec(["search", "query"]),
+                    locators_spec(self.NO_RESULTS_SELECTORS, "visible")
+                ))
+                return True
+            except TimeoutException:
+                return False
+        
         try:
-            self.wait.until(
-                lambda driver: len(driver.find_elements(*self.SEARCH_RESULTS)) > 0 or
-                              len(driver.find_elements(*self.PRODUCT_LINKS)) > 0 or
-                              "search" in driver.current_url.lower() or
-                              "query" in driver.current_url.lower() or
-                              self._has_no_results_message()
-            )
+            with self.probe():
+                self.wait.until(
+                    lambda driver: len(driver.find_elements(*self.SEARCH_RESULTS)) > 0 or
+                                  len(driver.find_elements(*self.PRODUCT_LINKS)) > 0 or
+                                  "search" in driver.current_url.lower() or
+                                  "query" in driver.current_url.lower() or
+                                  self._has_no_results_message()
+                )
             return True
         except:
             return False
@@ -69,50 +109,41 @@ class SearchPage(BasePage):
         """
         Получить детальный статус поиска (как в рабочей версии)
         
+        Все значения берутся из одного снимка page_state().
+        
         Returns:
             Dict: Статус поиска с деталями
         """
-        status = {
-            "has_results": False,
-            "has_no_results_message": False,
-            "is_search_page": False,
-            "results_count": 0,
-            "product_links_count": 0,
-            "current_url": self.driver.current_url
+        state = self.page_state("results_count", "product_links_count", "no_results")
+        return {
+            "has_results": state["results_count"] > 0 or state["product_links_count"] > 0,
+            "has_no_results_message": state["no_results"],
+            "is_search_page": self._is_search_url(state["url"]),
+            "results_count": state["results_count"],
+            "product_links_count": state["product_links_count"],
+            "current_url": state["url"]
         }
-        
-        try:
-            products = self.driver.find_elements(*self.SEARCH_RESULTS)
-            status["results_count"] = len(products)
-            status["has_results"] = len(products) > 0
-        except:
-            pass
-        
-        try:
-            product_links = self.driver.find_elements(*self.PRODUCT_LINKS)
-            status["product_links_count"] = len(product_links)
-            if not status["has_results"]:
-                status["has_results"] = len(product_links) > 0
-        except:
-            pass
-        
-        status["has_no_results_message"] = self._has_no_results_message()
-        
-        current_url = self.driver.current_url.lower()
-        url_indicators = ["search", "query", "q="]
-        status["is_search_page"] = any(indicator in current_url for indicator in url_indicators)
-        
-        return status
+    
+    def _is_search_url(self, url: str) -> bool:
+        """Проверить, что URL - страница поиска"""
+        url = url.lower()
+        return any(indicator in url for indicator in self.SEARCH_URL_INDICATORS)
     
     def _has_no_results_message(self) -> bool:
-        """Внутренный метод проверки сообщения об отсутствии результатов"""
-        for selector in self.NO_RESULTS_SELECTORS:
-            try:
-                if self.is_element_visible(selector, timeout=2):
-                    return True
-            except:
-                continue
-        return False
+        """Внутренный метод проверки сообщения об отсутствии результатов (из снимка page_state)"""
+        return self.page_state("no_results")["no_results"]
+    
+    @allure.step("Получить товары из результатов поиска")
+    def get_products(self) -> List[Dict[str, Any]]:
+        """
+        Получить данные всех товаров из результатов поиска за один вызов
+        
+        Результат кэшируется в page_state() до изменения страницы.
+        
+        Returns:
+            List[Dict[str, Any]]: Записи {title, href, price, quantity, available}
+        """
+        return self.page_state("products")["products"]
     
     @allure.step("Получить список результатов поиска")
     def get_search_results(self) -> List[str]:
@@ -122,9 +153,17 @@ class SearchPage(BasePage):
         Returns:
             List[str]: Список названий товаров
         """
+        results = [product["title"] for product in self.get_products() if product.get("title")]
+        if results:
+            return results
+        
+        return self._get_search_results_per_element()
+    
+    def _get_search_results_per_element(self) -> List[str]:
+        """Получить названия товаров поэлементно (запасной путь, если скрипт не сработал)"""
         results = []
         try:
-            product_elements = self.driver.find_elements(*self.PRODUCT_LINKS)
+            product_elements = self.find_elements_now(self.PRODUCT_LINKS)
             
             for product in product_elements:
                 try:
@@ -135,16 +174,17 @@ class SearchPage(BasePage):
                     continue
                     
             if not results:
-                product_cards = self.driver.find_elements(*self.SEARCH_RESULTS)
-                
-                for product in product_cards:
-                    try:
-                        title_element = product.find_element(By.CSS_SELECTOR, ".title, h3, a, .product-card__title")
-                        title_text = title_element.text.strip()
-                        if title_text:
-                            results.append(title_text)
-                    except:
-                        continue
+                with self.probe():
+                    product_cards = self.driver.find_elements(*self.SEARCH_RESULTS)
+                    
+                    for product in product_cards:
+                        try:
+                            title_element = product.find_element(By.CSS_SELECTOR, ".title, h3, a, .product-card__title")
+                            title_text = title_element.text.strip()
+                            if title_text:
+                                results.append(title_text)
+                        except:
+                            continue
         except:
             pass
         
@@ -155,32 +195,37 @@ class SearchPage(BasePage):
         """
         Добавить товар в корзину по индексу (с улучшенной отладкой)
         
+        В режиме NAVIGATION_MODE="fast" карточка товара открывается переходом
+        по адресу ссылки, а не кликом.
+        
         Args:
             index: Индекс товара в списке результатов
             
         Returns:
             str: Название добавленного товара
         """
-        print(f"Поиск товара с индексом {index}...")
-        
-        product_links = self.driver.find_elements(*self.PRODUCT_LINKS)
-        print(f"Найдено ссылок на товары: {len(product_links)}")
+        product_links = self.find_elements_now(self.PRODUCT_LINKS)
+        self.log.debug("Найдено ссылок на товары: %d", len(product_links), locator=self.PRODUCT_LINKS)
         
         if index < len(product_links):
             product_link = product_links[index]
             
             product_title = product_link.text.strip() or f"Товар {index + 1}"
-            print(f"Выбираем товар: '{product_title}'")
-            print(f"Ссылка товара: {product_link.get_attribute('href')}")
-            print("Переход на страницу товара...")
-            product_link.click()
+            if self.log.is_enabled(DEBUG):
+                self.log.debug("Ссылка товара: %s", product_link.get_attribute("href"))
+            self.log.info("Выбираем товар '%s' (индекс %d)", product_title, index)
+            href = product_link.get_attribute("href") if url_router.fast else None
+            if href:
+                self._navigate(url_router.product(href))
+            else:
+                product_link.click()
             self.wait_for_page_load()
             
-            print("Ожидание загрузки страницы товара...")
             WebDriverWait(self.driver, 15).until(
                 lambda driver: "/product/" in driver.current_url
             )
-            print(f"Страница товара загружена: {self.driver.current_url}")
+            if self.log.is_enabled(DEBUG):
+                self.log.debug("Страница товара загружена: %s", self.driver.current_url)
             
 
             self.take_screenshot("product_page")
@@ -199,31 +244,20 @@ class SearchPage(BasePage):
         Returns:
             str: Название добавленного товара
         """
-        print("Поиск кнопки 'Купить' на странице товара...")
-        
 
-        for selector in self.ADD_TO_CART_SELECTORS:
+        for add_button, index in self.iter_first(self.ADD_TO_CART_SELECTORS, condition="clickable",
+                                                 timeout=10, text="Купить",
+                                                 name="ADD_TO_CART_SELECTORS"):
+            selector = self.ADD_TO_CART_SELECTORS[index]
             try:
-                print(f"Попытка найти кнопку по селектору: {selector}")
-                add_button = WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable(selector)
-                )
-                
-                button_text = add_button.text.strip()
-                print(f"Найден элемент с текстом: '{button_text}'")
+                add_button.click()
+                self.log.info("Товар '%s' добавлен в корзину", product_title, locator=selector)
                 
-                if "Купить" in button_text:
-                    print(f"✓ Найдена кнопка 'Купить' с селектором: {selector}")
-                    
-                    add_button.click()
-                    print(f"✓ Товар '{product_title}' добавлен в корзину")
-                    
-
-                    self._wait_for_cart_success_message()
-                    return product_title
+                self._wait_for_cart_success_message()
+                return product_title
                     
             except Exception as e:
-                print(f"Не удалось найти/кликнуть по селектору {selector}: {e}")
+                self.log.debug("Не удалось кликнуть по кнопке 'Купить': %s", e, locator=selector)
                 continue
         
         return self._try_alternative_add_to_cart(product_title)
@@ -232,25 +266,23 @@ class SearchPage(BasePage):
         """
         Альтернативный способ добавления в корзину
         """
-        print("Пробуем альтернативный способ добавления в корзину...")
-        
-        buy_elements = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'Купить')]")
-        print(f"Найдено элементов с текстом 'Купить': {len(buy_elements)}")
+        buy_elements = self.find_elements_now((By.XPATH, "//*[contains(text(), 'Купить')]"))
+        self.log.info("Альтернативное добавление в корзину: элементов с текстом 'Купить' %d", len(buy_elements))
         
         for i, element in enumerate(buy_elements):
             try:
                 element_text = element.text.strip()
-                print(f"Элемент {i+1}: '{element_text}'")
+                self.log.debug("Элемент '%s'", element_text, attempt=i + 1)
                 
                 if "Купить" in element_text:
-                    print(f"✓ Кликаем на элемент с текстом 'Купить'")
                     element.click()
+                    self.log.info("Клик по элементу с текстом 'Купить'", attempt=i + 1)
                     
                     self._wait_for_cart_success_message()
                     return product_title
                     
             except Exception as e:
-                print(f"Ошибка при клике на элемент {i+1}: {e}")
+                self.log.debug("Ошибка при клике на элемент: %s", e, attempt=i + 1)
                 continue
         
         raise Exception("Не удалось найти и кликнуть кнопку 'Купить' на странице товара")
@@ -259,72 +291,42 @@ class SearchPage(BasePage):
         """
         Ожидание сообщения об успешном добавлении (как в рабочем тесте)
         """
-        print("Ожидаем сообщение об успешном добавлении...")
-        
-        success_phrases = [
-            "Добавлено",
-            "добавлен", 
-            "В корзине",
-            "корзину"
-        ]
-        
-        for phrase in success_phrases:
-            try:
-                element = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located(
-                        (By.XPATH, f"//*[contains(text(), '{phrase}')]")
-                    )
-                )
-                print(f"✓ Успех: {element.text}")
-                return
-            except:
-                continue
-        
-        print("⚠ Сообщение об успешном добавлении не найдено, продолжаем...")
+        start = time.perf_counter()
+        try:
+            element, index = self.find_first(
+                self.SUCCESS_MESSAGES, condition="present", timeout=10, name="SUCCESS_MESSAGES"
+            )
+            self.log.info("Успех: %s", element.text, locator=self.SUCCESS_MESSAGES[index],
+                          elapsed=round(time.perf_counter() - start, 3))
+        except TimeoutException:
+            self.log.warning("Сообщение об успешном добавлении не найдено, продолжаем",
+                             elapsed=round(time.perf_counter() - start, 3))
     
     def _wait_for_cart_update(self):
         """Ожидание обновления состояния корзины после добавления товара"""
         try:
-            WebDriverWait(self.driver, 5).until(
-                lambda driver: any(
-                    self._is_element_present(selector) 
-                    for selector in self.SUCCESS_SELECTORS
-                )
-            )
-            print("✓ Состояние корзины обновлено")
-        except:
-
+            self.find_first(self.SUCCESS_SELECTORS, condition="present", timeout=5, name="SUCCESS_SELECTORS")
+            self.log.info("Состояние корзины обновлено")
+        except TimeoutException:
             try:
-                WebDriverWait(self.driver, 3).until(
-                    lambda driver: driver.execute_script("return document.readyState") == "complete"
-                )
-                print("✓ Страница готова после добавления в корзину")
-            except:
-                print("⚠ Сообщение об успешном добавлении не появилось, продолжаем...")
+                self.wait_for_page_load(timeout=3)
+                self.log.info("Страница готова после добавления в корзину")
+            except TimeoutException:
+                self.log.warning("Сообщение об успешном добавлении не появилось, продолжаем")
     
     def _is_element_present(self, locator):
         """Проверить наличие элемента без ожидания"""
-        try:
-            self.driver.find_element(*locator)
-            return True
-        except:
-            return False
+        return self.is_element_present(locator)
     
     def _verify_add_to_cart_success(self):
         """Проверить успешное добавление в корзину"""
-        print("Проверка успешного добавления в корзину")
-        
-        for selector in self.SUCCESS_SELECTORS:
-            try:
-                success_element = WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located(selector)
-                )
-                print(f"Успех: {success_element.text}")
-                return
-            except:
-                continue
-                    
-        print("Сообщение об успешном добавлении не найдено, продолжаем...")
+        try:
+            success_element, _ = self.find_first(
+                self.SUCCESS_SELECTORS, condition="present", timeout=5, name="SUCCESS_SELECTORS"
+            )
+            self.log.info("Успех: %s", success_element.text)
+        except TimeoutException:
+            self.log.warning("Сообщение об успешном добавлении не найдено, продолжаем")
     
     @allure.step("Проверить наличие сообщения 'нет результатов'")
     def has_no_results_message(self) -> bool:
@@ -367,6 +369,4 @@ class SearchPage(BasePage):
         Returns:
             bool: True если это страница поиска
         """
-        current_url = self.driver.current_url.lower()
-        url_indicators = ["search", "query", "q="]
-        return any(indicator in current_url for indicator in url_indicators)
+        return self._is_search_url(self.driver.current_url)
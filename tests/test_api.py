@@ -1,17 +1,19 @@
+import json
 import pytest
 import allure
-from utils.helpers import APIHelper
 from config.settings import settings
 from config.test_data import test_data
+from utils.async_helpers import AsyncAPIHelper
+from utils.load_test import LoadGenerator, format_load_report, write_load_report
 
 
 class TestAPI:
     """Класс для API тестов"""
     
     @pytest.fixture(autouse=True)
-    def setup(self):
+    def setup(self, api_helper):
         """Настройка перед каждым тестом"""
-        self.api_helper = APIHelper()
+        self.api_helper = api_helper
     
     @allure.feature("API Тесты")
     @allure.story("Проверка доступности сайта")
@@ -85,3 +87,58 @@ class TestAPI:
         
         with allure.step("Проверить ответ на неправильный метод"):
             assert response['status_code'] is not None, "Не получен ответ от сервера"
+    
+    @pytest.mark.load
+    @pytest.mark.async_loop
+    @allure.feature("API Тесты")
+    @allure.story("Массовый поиск")
+    async def test_search_probe_many(self):
+        """Тест массового параллельного поиска: распределение статусов и перцентили задержки"""
+        with allure.step(f"Выполнить {len(test_data.SEARCH_PROBE_QUERIES)} API поисков параллельно"):
+            async with AsyncAPIHelper() as helper:
+                results = await helper.search_many(test_data.SEARCH_PROBE_QUERIES)
+            stats = AsyncAPIHelper.aggregate(results)
+            allure.attach(
+                json.dumps(stats, ensure_ascii=False, indent=2),
+                name="Search Probe Stats",
+                attachment_type=allure.attachment_type.JSON
+            )
+        
+        with allure.step("Проверить долю ошибок"):
+            assert stats['error_rate'] <= settings.ASYNC_PROBE_MAX_ERROR_RATE, \
+                f"Слишком много ошибок: {stats['errors']} из {stats['total']}"
+        
+        with allure.step("Проверить распределение статус кодов"):
+            unexpected = {code: count for code, count in stats['status_codes'].items()
+                          if code not in ("200", "301", "302", "None")}
+            assert not unexpected, f"Неожиданные статус коды: {unexpected}"
+        
+        with allure.step("Проверить 95-й перцентиль задержки"):
+            assert stats['latency']['p95'] <= settings.ASYNC_PROBE_P95_LIMIT, \
+                f"p95 задержки {stats['latency']['p95']:.2f} c больше {settings.ASYNC_PROBE_P95_LIMIT} c"
+    
+    @pytest.mark.load
+    @allure.feature("API Тесты")
+    @allure.story("Нагрузка на поиск")
+    def test_search_load(self, load_target, load_options):
+        """Нагрузочный тест поиска: throughput, доля ошибок и перцентили задержки"""
+        queries = [query for query in test_data.SEARCH_DATA.values() if query]
+        
+        with allure.step(f"Дать нагрузку на {load_target}/search"):
+            result = LoadGenerator(load_target, queries, **load_options).run()
+            report = format_load_report(result)
+            write_load_report(result)
+            allure.attach(report, name="Load Test Summary", attachment_type=allure.attachment_type.TEXT)
+            allure.attach(
+                json.dumps(result, ensure_ascii=False, indent=2),
+                name="Load Test Results",
+                attachment_type=allure.attachment_type.JSON
+            )
+        
+        with allure.step("Проверить, что запросы выполнялись"):
+            assert result['requests'] > 0, "Не выполнено ни одного запроса"
+        
+        with allure.step("Проверить долю ошибок"):
+            assert result['error_rate'] <= settings.LOAD_MAX_ERROR_RATE, \
+                f"Доля ошибок {result['error_rate']:.2%}, статусы: {result['status_codes']}, " \
+                f"исключения: {result['error_types']}"
@@ -0,0 +1,95 @@
+import pytest
+import allure
+import conftest
+from config.settings import settings
+from utils.command_tracer import CommandTracer
+
+
+class FakeOutcome:
+    """Результат hookwrapper с готовым отчетом"""
+    
+    def __init__(self, report):
+        self.report = report
+    
+    def get_result(self):
+        return self.report
+
+
+class FakeItem:
+    """Тест с маркером command_budget без драйвера"""
+    
+    nodeid = "tests/test_x.py::test_x"
+    instance = None
+    
+    def __init__(self, marker):
+        self.marker = marker
+    
+    def get_closest_marker(self, name):
+        return self.marker if name == "command_budget" else None
+
+
+def _make_report(item, tracer, monkeypatch):
+    """Прогнать отчет call успешного теста через pytest_runtest_makereport с трассой tracer"""
+    monkeypatch.setattr(settings, "TRACE_COMMANDS", True)
+    monkeypatch.setattr(conftest, "command_tracer", tracer)
+    report = pytest.TestReport(item.nodeid, ("test_x.py", 0, "test_x"), {}, "passed", None, "call", [])
+    hook = conftest.pytest_runtest_makereport(item, None)
+    next(hook)
+    with pytest.raises(StopIteration):
+        hook.send(FakeOutcome(report))
+    return report
+
+
+@allure.feature("Утилиты фреймворка")
+class TestCommandTracer:
+    """Тесты трассировки команд WebDriver и бюджета команд"""
+    
+    @allure.story("Трассировка команд")
+    def test_count_and_summary(self):
+        """Команды считаются в трассе и сводятся по именам и шагам"""
+        tracer = CommandTracer(enabled=True)
+        tracer.start("test_x")
+        tracer.on_command("findElement", {"using": "xpath"}, {"value": {}}, 0.25)
+        tracer.on_command("findElement", {"using": "xpath"}, None, 0.5)
+        tracer.on_command("get", {"url": "https://example.com"}, {"value": None}, 1.0)
+        
+        assert tracer.count() == 3
+        trace = tracer.stop()
+        summary = trace["summary"]
+        assert summary["total"]["count"] == 3
+        assert summary["total"]["time"] == pytest.approx(1.75)
+        assert list(summary["by_command"]) == ["findElement", "get"]
+        assert summary["by_step"] == {CommandTracer.OUTSIDE_STEPS: {"count": 3, "time": 1.75}}
+        assert trace["events"][1]["failed"] is True
+        assert tracer.count() == 0
+    
+    @allure.story("Трассировка команд")
+    def test_disabled(self):
+        """Выключенный трассировщик ничего не записывает"""
+        tracer = CommandTracer(enabled=False)
+        tracer.start("test_x")
+        tracer.on_command("get", {"url": "https://example.com"}, {"value": None}, 0.1)
+        
+        assert tracer.count() == 0
+    
+    @allure.story("Бюджет команд")
+    def test_budget_fail(self, monkeypatch):
+        """При mode="fail" превышение бюджета маркера делает тест упавшим"""
+        tracer = CommandTracer(enabled=True)
+        tracer.start("test_x")
+        for _ in range(3):
+            tracer.on_command("findElement", {}, {"value": {}}, 0.01)
+        report = _make_report(FakeItem(pytest.mark.command_budget(2, mode="fail").mark), tracer, monkeypatch)
+        
+        assert report.failed
+        assert "3" in report.longrepr and "2" in report.longrepr
+    
+    @allure.story("Бюджет команд")
+    def test_budget_within(self, monkeypatch):
+        """Укладывающийся в бюджет тест остается успешным"""
+        tracer = CommandTracer(enabled=True)
+        tracer.start("test_x")
+        tracer.on_command("findElement", {}, {"value": {}}, 0.01)
+        report = _make_report(FakeItem(pytest.mark.command_budget(5, mode="fail").mark), tracer, monkeypatch)
+        
+        assert report.passed
@@ -0,0 +1,93 @@
+import sys
+import json
+import pytest
+import allure
+from config.settings import settings
+from utils import driver_resolver as resolver_module
+from utils.driver_resolver import DriverResolver
+
+
+@allure.feature("Утилиты фреймворка")
+class TestDriverResolver:
+    """Тесты поиска chromedriver с кэшем"""
+    
+    @pytest.fixture
+    def driver_file(self, tmp_path):
+        """Файл chromedriver"""
+        path = tmp_path / "chromedriver"
+        path.write_text("")
+        return str(path)
+    
+    @pytest.fixture
+    def offline(self, monkeypatch, tmp_path):
+        """Chrome 120, нет CHROME_DRIVER_PATH, системных путей и webdriver-manager"""
+        monkeypatch.setattr(settings, "CHROME_DRIVER_PATH", str(tmp_path / "missing"))
+        monkeypatch.setattr(DriverResolver, "browser_version", staticmethod(lambda: "120"))
+        monkeypatch.setitem(resolver_module.CHROMEDRIVER_PATHS, resolver_module._platform_key(), [])
+        monkeypatch.setitem(sys.modules, "webdriver_manager.chrome", None)
+    
+    def _resolver(self, tmp_path, cached=None):
+        """Резолвер с кэшем в tmp_path (cached - пути текущего хоста по версиям)"""
+        cache_file = tmp_path / "cache" / "chromedriver.json"
+        resolver = DriverResolver(cache_file=str(cache_file))
+        if cached is not None:
+            cache_file.parent.mkdir(exist_ok=True)
+            cache_file.write_text(json.dumps({resolver.host: cached}))
+        return resolver
+    
+    @allure.story("Поиск chromedriver")
+    def test_major_version(self):
+        """Старшая версия берется из вывода --version"""
+        assert resolver_module._major_version("Google Chrome 120.0.6099.109 ") == "120"
+        assert resolver_module._major_version("ChromeDriver 119.0.6045.105 (abc)") == "119"
+        assert resolver_module._major_version("") is None
+    
+    @allure.story("Поиск chromedriver")
+    def test_settings_path(self, tmp_path, monkeypatch, driver_file):
+        """Существующий CHROME_DRIVER_PATH используется без поиска"""
+        monkeypatch.setattr(settings, "CHROME_DRIVER_PATH", driver_file)
+        resolver = self._resolver(tmp_path)
+        
+        assert resolver.resolve() == driver_file
+        assert resolver.report()["source"] == "settings"
+    
+    @allure.story("Поиск chromedriver")
+    def test_cache_hit_once_per_process(self, tmp_path, monkeypatch, offline, driver_file):
+        """Путь для версии Chrome берется из кэша, поиск выполняется один раз"""
+        resolver = self._resolver(tmp_path, {"120": driver_file})
+        calls = []
+        find = resolver._find
+        monkeypatch.setattr(resolver, "_find", lambda: calls.append(1) or find())
+        
+        assert resolver.resolve() == driver_file
+        assert resolver.resolve() == driver_file
+        assert resolver.report()["source"] == "cache"
+        assert len(calls) == 1
+    
+    @allure.story("Поиск chromedriver")
+    def test_system_path_cached(self, tmp_path, monkeypatch, offline, driver_file):
+        """Системный chromedriver подходящей версии сохраняется в кэш для следующих запусков"""
+        monkeypatch.setitem(resolver_module.CHROMEDRIVER_PATHS, resolver_module._platform_key(), [driver_file])
+        monkeypatch.setattr(resolver_module, "_run_version", lambda binary: "120")
+        resolver = self._resolver(tmp_path)
+        
+        assert resolver.resolve() == driver_file
+        assert resolver.report()["source"] == "system"
+        
+        next_run = self._resolver(tmp_path)
+        assert next_run.resolve() == driver_file
+        assert next_run.report()["source"] == "cache"
+    
+    @allure.story("Поиск chromedriver")
+    def test_offline_fallback(self, tmp_path, offline, driver_file):
+        """Без сети используется последний закэшированный путь хоста другой версии"""
+        resolver = self._resolver(tmp_path, {"119": driver_file})
+        
+        assert resolver.resolve() == driver_file
+        assert resolver.report()["source"] == "cache-offline"
+    
+    @allure.story("Поиск chromedriver")
+    def test_not_found(self, tmp_path, offline):
+        """Без кэша и сети - ошибка"""
+        with pytest.raises(RuntimeError):
+            self._resolver(tmp_path).resolve()
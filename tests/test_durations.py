@@ -0,0 +1,46 @@
+import pytest
+import allure
+from utils.durations import DurationStore
+
+
+@allure.feature("Утилиты фреймворка")
+class TestDurationStore:
+    """Тесты порядка тестов по истории прогонов"""
+    
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Хранилище с историей трех тестов"""
+        store = DurationStore(path=str(tmp_path / "durations.json"))
+        store.record("test_slow", 30.0, "passed")
+        store.record("test_fast", 1.0, "passed")
+        store.record("test_broken", 10.0, "failed")
+        return store
+    
+    @allure.story("Порядок тестов")
+    def test_order_modes(self, store):
+        """Порядок по длительности, упавшие первыми и исходный порядок"""
+        nodeids = ["test_fast", "test_broken", "test_slow"]
+        
+        assert store.order(nodeids, "duration") == ["test_slow", "test_broken", "test_fast"]
+        assert store.order(nodeids, "failed-first") == ["test_broken", "test_fast", "test_slow"]
+        assert store.order(nodeids, "file") == nodeids
+        with pytest.raises(ValueError):
+            store.order(nodeids, "random")
+    
+    @allure.story("Оценка длительности")
+    def test_estimate(self, store):
+        """Тест без истории оценивается медианой известных длительностей"""
+        estimate = store.estimate(["test_slow", "test_fast", "test_new"])
+        
+        assert estimate["total"] == pytest.approx(30.0 + 1.0 + 10.0)
+        assert estimate["longest"] == 30.0
+        assert estimate["tests"] == 3
+        assert estimate["known"] == 2
+        assert estimate["failed"] == 0
+    
+    @allure.story("Оценка длительности")
+    def test_smoothing(self, store):
+        """Длительность сглаживается, а не заменяется последним прогоном"""
+        store.record("test_fast", 11.0)
+        
+        assert store.get("test_fast") == pytest.approx(1.0 + DurationStore.SMOOTHING * 10.0)
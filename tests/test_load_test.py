@@ -0,0 +1,118 @@
+import pytest
+import allure
+import requests
+from utils.stats import summarize
+from utils.load_test import LatencyHistogram, LoadGenerator, format_load_report
+from utils.local_server import LocalServer, StubSearchHandler
+
+
+class FastStubHandler(StubSearchHandler):
+    """Заглушка поиска без задержки"""
+    
+    delay = 0.0
+
+
+class ErrorHandler(StubSearchHandler):
+    """Заглушка, отвечающая 503 на любой запрос"""
+    
+    def do_GET(self):
+        self._send(503, "<html><body>Unavailable</body></html>")
+
+
+@allure.feature("Утилиты фреймворка")
+class TestLatencyHistogram:
+    """Тесты гистограммы задержек"""
+    
+    @allure.story("Перцентили")
+    def test_percentiles_within_precision(self):
+        """Перцентили совпадают с точными с погрешностью не больше 1%"""
+        histogram = LatencyHistogram(significant_digits=2)
+        values = [ms / 1000 for ms in range(1, 1001)]
+        for value in values:
+            histogram.record(value)
+        
+        summary = histogram.summary()
+        exact = summarize(values)
+        assert summary["count"] == 1000
+        assert summary["min"] == pytest.approx(0.001)
+        assert summary["max"] == pytest.approx(1.0)
+        for key in ("p50", "p95", "p99"):
+            assert summary[key] == pytest.approx(exact[key], rel=0.01)
+    
+    @allure.story("Перцентили")
+    def test_empty(self):
+        """Пустая гистограмма дает нули"""
+        histogram = LatencyHistogram()
+        
+        assert histogram.value_at_percentile(99) == 0.0
+        assert histogram.summary()["count"] == 0
+
+
+@allure.feature("Утилиты фреймворка")
+class TestLocalServer:
+    """Тесты локальной заглушки сайта"""
+    
+    @allure.story("Заглушка сайта")
+    def test_stub_pages(self):
+        """Заглушка отдает главную, результаты поиска с экранированным запросом и 404"""
+        with LocalServer(FastStubHandler) as server:
+            home = requests.get(server.url + "/", timeout=5)
+            search = requests.get(server.url + "/search", params={"q": "<книга>"}, timeout=5)
+            missing = requests.get(server.url + "/missing", timeout=5)
+        
+        assert home.status_code == 200 and "Главная" in home.text
+        assert search.status_code == 200 and "&lt;книга&gt;" in search.text
+        assert missing.status_code == 404
+    
+    @allure.story("Заглушка сайта")
+    def test_url_requires_start(self):
+        """Адрес не запущенного сервера - ошибка"""
+        with pytest.raises(RuntimeError):
+            LocalServer(FastStubHandler).url
+
+
+@allure.feature("Утилиты фреймворка")
+class TestLoadGenerator:
+    """Тесты генератора нагрузки на локальной заглушке"""
+    
+    @allure.story("Нагрузка на поиск")
+    def test_rate_limited_run(self):
+        """При rps > 0 число запросов определяется частотой и длительностью"""
+        with LocalServer(FastStubHandler) as server:
+            result = LoadGenerator(server.url, ["книга", "python"], rps=40, concurrency=2, duration=0.5).run()
+        
+        assert result["requests"] == pytest.approx(20, abs=1)
+        assert result["errors"] == 0 and result["error_types"] == {}
+        assert result["status_codes"] == {"200": result["requests"]}
+        assert result["latency"]["count"] == result["requests"]
+        assert sum(count for _, count in result["histogram"]) == result["requests"]
+    
+    @allure.story("Нагрузка на поиск")
+    def test_http_errors_by_status(self):
+        """Ответы 5xx считаются ошибками по статусам"""
+        with LocalServer(ErrorHandler) as server:
+            result = LoadGenerator(server.url, ["книга"], rps=20, concurrency=1, duration=0.25).run()
+        
+        assert result["errors"] == result["requests"] > 0
+        assert result["error_rate"] == 1.0
+        assert result["status_codes"] == {"503": result["requests"]}
+    
+    @allure.story("Нагрузка на поиск")
+    def test_connection_errors_by_type(self):
+        """Запросы без ответа считаются ошибками по типам исключений и видны в отчете"""
+        server = LocalServer(FastStubHandler)
+        url = server.start()
+        server.stop()
+        
+        result = LoadGenerator(url, ["книга"], rps=20, concurrency=1, duration=0.25).run()
+        
+        assert result["errors"] == result["requests"] > 0
+        assert result["error_types"] == {"ConnectionError": result["requests"]}
+        assert result["status_codes"] == {}
+        assert "ConnectionError" in format_load_report(result)
+    
+    @allure.story("Нагрузка на поиск")
+    def test_requires_queries(self):
+        """Без поисковых запросов генератор не создается"""
+        with pytest.raises(ValueError):
+            LoadGenerator("http://127.0.0.1", [])
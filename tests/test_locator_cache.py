@@ -0,0 +1,63 @@
+import json
+import pytest
+import allure
+from selenium.webdriver.common.by import By
+from utils.locator_cache import LocatorCache
+
+
+@allure.feature("Утилиты фреймворка")
+class TestLocatorCache:
+    """Тесты кэша сработавших локаторов"""
+    
+    LOCATORS = [
+        (By.CSS_SELECTOR, ".cart"),
+        (By.CSS_SELECTOR, ".basket"),
+        (By.XPATH, "//a[contains(@href, 'cart')]")
+    ]
+    
+    @allure.story("Порядок локаторов")
+    def test_winner_goes_first(self, tmp_path):
+        """Сработавший локатор проверяется первым, остальные в исходном порядке"""
+        cache = LocatorCache(path=str(tmp_path / "locators.json"))
+        assert cache.order("MainPage.CART", self.LOCATORS) == [0, 1, 2]
+        
+        cache.record_hit("MainPage.CART", self.LOCATORS, 2, missed=[0, 1])
+        
+        assert cache.order("MainPage.CART", self.LOCATORS) == [2, 0, 1]
+    
+    @allure.story("Порядок локаторов")
+    def test_missed_selector_decays(self, tmp_path):
+        """Локатор, не сработавший раньше победителя, теряет первое место"""
+        cache = LocatorCache(path=str(tmp_path / "locators.json"), decay=0.5)
+        cache.record_hit("MainPage.CART", self.LOCATORS, 0, missed=[])
+        cache.record_hit("MainPage.CART", self.LOCATORS, 1, missed=[0])
+        
+        assert cache.order("MainPage.CART", self.LOCATORS)[0] == 1
+    
+    @allure.story("Порядок локаторов")
+    def test_whole_list_miss_decays(self, tmp_path):
+        """Промах всего списка уменьшает рейтинг всех проверенных локаторов"""
+        cache = LocatorCache(path=str(tmp_path / "locators.json"), decay=0.5)
+        cache.record_hit("MainPage.CART", self.LOCATORS, 0, missed=[])
+        cache.record_hit("MainPage.CART", self.LOCATORS, 0, missed=[])
+        
+        cache.record_miss("MainPage.CART", self.LOCATORS, missed=[0, 1, 2])
+        
+        entry = cache.report()["MainPage.CART"]["selectors"][0]
+        assert entry["score"] == pytest.approx(1.0)
+        assert entry["misses"] == 1
+    
+    @allure.story("Сохранение кэша")
+    def test_save_merges_workers(self, tmp_path):
+        """Сохранение не затирает списки, сохраненные другим воркером"""
+        path = str(tmp_path / "cache" / "locators.json")
+        first = LocatorCache(path=path)
+        second = LocatorCache(path=path)
+        first.record_hit("MainPage.CART", self.LOCATORS, 0, missed=[])
+        second.record_hit("SearchPage.CART", self.LOCATORS, 1, missed=[0])
+        
+        first.save()
+        second.save()
+        
+        with open(path, encoding="utf-8") as f:
+            assert set(json.load(f)) == {"MainPage.CART", "SearchPage.CART"}
@@ -0,0 +1,96 @@
+import json
+import queue
+import logging
+import logging.handlers
+import pytest
+import allure
+from utils import logger as logger_module
+from utils.logger import StructuredLogger, JsonLinesFormatter, get_logger, log_file_path
+
+
+class CountingArg:
+    """Аргумент сообщения, считающий свои форматирования"""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def __str__(self):
+        self.calls += 1
+        return "arg"
+
+
+@pytest.fixture
+def records(monkeypatch):
+    """Записи логгера chitai.tests без передачи в журнал сессии"""
+    handler = logging.handlers.BufferingHandler(capacity=100)
+    logger = logging.getLogger("chitai.tests")
+    monkeypatch.setattr(logger, "propagate", False)
+    monkeypatch.setattr(logger, "level", logging.INFO)
+    logger.addHandler(handler)
+    yield handler.buffer
+    logger.removeHandler(handler)
+
+
+@allure.feature("Утилиты фреймворка")
+class TestStructuredLogger:
+    """Тесты логгера фреймворка"""
+    
+    @allure.story("Журнал")
+    def test_disabled_level_is_lazy(self, records):
+        """Сообщение выключенного уровня не форматируется и не создает запись"""
+        log = get_logger("tests")
+        argument = CountingArg()
+        log.debug("Команда %s", argument)
+        
+        assert not log.is_enabled(logger_module.DEBUG)
+        assert records == []
+        assert argument.calls == 0
+    
+    @allure.story("Журнал")
+    def test_fields_and_bind(self, records):
+        """Поля вызова объединяются с постоянными полями bind()"""
+        log = get_logger("tests", page="MainPage").bind(attempt=1)
+        log.info("Клик по %s", "кнопке", locator="xpath=//button", attempt=2)
+        
+        assert len(records) == 1
+        assert records[0].getMessage() == "Клик по кнопке"
+        assert records[0].fields == {"page": "MainPage", "attempt": 2, "locator": "xpath=//button"}
+    
+    @allure.story("Журнал")
+    def test_json_lines_sink(self, tmp_path, monkeypatch):
+        """Записи форматируются в потоке QueueListener в JSON строки с полями"""
+        path = tmp_path / "framework.jsonl"
+        file_handler = logging.FileHandler(path, encoding="utf-8")
+        file_handler.setFormatter(JsonLinesFormatter())
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, file_handler)
+        logger = logging.getLogger("chitai.tests.sink")
+        monkeypatch.setattr(logger, "propagate", False)
+        monkeypatch.setattr(logger, "level", logging.DEBUG)
+        queue_handler = logger_module._DeferredQueueHandler(log_queue)
+        logger.addHandler(queue_handler)
+        
+        argument = CountingArg()
+        StructuredLogger("tests.sink").info("Значение %s", argument, elapsed=0.5, element=object())
+        calls_in_caller = argument.calls
+        listener.start()
+        listener.stop()
+        logger.removeHandler(queue_handler)
+        file_handler.close()
+        
+        entry = json.loads(path.read_text(encoding="utf-8").strip())
+        assert calls_in_caller == 0
+        assert entry["message"] == "Значение arg"
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "chitai.tests.sink"
+        assert entry["elapsed"] == 0.5
+        assert entry["element"].startswith("<object")
+    
+    @allure.story("Журнал")
+    def test_worker_file(self, monkeypatch):
+        """У воркера xdist свой файл журнала"""
+        monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+        assert log_file_path("reports/framework.jsonl") == "reports/framework.jsonl"
+        
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+        assert log_file_path("reports/framework.jsonl") == "reports/framework-gw1.jsonl"
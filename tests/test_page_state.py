@@ -0,0 +1,89 @@
+import allure
+from selenium.common.exceptions import WebDriverException
+from utils.page_state import PageState, count_query, visible_query, cards_query
+
+
+QUERIES = {
+    "results": count_query([("css selector", ".product-card")]),
+    "no_results": visible_query([("xpath", "//*[contains(text(), 'ничего не нашлось')]")]),
+    "products": cards_query(".product-card")
+}
+
+
+class FakeDriver:
+    """Драйвер, отвечающий на скрипт PAGE_STATE как браузер с версией DOM"""
+    
+    def __init__(self):
+        self.version = "doc-1:0"
+        self.url = "https://example.com/search?q=1"
+        self.values = {"results": 3, "no_results": False, "products": [{"title": "Книга"}]}
+        self.computed = []
+        self.fail = False
+    
+    def execute_script(self, script, queries, version, cached):
+        if self.fail:
+            raise WebDriverException("no such window")
+        skipped = set(cached) if version == self.version else set()
+        names = [name for name in queries if name not in skipped]
+        self.computed.append(names)
+        return {"version": self.version, "url": self.url, "values": {name: self.values[name] for name in names}}
+
+
+@allure.feature("Утилиты фреймворка")
+class TestPageState:
+    """Тесты кэша состояния страницы"""
+    
+    @allure.story("Состояние страницы")
+    def test_cached_until_dom_changes(self):
+        """Посчитанные значения не пересчитываются, пока версия DOM та же"""
+        driver = FakeDriver()
+        state = PageState(driver)
+        
+        first = state.query({"results": QUERIES["results"]})
+        second = state.query(QUERIES)
+        
+        assert first == {"url": driver.url, "results": 3}
+        assert second["products"] == [{"title": "Книга"}] and second["results"] == 3
+        assert driver.computed == [["results"], ["no_results", "products"]]
+        assert state.hits == 1 and state.misses == 3
+    
+    @allure.story("Состояние страницы")
+    def test_new_version_resets_cache(self):
+        """Мутация DOM меняет версию: все значения считаются заново"""
+        driver = FakeDriver()
+        state = PageState(driver)
+        state.query(QUERIES)
+        
+        driver.version = "doc-1:1"
+        driver.values["results"] = 0
+        result = state.query(QUERIES)
+        
+        assert result["results"] == 0
+        assert driver.computed[-1] == list(QUERIES)
+    
+    @allure.story("Состояние страницы")
+    def test_script_failure_returns_defaults(self):
+        """Если скрипт не выполнился, возвращаются значения по умолчанию и кэш сбрасывается"""
+        driver = FakeDriver()
+        state = PageState(driver)
+        state.query(QUERIES)
+        
+        driver.fail = True
+        result = state.query(QUERIES)
+        
+        assert result == {"url": "", "results": 0, "no_results": False, "products": []}
+        driver.fail = False
+        state.query(QUERIES)
+        assert driver.computed[-1] == list(QUERIES)
+    
+    @allure.story("Состояние страницы")
+    def test_invalidate(self):
+        """invalidate() заставляет посчитать все значения заново"""
+        driver = FakeDriver()
+        state = PageState(driver)
+        state.query(QUERIES)
+        
+        state.invalidate()
+        state.query(QUERIES)
+        
+        assert driver.computed == [list(QUERIES), list(QUERIES)]
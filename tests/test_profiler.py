@@ -0,0 +1,45 @@
+import pytest
+import allure
+from utils.profiler import merge_tree, folded_stacks
+
+
+def _frame(name, wall, children=(), commands=0):
+    """Шаг профиля в формате StepProfiler.stop"""
+    return {
+        "name": name, "wall": wall, "commands": commands, "command_time": 0.0,
+        "wait_time": 0.0, "timeout_time": 0.0, "failed": False, "children": list(children)
+    }
+
+
+@allure.feature("Утилиты фреймворка")
+class TestProfiler:
+    """Тесты дерева шагов профиля"""
+    
+    @allure.story("Flame graph")
+    def test_merge_tree(self):
+        """Одноименные соседние шаги склеиваются с суммой метрик"""
+        tree = merge_tree(_frame("test", 1.0, [
+            _frame("SearchPage.search", 0.2, commands=3),
+            _frame("SearchPage.search", 0.3, commands=4),
+            _frame("CartPage.open", 0.4)
+        ]))
+        
+        search, cart = tree["children"][0], tree["children"][1]
+        assert search["name"] == "SearchPage.search"
+        assert search["calls"] == 2
+        assert search["wall"] == pytest.approx(0.5)
+        assert search["commands"] == 7
+        assert cart["calls"] == 1
+    
+    @allure.story("Flame graph")
+    def test_folded_stacks(self):
+        """Folded stacks содержат собственное время каждого шага в миллисекундах"""
+        tree = merge_tree(_frame("tests/test_ui.py::test cart", 1.0, [
+            _frame("CartPage.open", 0.4, [_frame("CartPage.close_popups", 0.1)])
+        ]))
+        
+        assert folded_stacks(tree) == [
+            "tests/test_ui.py::test_cart 600",
+            "tests/test_ui.py::test_cart;CartPage.open 300",
+            "tests/test_ui.py::test_cart;CartPage.open;CartPage.close_popups 100"
+        ]
@@ -0,0 +1,84 @@
+import pytest
+import allure
+import requests
+from utils.replay_server import ReplayArchive, ReplayServer
+
+
+@allure.feature("Утилиты фреймворка")
+class TestReplayArchive:
+    """Тесты архива записанных ответов"""
+    
+    @allure.story("Запись и воспроизведение")
+    def test_key_normalization(self):
+        """Ключ не зависит от порядка параметров и регистра метода"""
+        assert ReplayArchive.key("get", "/search?q=книга&page=2") == ReplayArchive.key("GET", "/search?page=2&q=книга")
+        assert ReplayArchive.key("GET", "") == "GET /"
+        assert ReplayArchive.key("GET", "/search?q=") == "GET /search?q="
+        assert ReplayArchive.key("GET", "/search?q=1") != ReplayArchive.key("POST", "/search?q=1")
+    
+    @allure.story("Запись и воспроизведение")
+    def test_round_trip(self, tmp_path):
+        """Сохраненные ответы читаются новым архивом, одинаковые тела хранятся один раз"""
+        path = str(tmp_path / "replay.json.gz")
+        archive = ReplayArchive(path)
+        headers = [["Content-Type", "text/html; charset=utf-8"]]
+        archive.put(ReplayArchive.key("GET", "/"), 200, headers, "<html>Главная</html>".encode("utf-8"))
+        archive.put(ReplayArchive.key("GET", "/copy"), 200, headers, "<html>Главная</html>".encode("utf-8"))
+        archive.save()
+        
+        loaded = ReplayArchive(path)
+        response = loaded.get("GET /")
+        assert len(loaded) == 2
+        assert len(loaded._bodies) == 1
+        assert response["status"] == 200
+        assert response["headers"] == headers
+        assert response["body"].decode("utf-8") == "<html>Главная</html>"
+        assert loaded.get("GET /missing") is None
+    
+    @allure.story("Запись и воспроизведение")
+    def test_save_merges_workers(self, tmp_path):
+        """Архивы двух процессов дописывают свои ответы, не затирая чужие"""
+        path = str(tmp_path / "replay.json.gz")
+        first, second = ReplayArchive(path), ReplayArchive(path)
+        first.put("GET /a", 200, [], b"a")
+        second.put("GET /b", 200, [], b"b")
+        first.save()
+        second.save()
+        
+        merged = ReplayArchive(path)
+        assert merged.get("GET /a")["body"] == b"a"
+        assert merged.get("GET /b")["body"] == b"b"
+
+
+@allure.feature("Утилиты фреймворка")
+class TestReplayServer:
+    """Тесты воспроизведения записанных ответов"""
+    
+    @allure.story("Запись и воспроизведение")
+    def test_replay(self, tmp_path):
+        """Записанный ответ отдается со ссылками на адрес сервера, неизвестный запрос - 404"""
+        path = str(tmp_path / "replay.json.gz")
+        archive = ReplayArchive(path)
+        archive.put(ReplayArchive.key("GET", "/search?q=книга"), 200, [["Content-Type", "text/html"]],
+                    b'<a href="https://www.chitai-gorod.ru/cart">cart</a>')
+        archive.save()
+        
+        server = ReplayServer(mode="replay", archive_path=path, upstream="https://www.chitai-gorod.ru", hosts=[])
+        url = server.start()
+        try:
+            found = requests.get(f"{url}/search", params={"q": "книга"}, timeout=5)
+            missing = requests.get(f"{url}/missing", timeout=5)
+        finally:
+            server.stop()
+        
+        assert found.status_code == 200
+        assert f'href="{url}/cart"' in found.text
+        assert missing.status_code == 404
+        assert missing.headers["X-Replay-Miss"] == "GET /missing"
+        assert server.hits == 1 and server.misses == ["GET /missing"]
+    
+    @allure.story("Запись и воспроизведение")
+    def test_unknown_mode(self, tmp_path):
+        """Неизвестный режим - ошибка"""
+        with pytest.raises(ValueError):
+            ReplayServer(mode="off", archive_path=str(tmp_path / "replay.json.gz"))
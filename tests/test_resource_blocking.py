@@ -0,0 +1,119 @@
+import json
+import pytest
+import allure
+from utils.resource_blocking import ResourceMonitor, blocked_url_patterns
+
+
+def _entry(method, **params):
+    """Запись performance лога в формате ChromeDriver"""
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+def _sent(request_id, url, page="https://example.com/search?q=1", resource_type="Image"):
+    return _entry("Network.requestWillBeSent", requestId=request_id, documentURL=page,
+                  type=resource_type, request={"url": url})
+
+
+class FakeDriver:
+    """Драйвер, отдающий заранее заданные порции performance лога"""
+    
+    def __init__(self, *batches):
+        self.batches = list(batches)
+    
+    def get_log(self, log_type):
+        assert log_type == "performance"
+        return self.batches.pop(0) if self.batches else []
+
+
+@allure.feature("Утилиты фреймворка")
+class TestBlockedUrlPatterns:
+    """Тесты шаблонов блокировки"""
+    
+    @allure.story("Блокировка ресурсов")
+    def test_types_become_extensions(self):
+        """Тип ресурса превращается в шаблоны по расширению с query-строкой и без"""
+        patterns = blocked_url_patterns(["*mc.yandex.ru*"], ["font"])
+        
+        assert patterns[0] == "*mc.yandex.ru*"
+        assert "*.woff2" in patterns and "*.woff2?*" in patterns
+        assert not any(pattern.endswith(".png") for pattern in patterns)
+    
+    @allure.story("Блокировка ресурсов")
+    def test_unknown_type(self):
+        """Неизвестный тип ресурса - ошибка"""
+        with pytest.raises(ValueError):
+            blocked_url_patterns([], ["video"])
+
+
+@allure.feature("Утилиты фреймворка")
+class TestResourceMonitor:
+    """Тесты учета запросов по performance логу"""
+    
+    @allure.story("Блокировка ресурсов")
+    def test_disabled_ignores_log(self, tmp_path):
+        """Без RESOURCE_REPORT лог не читается"""
+        monitor = ResourceMonitor(path=str(tmp_path / "resources.json"), run_dir=str(tmp_path / "run"),
+                                  enabled=False)
+        driver = FakeDriver([_sent("1", "https://example.com/a.png")])
+        
+        assert monitor.collect(driver) == {}
+        assert len(driver.batches) == 1
+    
+    @allure.story("Блокировка ресурсов")
+    def test_saved_bytes_from_known_sizes(self, tmp_path):
+        """Сэкономленные байты считаются по размерам, загруженным раньше; запрос может быть разбит по порциям"""
+        monitor = ResourceMonitor(path=str(tmp_path / "resources.json"), run_dir=str(tmp_path / "run"),
+                                  enabled=True)
+        calibration = FakeDriver(
+            [_sent("1", "https://example.com/a.png?v=1")],
+            [_entry("Network.loadingFinished", requestId="1", encodedDataLength=1200)]
+        )
+        monitor.collect(calibration)
+        pages = monitor.collect(calibration)
+        
+        assert pages["https://example.com/search"]["bytes_loaded"] == 1200
+        
+        driver = FakeDriver([
+            _sent("2", "https://example.com/a.png?v=2"),
+            _sent("3", "https://example.com/b.png"),
+            _entry("Network.loadingFailed", requestId="2", blockedReason="inspector", type="Image"),
+            _entry("Network.loadingFailed", requestId="3", blockedReason="inspector", type="Image")
+        ])
+        stats = monitor.collect(driver)["https://example.com/search"]
+        
+        assert stats["requests"] == 2 and stats["blocked"] == 2
+        assert stats["bytes_saved"] == 1200
+        assert stats["unknown_size"] == 1
+        assert stats["blocked_by_type"] == {"Image": 2}
+    
+    @allure.story("Блокировка ресурсов")
+    def test_content_length_for_cached(self, tmp_path):
+        """Для ответа из кэша размер берется из Content-Length"""
+        monitor = ResourceMonitor(path=str(tmp_path / "resources.json"), run_dir=str(tmp_path / "run"),
+                                  enabled=True)
+        monitor.collect(FakeDriver([
+            _sent("1", "https://example.com/c.woff2", resource_type="Font"),
+            _entry("Network.responseReceived", requestId="1", response={"headers": {"content-length": "900"}}),
+            _entry("Network.loadingFinished", requestId="1", encodedDataLength=0)
+        ]))
+        stats = monitor.collect(FakeDriver([
+            _sent("2", "https://example.com/c.woff2", resource_type="Font"),
+            _entry("Network.loadingFailed", requestId="2", blockedReason="inspector")
+        ]))["https://example.com/search"]
+        
+        assert stats["bytes_saved"] == 900
+    
+    @allure.story("Блокировка ресурсов")
+    def test_sizes_bounded(self, tmp_path):
+        """Хранятся только последние max_sizes размеров, и они переживают сохранение"""
+        path = str(tmp_path / "resources.json")
+        monitor = ResourceMonitor(path=path, run_dir=str(tmp_path / "run"), enabled=True, max_sizes=2)
+        entries = []
+        for index, name in enumerate(["a", "b", "c"]):
+            entries.append(_sent(str(index), f"https://example.com/{name}.png"))
+            entries.append(_entry("Network.loadingFinished", requestId=str(index), encodedDataLength=100))
+        monitor.collect(FakeDriver(entries))
+        monitor.save()
+        
+        sizes = ResourceMonitor(path=path, run_dir=str(tmp_path / "run"))._data["sizes"]
+        assert list(sizes) == ["https://example.com/b.png", "https://example.com/c.png"]
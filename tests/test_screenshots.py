@@ -0,0 +1,85 @@
+import io
+import os
+import pytest
+import allure
+from utils.screenshots import ScreenshotService
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _png(reverse=False, dot=False):
+    """PNG 64x32 с горизонтальным градиентом (dot - с одной измененной точкой)"""
+    image = Image.new("L", (64, 32))
+    image.putdata([(255 - x * 4 if reverse else x * 4) for _ in range(32) for x in range(64)])
+    if dot:
+        image.putpixel((10, 10), 0)
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class FakeDriver:
+    """Драйвер, отдающий заранее заданные скриншоты"""
+    
+    def __init__(self, *frames):
+        self.frames = list(frames)
+    
+    def get_screenshot_as_png(self):
+        return self.frames.pop(0)
+
+
+@allure.feature("Утилиты фреймворка")
+class TestScreenshotService:
+    """Тесты фонового конвейера скриншотов"""
+    
+    @pytest.fixture
+    def service(self, tmp_path):
+        """Сервис PNG без уменьшения в одном потоке"""
+        service = ScreenshotService(directory=str(tmp_path), image_format="png", max_width=0, workers=1)
+        yield service
+        service.shutdown()
+    
+    @allure.story("Скриншоты")
+    def test_unknown_format(self, tmp_path):
+        """Неизвестный формат - ошибка"""
+        with pytest.raises(ValueError):
+            ScreenshotService(directory=str(tmp_path), image_format="bmp")
+    
+    @allure.story("Скриншоты")
+    def test_near_duplicates_saved_once(self, service, tmp_path):
+        """Почти одинаковые кадры теста сохраняются один раз, скриншот падения - всегда"""
+        driver = FakeDriver(_png(), _png(dot=True), _png(reverse=True), _png())
+        service.capture(driver, "open")
+        service.capture(driver, "open again")
+        service.capture(driver, "other")
+        service.capture(driver, "failure", dedup=False)
+        
+        assert service.flush() == 3
+        assert service.summary()["duplicates"] == 1
+        assert len(os.listdir(tmp_path)) == 3
+    
+    @allure.story("Скриншоты")
+    def test_dedup_per_test(self, service):
+        """После flush() кадры следующего теста не сравниваются с предыдущими"""
+        service.capture(FakeDriver(_png()), "first test")
+        service.flush()
+        service.capture(FakeDriver(_png()), "second test")
+        
+        assert service.flush() == 1
+        assert service.summary()["duplicates"] == 0
+    
+    @allure.story("Скриншоты")
+    def test_eviction(self, tmp_path):
+        """Сверх лимита каталога удаляются самые старые приложенные кадры"""
+        frame = _png()
+        service = ScreenshotService(directory=str(tmp_path), image_format="png", max_width=0, workers=1,
+                                    storage_limit=len(frame) * 2)
+        for index in range(3):
+            service.capture(FakeDriver(frame), f"frame {index}")
+            service.flush()
+        service.shutdown()
+        
+        summary = service.summary()
+        assert summary["evicted"] == 1
+        assert summary["stored_bytes"] <= len(frame) * 2
+        assert sorted(os.listdir(tmp_path))[0].endswith("00002-frame_1.png")
@@ -0,0 +1,108 @@
+import pytest
+import allure
+from config.settings import settings
+from utils.stats import summarize
+from utils.timing_store import TimingStore
+
+
+@allure.feature("Утилиты фреймворка")
+class TestStats:
+    """Тесты сводной статистики"""
+    
+    @allure.story("Перцентили")
+    def test_summarize(self):
+        """Сводка считает count, min, max, mean и перцентили с интерполяцией"""
+        summary = summarize(range(1, 101))
+        
+        assert summary["count"] == 100
+        assert summary["min"] == 1 and summary["max"] == 100
+        assert summary["mean"] == pytest.approx(50.5)
+        assert summary["p50"] == pytest.approx(50.5)
+        assert summary["p99"] == pytest.approx(99.01)
+    
+    @allure.story("Перцентили")
+    def test_summarize_empty(self):
+        """Пустой набор дает нули"""
+        assert summarize([]) == {"count": 0, "min": 0.0, "max": 0.0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+
+@allure.feature("Утилиты фреймворка")
+class TestTimingStore:
+    """Тесты таймаутов по наблюдаемым задержкам"""
+    
+    @allure.story("Адаптивные таймауты")
+    def test_default_without_history(self, tmp_path):
+        """Без достаточной истории используется таймаут вызывающего кода"""
+        store = TimingStore(path=str(tmp_path / "timings.json"))
+        for _ in range(settings.TIMING_MIN_SAMPLES - 1):
+            store.record("SearchPage", "xpath=//div", "found", 0.2)
+        
+        assert store.suggest_timeout("SearchPage", "xpath=//div", 10) == 10
+    
+    @allure.story("Адаптивные таймауты")
+    def test_learned_timeout(self, tmp_path):
+        """Таймаут равен p99 с запасом, но не меньше TIMEOUT_FLOOR и не больше заданного"""
+        store = TimingStore(path=str(tmp_path / "timings.json"))
+        for _ in range(settings.TIMING_MIN_SAMPLES):
+            store.record("SearchPage", "xpath=//div", "found", 2.0)
+            store.record("SearchPage", "xpath=//fast", "found", 0.01)
+        
+        assert store.suggest_timeout("SearchPage", "xpath=//div", 10) == pytest.approx(2.0 * settings.TIMEOUT_SAFETY_MARGIN)
+        assert store.suggest_timeout("SearchPage", "xpath=//div", 2) == 2
+        assert store.suggest_timeout("SearchPage", "xpath=//fast", 10) == settings.TIMEOUT_FLOOR
+    
+    @allure.story("Адаптивные таймауты")
+    def test_negative_check_uses_floor(self, tmp_path):
+        """Отрицательная проверка без поздних появлений ждет TIMEOUT_FLOOR"""
+        store = TimingStore(path=str(tmp_path / "timings.json"))
+        for _ in range(settings.TIMING_MIN_SAMPLES):
+            store.record("SearchPage", "xpath=//div", "timeout", 10.0)
+        
+        assert store.suggest_timeout("SearchPage", "xpath=//div", 10) == settings.TIMEOUT_FLOOR
+    
+    @allure.story("Адаптивные таймауты")
+    def test_late_success_widens_negative_check(self, tmp_path):
+        """Позднее появление элемента в истории расширяет таймаут отрицательной проверки"""
+        store = TimingStore(path=str(tmp_path / "timings.json"))
+        for _ in range(settings.TIMING_MIN_SAMPLES):
+            store.record("SearchPage", "xpath=//div", "timeout", 1.0)
+        store.record("SearchPage", "xpath=//div", "found", 4.0)
+        
+        assert store.suggest_timeout("SearchPage", "xpath=//div", 10) == pytest.approx(4.0 * settings.TIMEOUT_SAFETY_MARGIN)
+    
+    @allure.story("Адаптивные таймауты")
+    def test_key_depends_on_host(self, tmp_path, monkeypatch):
+        """Задержки другого хоста не влияют на таймаут"""
+        store = TimingStore(path=str(tmp_path / "timings.json"))
+        monkeypatch.setattr(settings, "BASE_URL", "http://127.0.0.1:8000")
+        for _ in range(settings.TIMING_MIN_SAMPLES):
+            store.record("SearchPage", "xpath=//div", "found", 0.01)
+        monkeypatch.setattr(settings, "BASE_URL", "https://www.chitai-gorod.ru")
+        
+        assert store.suggest_timeout("SearchPage", "xpath=//div", 10) == 10
+    
+    @allure.story("Адаптивные таймауты")
+    def test_key_ignores_port(self, tmp_path, monkeypatch):
+        """Локальный сервер на новом порту продолжает ту же историю"""
+        store = TimingStore(path=str(tmp_path / "timings.json"))
+        monkeypatch.setattr(settings, "BASE_URL", "http://127.0.0.1:41001")
+        for _ in range(settings.TIMING_MIN_SAMPLES):
+            store.record("SearchPage", "xpath=//div", "found", 2.0)
+        monkeypatch.setattr(settings, "BASE_URL", "http://127.0.0.1:41002")
+        
+        assert store.suggest_timeout("SearchPage", "xpath=//div", 10) == pytest.approx(2.0 * settings.TIMEOUT_SAFETY_MARGIN)
+    
+    @allure.story("Адаптивные таймауты")
+    def test_save_merges_workers(self, tmp_path):
+        """Сохранение не затирает замеры, сохраненные другим воркером"""
+        path = str(tmp_path / "cache" / "timings.json")
+        first = TimingStore(path=path)
+        second = TimingStore(path=path)
+        first.record("SearchPage", "xpath=//div", "found", 1.0)
+        second.record("CartPage", "xpath=//span", "found", 2.0)
+        
+        first.save()
+        second.save()
+        
+        assert TimingStore(path=path).samples("CartPage", "xpath=//span", "found") == [2.0]
+        assert TimingStore(path=path).samples("SearchPage", "xpath=//div", "found") == [1.0]
@@ -5,26 +5,27 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.action_chains import ActionChains
-from utils.driver_factory import DriverFactory
 from pages.main_page import MainPage
 from pages.search_page import SearchPage
 from pages.cart_page import CartPage
 from config.settings import settings
 from config.test_data import test_data
+from utils.screenshots import screenshot_service
+from utils.url_router import url_router
 
 
 class TestUI:
     """Класс для UI тестов сайта 'Читай Город'"""
 
     @pytest.fixture(autouse=True)
-    def setup(self):
+    def setup(self, driver_pool):
         """
         Настройка перед каждым тестом
         
-        Инициализирует WebDriver и Page Objects
+        Берет WebDriver из пула сессии и инициализирует Page Objects
         """
-        with allure.step("Инициализация WebDriver"):
-            self.driver = DriverFactory.create_chrome_driver()
+        with allure.step("Получение WebDriver из пула"):
+            self.driver = driver_pool.acquire()
         
         self.main_page = MainPage(self.driver)
         self.search_page = SearchPage(self.driver)
@@ -33,24 +34,26 @@ class TestUI:
         
         yield
         
-        with allure.step("Завершение работы WebDriver"):
-            DriverFactory.close_driver(self.driver)
+        meter = getattr(self.driver, "implicit_wait_meter", None)
+        if meter is not None and meter.blocked_calls:
+            allure.attach(
+                f"Время в неявных ожиданиях: {meter.consumed:.2f} c\n"
+                f"Поисков без результата: {meter.blocked_calls}",
+                name="Implicit Wait Time",
+                attachment_type=allure.attachment_type.TEXT
+            )
+        
+        with allure.step("Возврат WebDriver в пул"):
+            driver_pool.release(self.driver)
 
     def wait_for_page_load(self, timeout=10):
-        """Ожидание загрузки страницы"""
-        return self.wait.until(
-            lambda driver: driver.execute_script("return document.readyState") == "complete"
-        )
+        """Ожидание загрузки страницы (с учетом PAGE_LOAD_STRATEGY)"""
+        self.main_page.wait_for_page_load(timeout)
+        return True
 
     def take_screenshot(self, name):
-        """Сделать скриншот"""
-        try:
-            import time
-            screenshot_path = f"screenshots/{name}_{int(time.time())}.png"
-            self.driver.save_screenshot(screenshot_path)
-            allure.attach.file(screenshot_path, name=name, attachment_type=allure.attachment_type.PNG)
-        except:
-            pass
+        """Сделать скриншот (сжатие и запись в фоне, вложение в конце теста)"""
+        screenshot_service.capture(self.driver, name)
 
     def safe_click(self, element):
         """Безопасный клик с разными методами"""
@@ -335,14 +338,8 @@ class TestUI:
         """
         search_query = "Гарри Поттер"
         
-        with allure.step("Открыть главную страницу"):
-            self.main_page.open(settings.BASE_URL)
-            self.wait_for_page_load()
-            self.take_screenshot("main_page_before_add_to_cart")
-            print("✓ Главная страница загружена")
-
-        with allure.step(f"Выполнить поиск по запросу: {search_query}"):
-            self.main_page.search_for(search_query)
+        with allure.step(f"Перейти к результатам поиска по запросу: {search_query}"):
+            self.main_page.go_to_search_results(search_query)
             self.take_screenshot("search_page_before_add")
             print("✓ Поиск выполнен")
 
@@ -416,7 +413,7 @@ class TestUI:
                 
                 try:
                     print("Пробуем прямой переход в корзину...")
-                    self.driver.get(f"{settings.BASE_URL}/cart")
+                    self.driver.get(url_router.cart())
                     self.wait_for_page_load()
                     self.take_screenshot("cart_page_direct")
                     print("✓ Прямой переход в корзину выполнен")
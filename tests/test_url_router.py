@@ -0,0 +1,37 @@
+import pytest
+import allure
+from config.settings import settings
+from utils.url_router import UrlRouter
+
+
+@allure.feature("Утилиты фреймворка")
+class TestUrlRouter:
+    """Тесты адресов для прямых переходов"""
+    
+    @allure.story("Адреса страниц")
+    def test_follows_base_url(self, monkeypatch):
+        """Адреса строятся от BASE_URL в момент вызова, запрос экранируется"""
+        router = UrlRouter(mode="fast")
+        monkeypatch.setattr(settings, "BASE_URL", "http://127.0.0.1:8000/")
+        
+        assert router.home() == "http://127.0.0.1:8000/"
+        assert router.cart() == "http://127.0.0.1:8000/cart"
+        assert router.search("гарри поттер") == \
+            "http://127.0.0.1:8000/search?phrase=%D0%B3%D0%B0%D1%80%D1%80%D0%B8%20%D0%BF%D0%BE%D1%82%D1%82%D0%B5%D1%80"
+    
+    @allure.story("Адреса страниц")
+    def test_product(self):
+        """Карточка товара строится из slug или из href ссылки на товар"""
+        router = UrlRouter(base_url="https://example.test", mode="fast")
+        
+        assert router.product("book-123") == "https://example.test/product/book-123"
+        assert router.product("/product/book-123?from=search") == "https://example.test/product/book-123?from=search"
+        assert router.product("https://other.test/product/1") == "https://other.test/product/1"
+    
+    @allure.story("Режим навигации")
+    def test_modes(self):
+        """Режим "ui" не включает прямые переходы, неизвестный режим отклоняется"""
+        assert not UrlRouter(mode="ui").fast
+        assert UrlRouter(mode="fast").fast
+        with pytest.raises(ValueError):
+            UrlRouter(mode="turbo")
@@ -2,7 +2,8 @@
 Utils package for test helpers and utilities
 """
 
-from .driver_factory import DriverFactory
+from .driver_factory import DriverFactory, DriverPool
 from .helpers import APIHelper
+from .async_helpers import AsyncAPIHelper
 
-__all__ = ['DriverFactory', 'APIHelper']
+__all__ = ['DriverFactory', 'DriverPool', 'APIHelper', 'AsyncAPIHelper']
@@ -0,0 +1,222 @@
+import asyncio
+import time
+from collections import Counter
+from typing import Dict, Any, Optional, List, Iterable
+from config.settings import settings
+from utils.stats import summarize
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncAPIHelper:
+    """
+    Асинхронный помощник для массовых API запросов
+    
+    Результаты имеют тот же формат, что и у APIHelper. Одновременных
+    запросов не больше concurrency, соединений на хост не больше
+    limit_per_host. Используется как асинхронный контекстный менеджер:
+    
+        async with AsyncAPIHelper() as helper:
+            results = await helper.search_many(queries)
+    """
+    
+    def __init__(self, concurrency: int = settings.ASYNC_API_CONCURRENCY,
+                 limit_per_host: int = settings.ASYNC_API_LIMIT_PER_HOST,
+                 timeout: float = settings.API_TIMEOUT):
+        """
+        Инициализация помощника
+        
+        Args:
+            concurrency: Максимум одновременных запросов
+            limit_per_host: Максимум соединений с одним хостом
+            timeout: Таймаут запроса в секундах
+            
+        Raises:
+            ImportError: Если не установлен пакет aiohttp
+        """
+        if aiohttp is None:
+            raise ImportError("Для AsyncAPIHelper нужен пакет aiohttp: pip install aiohttp")
+        
+        self.base_url = settings.BASE_URL
+        self.headers = settings.get_api_headers()
+        self.concurrency = concurrency
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+    
+    async def __aenter__(self) -> "AsyncAPIHelper":
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=300
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            trace_configs=[self._trace_config()]
+        )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    @staticmethod
+    def _trace_config() -> "aiohttp.TraceConfig":
+        """
+        Трассировка этапов запроса
+        
+        В aiohttp установка TCP соединения и TLS рукопожатие измеряются
+        одним этапом, поэтому connect включает TLS, а tls равен None.
+        """
+        def timings_of(context) -> Dict[str, Any]:
+            return context.trace_request_ctx["timings"]
+        
+        async def on_dns_start(session, context, params):
+            context.dns_start = time.perf_counter()
+        
+        async def on_dns_end(session, context, params):
+            timings_of(context)["dns"] = time.perf_counter() - context.dns_start
+        
+        async def on_connection_start(session, context, params):
+            context.connection_start = time.perf_counter()
+        
+        async def on_connection_end(session, context, params):
+            timings = timings_of(context)
+            timings["connect"] = time.perf_counter() - context.connection_start - timings["dns"]
+            timings["reused"] = False
+        
+        async def on_request_end(session, context, params):
+            timings = timings_of(context)
+            handshake = timings["dns"] + timings["connect"]
+            timings["ttfb"] = time.perf_counter() - timings["_start"] - handshake
+        
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_dns_resolvehost_start.append(on_dns_start)
+        trace_config.on_dns_resolvehost_end.append(on_dns_end)
+        trace_config.on_connection_create_start.append(on_connection_start)
+        trace_config.on_connection_create_end.append(on_connection_end)
+        trace_config.on_request_end.append(on_request_end)
+        return trace_config
+    
+    async def make_api_request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
+        """
+        Выполнить произвольный API запрос
+        
+        Args:
+            method: HTTP метод
+            url: URL для запроса
+            **kwargs: Дополнительные параметры aiohttp (params, headers, ...)
+            
+        Returns:
+            Dict[str, Any]: Ответ API в формате APIHelper
+        """
+        if self._session is None:
+            raise RuntimeError("AsyncAPIHelper нужно использовать через 'async with'")
+        
+        timings = {"dns": 0.0, "connect": 0.0, "tls": None, "ttfb": 0.0, "reused": True}
+        async with self._semaphore:
+            timings["_start"] = start = time.perf_counter()
+            try:
+                async with self._session.request(
+                    method.upper(), url, trace_request_ctx={"timings": timings}, **kwargs
+                ) as response:
+                    data = await response.text()
+                    timings["total"] = time.perf_counter() - start
+                    return {
+                        "status_code": response.status,
+                        "headers": dict(response.headers),
+                        "data": data,
+                        "url": str(response.url),
+                        "timings": self._round_timings(timings)
+                    }
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                timings["total"] = time.perf_counter() - start
+                return {
+                    "error": str(e) or type(e).__name__,
+                    "status_code": None,
+                    "timings": self._round_timings(timings)
+                }
+    
+    @staticmethod
+    def _round_timings(timings: Dict[str, Any]) -> Dict[str, Any]:
+        """Округлить замеры и убрать служебные поля"""
+        return {
+            key: round(value, 4) if isinstance(value, float) else value
+            for key, value in timings.items()
+            if not key.startswith("_")
+        }
+    
+    async def search_products(self, query: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Выполнить поиск товаров через API
+        
+        Args:
+            query: Поисковый запрос
+            headers: Заголовки запроса (опционально)
+            
+        Returns:
+            Dict[str, Any]: Ответ API в формате APIHelper
+        """
+        return await self.make_api_request(
+            "GET",
+            f"{self.base_url}/search",
+            params={"q": query},
+            headers=headers if headers is not None else self.headers
+        )
+    
+    async def check_site_availability(self) -> Dict[str, Any]:
+        """
+        Проверить доступность главной страницы
+        
+        Returns:
+            Dict[str, Any]: Результат проверки в формате APIHelper
+        """
+        response = await self.make_api_request("GET", self.base_url, headers=self.headers)
+        response["available"] = response["status_code"] == 200
+        return response
+    
+    async def search_many(self, queries: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Выполнить поиск по набору запросов параллельно (не больше concurrency одновременно)
+        
+        Args:
+            queries: Поисковые запросы
+            
+        Returns:
+            List[Dict[str, Any]]: Ответы в порядке запросов, у каждого есть поле query
+        """
+        queries = list(queries)
+        results = await asyncio.gather(*(self.search_products(query) for query in queries))
+        for query, result in zip(queries, results):
+            result["query"] = query
+        return list(results)
+    
+    @staticmethod
+    def aggregate(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Сводка по результатам массовых запросов
+        
+        Args:
+            results: Ответы search_many / make_api_request
+            
+        Returns:
+            Dict[str, Any]: total, status_codes (распределение), errors,
+            error_rate и latency (count, min, max, mean, p50, p95, p99 в секундах)
+        """
+        status_codes = Counter(str(result["status_code"]) for result in results)
+        errors = sum(1 for result in results if result.get("error"))
+        latencies = [result["timings"]["total"] for result in results if "timings" in result]
+        return {
+            "total": len(results),
+            "status_codes": dict(status_codes),
+            "errors": errors,
+            "error_rate": errors / len(results) if results else 0.0,
+            "latency": summarize(latencies)
+        }
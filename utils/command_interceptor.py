@@ -0,0 +1,114 @@
+import time
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Protocol
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+_instrumentation = threading.local()
+
+
+@contextmanager
+def instrumentation() -> Iterator[None]:
+    """
+    Пометить команды WebDriver блока как служебные
+    
+    Команды, которые отправляет сам фреймворк (снимки состояния для
+    отчета), не относятся к тесту: трассировщик команд и профилировщик
+    шагов их пропускают (is_instrumentation). Пометка своя у каждого потока.
+    """
+    previous = getattr(_instrumentation, "active", False)
+    _instrumentation.active = True
+    try:
+        yield
+    finally:
+        _instrumentation.active = previous
+
+
+def is_instrumentation() -> bool:
+    """Выполняется ли в текущем потоке служебный блок (instrumentation)"""
+    return getattr(_instrumentation, "active", False)
+
+
+class CommandListener(Protocol):
+    """Слушатель команд WebDriver"""
+    
+    def on_command(self, command: str, params: Optional[Dict[str, Any]],
+                   response: Optional[Dict[str, Any]], elapsed: float) -> None:
+        """
+        Обработать выполненную команду
+        
+        Args:
+            command: Имя команды Selenium (findElement, getCurrentUrl, ...)
+            params: Параметры команды
+            response: Ответ chromedriver (None, если запрос упал)
+            elapsed: Время выполнения команды в секундах
+        """
+
+
+class CommandInterceptor:
+    """
+    Перехватчик команд WebDriver на уровне RemoteConnection
+    
+    Оборачивает command_executor.execute драйвера и сообщает подписанным
+    слушателям о каждой команде, ее ответе и времени выполнения.
+    
+    Methods:
+        install(driver): Установить перехватчик на драйвер (один раз)
+        add_listener(listener): Подписать слушателя
+        remove_listener(listener): Отписать слушателя
+    """
+    
+    def __init__(self, driver: WebDriver):
+        """
+        Инициализация перехватчика
+        
+        Args:
+            driver: WebDriver instance
+        """
+        self.listeners: List[CommandListener] = []
+        executor = driver.command_executor
+        original_execute = executor.execute
+        
+        def execute(command, params):
+            start = time.perf_counter()
+            response = None
+            try:
+                response = original_execute(command, params)
+                return response
+            finally:
+                elapsed = time.perf_counter() - start
+                for listener in list(self.listeners):
+                    try:
+                        listener.on_command(command, params, response, elapsed)
+                    except Exception:
+                        pass
+        
+        executor.execute = execute
+    
+    @classmethod
+    def install(cls, driver: WebDriver) -> "CommandInterceptor":
+        """
+        Установить перехватчик на драйвер
+        
+        Args:
+            driver: WebDriver instance
+            
+        Returns:
+            CommandInterceptor: Перехватчик драйвера (существующий, если уже установлен)
+        """
+        interceptor = getattr(driver, "command_interceptor", None)
+        if interceptor is None:
+            interceptor = cls(driver)
+            driver.command_interceptor = interceptor
+        return interceptor
+    
+    def add_listener(self, listener: CommandListener) -> None:
+        """Подписать слушателя на команды"""
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+    
+    def remove_listener(self, listener: CommandListener) -> None:
+        """Отписать слушателя"""
+        if listener in self.listeners:
+            self.listeners.remove(listener)
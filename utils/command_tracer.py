@@ -0,0 +1,200 @@
+import os
+import json
+import threading
+from typing import Dict, Any, List, Optional
+from config.settings import settings
+from utils.profiler import step_profiler, report_file_name
+from utils.command_interceptor import is_instrumentation
+
+
+class CommandBudgetWarning(UserWarning):
+    """Тест выполнил больше команд WebDriver, чем позволяет бюджет"""
+
+
+class CommandTracer:
+    """
+    Трассировка команд WebDriver
+    
+    Для каждой команды записываются имя, время выполнения, размер
+    запроса и ответа (байт JSON) и шаг страницы, в котором она
+    выполнена (по StepProfiler). Команды вне шагов относятся к "<test>".
+    Трасса своя у каждого потока.
+    
+    Является слушателем CommandInterceptor (on_command).
+    
+    Methods:
+        start(name): Начать трассу теста
+        count(): Число команд в текущей трассе
+        stop(): Закончить трассу и вернуть события и сводку
+    """
+    
+    OUTSIDE_STEPS = "<test>"
+    
+    def __init__(self, enabled: bool = settings.TRACE_COMMANDS):
+        """
+        Инициализация трассировщика
+        
+        Args:
+            enabled: Включить запись команд
+        """
+        self.enabled = enabled
+        self._local = threading.local()
+    
+    def start(self, name: str) -> None:
+        """
+        Начать трассу теста
+        
+        Args:
+            name: Имя трассы, обычно nodeid теста
+        """
+        self._local.trace = {"test": name, "events": []}
+    
+    def count(self) -> int:
+        """
+        Число команд, записанных в текущую трассу
+        
+        Returns:
+            int: Число команд (0, если трасса не начата)
+        """
+        trace = getattr(self._local, "trace", None)
+        return len(trace["events"]) if trace is not None else 0
+    
+    def stop(self) -> Optional[Dict[str, Any]]:
+        """
+        Закончить трассу теста
+        
+        Returns:
+            Optional[Dict[str, Any]]: test, events и summary (см. summarize) или None
+        """
+        trace = getattr(self._local, "trace", None)
+        self._local.trace = None
+        if trace is None:
+            return None
+        trace["summary"] = self.summarize(trace["events"])
+        return trace
+    
+    @staticmethod
+    def _size(payload: Any) -> int:
+        if payload is None:
+            return 0
+        try:
+            return len(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+        except (TypeError, ValueError):
+            return 0
+    
+    def on_command(self, command: str, params: Optional[Dict[str, Any]],
+                   response: Optional[Dict[str, Any]], elapsed: float) -> None:
+        """Записать команду в трассу текущего теста"""
+        trace = getattr(self._local, "trace", None)
+        if not self.enabled or trace is None or is_instrumentation():
+            return
+        trace["events"].append({
+            "command": command,
+            "step": step_profiler.current_step() or self.OUTSIDE_STEPS,
+            "elapsed": round(elapsed, 5),
+            "sent": self._size(params),
+            "received": self._size(response),
+            "failed": response is None
+        })
+    
+    @staticmethod
+    def summarize(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Сводка по командам
+        
+        Args:
+            events: События трассы
+            
+        Returns:
+            Dict[str, Any]: total (count, time, sent, received), by_command и
+            by_step (count и time), по убыванию числа команд
+        """
+        def add(bucket: Dict[str, Dict[str, Any]], key: str, event: Dict[str, Any]) -> None:
+            stats = bucket.setdefault(key, {"count": 0, "time": 0.0})
+            stats["count"] += 1
+            stats["time"] += event["elapsed"]
+        
+        by_command: Dict[str, Dict[str, Any]] = {}
+        by_step: Dict[str, Dict[str, Any]] = {}
+        for event in events:
+            add(by_command, event["command"], event)
+            add(by_step, event["step"], event)
+        
+        def ordered(bucket: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+            return {
+                key: {"count": stats["count"], "time": round(stats["time"], 4)}
+                for key, stats in sorted(bucket.items(), key=lambda item: -item[1]["count"])
+            }
+        
+        return {
+            "total": {
+                "count": len(events),
+                "time": round(sum(event["elapsed"] for event in events), 4),
+                "sent": sum(event["sent"] for event in events),
+                "received": sum(event["received"] for event in events)
+            },
+            "by_command": ordered(by_command),
+            "by_step": ordered(by_step)
+        }
+
+
+command_tracer = CommandTracer()
+
+
+def format_trace_summary(summary: Dict[str, Any], top: int = 10) -> str:
+    """
+    Текстовая сводка трассы для Allure
+    
+    Args:
+        summary: Сводка из CommandTracer.summarize
+        top: Сколько строк выводить в разбивках
+        
+    Returns:
+        str: Итог и самые частые команды и шаги
+    """
+    total = summary["total"]
+    lines = [
+        f"Команд: {total['count']}, время: {total['time']:.2f} c, "
+        f"отправлено: {total['sent'] / 1024:.1f} КБ, получено: {total['received'] / 1024:.1f} КБ",
+        "",
+        "По командам:"
+    ]
+    lines += [f"  {name}: {stats['count']} ({stats['time']:.2f} c)"
+              for name, stats in list(summary["by_command"].items())[:top]]
+    lines += ["", "По шагам:"]
+    lines += [f"  {name}: {stats['count']} ({stats['time']:.2f} c)"
+              for name, stats in list(summary["by_step"].items())[:top]]
+    return "\n".join(lines)
+
+
+def write_trace(trace: Dict[str, Any]) -> str:
+    """
+    Сохранить трассу теста: сводка и события в JSON в COMMAND_TRACES_DIR
+    
+    Returns:
+        str: Путь к файлу
+    """
+    os.makedirs(settings.COMMAND_TRACES_DIR, exist_ok=True)
+    path = os.path.join(settings.COMMAND_TRACES_DIR, report_file_name(trace["test"]))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(trace, f, ensure_ascii=False, indent=1)
+    return path
+
+
+def summarize_traces(traces_dir: str = settings.COMMAND_TRACES_DIR) -> Dict[str, Dict[str, Any]]:
+    """
+    Итоги трасс всех тестов
+    
+    Returns:
+        Dict[str, Dict[str, Any]]: Тест -> total из сводки, по убыванию числа команд
+    """
+    totals = {}
+    if os.path.isdir(traces_dir):
+        for file_name in os.listdir(traces_dir):
+            try:
+                with open(os.path.join(traces_dir, file_name), encoding="utf-8") as f:
+                    trace = json.load(f)
+                totals[trace["test"]] = trace["summary"]["total"]
+            except (OSError, ValueError, KeyError):
+                continue
+    return dict(sorted(totals.items(), key=lambda item: -item[1]["count"]))
@@ -1,10 +1,22 @@
-import os
+import time
+import shutil
+import threading
 import allure
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Any, Iterator, Optional
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from config.settings import settings
+from utils.parallel import create_user_data_dir
+from utils.command_interceptor import CommandInterceptor
+from utils.implicit_wait import ImplicitWaitMeter
+from utils.resource_blocking import apply_blocking, resource_monitor
+from utils.profile_cache import profile_cache, seed_profile, site_origin, restore_site_state
+from utils.driver_resolver import driver_resolver
+from utils.profiler import step_profiler
+from utils.command_tracer import command_tracer
 
 
 class DriverFactory:
@@ -18,10 +30,15 @@ class DriverFactory:
     
     @staticmethod
     @allure.step("Создать Chrome WebDriver")
-    def create_chrome_driver() -> webdriver.Chrome:
+    def create_chrome_driver(user_data_dir: Optional[str] = None,
+                             warm_profile: bool = settings.WARM_PROFILE) -> webdriver.Chrome:
         """
         Создать экземпляр Chrome WebDriver
         
+        Args:
+            user_data_dir: Каталог профиля (по умолчанию новый временный каталог)
+            warm_profile: Скопировать в новый профиль шаблон теплого профиля
+        
         Returns:
             webdriver.Chrome: Экземпляр Chrome драйвера
             
@@ -29,7 +46,11 @@ class DriverFactory:
             Exception: Если не удалось создать драйвер
         """
         try:
+            if settings.PAGE_LOAD_STRATEGY not in ("normal", "eager", "none"):
+                raise ValueError(f"Неизвестная стратегия загрузки: {settings.PAGE_LOAD_STRATEGY}")
+            
             chrome_options = Options()
+            chrome_options.page_load_strategy = settings.PAGE_LOAD_STRATEGY
             
             if settings.HEADLESS:
                 chrome_options.add_argument("--headless")
@@ -39,32 +60,53 @@ class DriverFactory:
             chrome_options.add_argument("--disable-dev-shm-usage")
             chrome_options.add_argument("--disable-gpu")
             chrome_options.add_argument("--disable-extensions")
-            chrome_options.add_argument("--remote-debugging-port=9222")
+            # Порт 0: Chrome сам занимает свободный порт, а chromedriver узнает его
+            # из DevToolsActivePort в профиле, поэтому параллельные браузеры не конфликтуют
+            chrome_options.add_argument("--remote-debugging-port=0")
+            warm = False
+            if user_data_dir is None:
+                user_data_dir = create_user_data_dir()
+                warm = warm_profile and profile_cache.ensure(DriverFactory._seed_profile)
+                if warm:
+                    profile_cache.clone(user_data_dir)
+            chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
+            
+            if settings.REPLAY_MODE == "replay":
+                # Воспроизведение без сети: хосты сайта (REPLAY_HOSTS) идут через сервер
+                # воспроизведения по переписанным ссылкам, остальные не резолвятся
+                chrome_options.add_argument("--host-resolver-rules=MAP * ~NOTFOUND , EXCLUDE 127.0.0.1")
 
             chrome_options.add_argument("--disable-blink-features=AutomationControlled")
             chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
             chrome_options.add_experimental_option('useAutomationExtension', False)
+            logging_prefs = {"browser": "ALL"}
+            if settings.RESOURCE_REPORT:
+                logging_prefs["performance"] = "ALL"
+            chrome_options.set_capability("goog:loggingPrefs", logging_prefs)
             
-            if os.path.exists(settings.CHROME_DRIVER_PATH):
-                allure.attach(
-                    f"Using ChromeDriver from: {settings.CHROME_DRIVER_PATH}",
-                    name="ChromeDriver Path",
-                    attachment_type=allure.attachment_type.TEXT
-                )
-                service = Service(executable_path=settings.CHROME_DRIVER_PATH)
-            else:
-                allure.attach(
-                    f"ChromeDriver not found at {settings.CHROME_DRIVER_PATH}. Using webdriver-manager",
-                    name="ChromeDriver Fallback",
-                    attachment_type=allure.attachment_type.TEXT
-                )
-                service = Service(ChromeDriverManager().install())
+            service = Service(executable_path=driver_resolver.resolve())
+            resolution = driver_resolver.report()
+            allure.attach(
+                f"Using ChromeDriver from: {resolution['path']} (source: {resolution['source']}, "
+                f"resolved in {resolution['elapsed']:.3f} s once per session)",
+                name="ChromeDriver Path",
+                attachment_type=allure.attachment_type.TEXT
+            )
             
             driver = webdriver.Chrome(service=service, options=chrome_options)
+            driver.user_data_dir = user_data_dir
+            driver.warm_profile = warm
+            
+            driver.implicit_wait_meter = ImplicitWaitMeter()
+            interceptor = CommandInterceptor.install(driver)
+            interceptor.add_listener(driver.implicit_wait_meter)
+            interceptor.add_listener(step_profiler)
+            interceptor.add_listener(command_tracer)
             
             driver.implicitly_wait(settings.IMPLICIT_WAIT)
             driver.set_page_load_timeout(settings.PAGE_LOAD_TIMEOUT)
-            driver.set_script_timeout(30)
+            driver.set_script_timeout(settings.SCRIPT_TIMEOUT)
+            driver.blocked_url_patterns = apply_blocking(driver)
             
             return driver
             
@@ -76,6 +118,21 @@ class DriverFactory:
             )
             raise
     
+    @staticmethod
+    @allure.step("Прогреть шаблон профиля Chrome")
+    def _seed_profile(profile_dir: str) -> None:
+        """
+        Запустить браузер с каталогом profile_dir и прогреть профиль
+        
+        Args:
+            profile_dir: Каталог будущего шаблона профиля
+        """
+        driver = DriverFactory.create_chrome_driver(user_data_dir=profile_dir, warm_profile=False)
+        try:
+            profile_cache.write_site_state(profile_dir, seed_profile(driver))
+        finally:
+            driver.quit()
+    
     @staticmethod
     @allure.step("Закрыть WebDriver")
     def close_driver(driver: webdriver.Chrome) -> None:
@@ -94,3 +151,222 @@ class DriverFactory:
                     name="Driver Close Error",
                     attachment_type=allure.attachment_type.TEXT
                 )
+            
+            user_data_dir = getattr(driver, "user_data_dir", None)
+            if user_data_dir:
+                shutil.rmtree(user_data_dir, ignore_errors=True)
+
+
+class DriverPool:
+    """
+    Пул "тёплых" WebDriver, живущих всю тестовую сессию
+    
+    Вместо запуска нового Chrome на каждый тест пул выдает уже запущенный
+    драйвер, а после теста сбрасывает его состояние (cookies, localStorage,
+    вкладки, размер окна). Драйвер пересоздается после DRIVER_MAX_LEASES
+    выдач или если он перестал отвечать.
+    
+    Methods:
+        acquire(): Выдать драйвер из пула
+        release(driver, broken): Вернуть драйвер в пул
+        lease(): Контекстный менеджер для acquire/release
+        close_all(): Закрыть все драйверы пула
+        summary(): Статистика пула и сэкономленное время запуска
+    """
+    
+    def __init__(self, factory: Callable[[], webdriver.Chrome] = None,
+                 max_size: int = settings.DRIVER_POOL_SIZE,
+                 max_leases: int = settings.DRIVER_MAX_LEASES):
+        """
+        Инициализация пула
+        
+        Args:
+            factory: Функция создания драйвера
+            max_size: Максимальное количество простаивающих драйверов
+            max_leases: Количество выдач, после которого драйвер пересоздается
+        """
+        self._factory = factory or DriverFactory.create_chrome_driver
+        self._max_size = max_size
+        self._max_leases = max_leases
+        self._idle: List[webdriver.Chrome] = []
+        self._leases: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Any] = {
+            "created": 0,
+            "leases": 0,
+            "recycled": 0,
+            "crashed": 0,
+            "startup_time": 0.0
+        }
+    
+    def acquire(self) -> webdriver.Chrome:
+        """
+        Выдать драйвер из пула (создается новый, если свободных нет)
+        
+        Returns:
+            webdriver.Chrome: Драйвер для теста
+        """
+        driver = None
+        with self._lock:
+            if self._idle:
+                driver = self._idle.pop()
+        
+        if driver is not None and not self._is_alive(driver):
+            self.stats["crashed"] += 1
+            self._discard(driver)
+            driver = None
+        
+        if driver is None:
+            driver = self._create()
+        
+        meter = getattr(driver, "implicit_wait_meter", None)
+        if meter is not None:
+            meter.reset()
+        
+        with self._lock:
+            self._leases[id(driver)] = self._leases.get(id(driver), 0) + 1
+            self.stats["leases"] += 1
+        return driver
+    
+    def release(self, driver: webdriver.Chrome, broken: bool = False) -> None:
+        """
+        Вернуть драйвер в пул
+        
+        Args:
+            driver: Драйвер, выданный через acquire()
+            broken: True если драйвер упал во время теста
+        """
+        if driver is None:
+            return
+        
+        if broken or not self._is_alive(driver):
+            self.stats["crashed"] += 1
+            self._discard(driver)
+            return
+        
+        resource_monitor.collect(driver)
+        if self._leases.get(id(driver), 0) >= self._max_leases or not self._reset(driver):
+            self.stats["recycled"] += 1
+            self._discard(driver)
+            return
+        
+        with self._lock:
+            if len(self._idle) < self._max_size:
+                self._idle.append(driver)
+                return
+        self._discard(driver)
+    
+    @contextmanager
+    def lease(self) -> Iterator[webdriver.Chrome]:
+        """
+        Выдать драйвер на время блока with
+        
+        Yields:
+            webdriver.Chrome: Драйвер для теста
+        """
+        driver = self.acquire()
+        broken = False
+        try:
+            yield driver
+        except WebDriverException:
+            broken = not self._is_alive(driver)
+            raise
+        finally:
+            self.release(driver, broken=broken)
+    
+    def close_all(self) -> None:
+        """Закрыть все простаивающие драйверы"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._discard(driver)
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Статистика пула
+        
+        Returns:
+            Dict[str, Any]: Количество запусков и выдач, среднее время
+            запуска Chrome и сэкономленное за сессию время
+        """
+        created = self.stats["created"]
+        avg_startup = self.stats["startup_time"] / created if created else 0.0
+        reused = max(self.stats["leases"] - created, 0)
+        return {
+            **self.stats,
+            "reused": reused,
+            "avg_startup_time": round(avg_startup, 3),
+            "startup_time_saved": round(reused * avg_startup, 3)
+        }
+    
+    def _create(self) -> webdriver.Chrome:
+        """Запустить новый драйвер и учесть время запуска"""
+        start = time.perf_counter()
+        driver = self._factory()
+        self.stats["startup_time"] += time.perf_counter() - start
+        self.stats["created"] += 1
+        return driver
+    
+    def _discard(self, driver: webdriver.Chrome) -> None:
+        """Закрыть драйвер и забыть его счетчик выдач"""
+        self._leases.pop(id(driver), None)
+        resource_monitor.forget(driver)
+        DriverFactory.close_driver(driver)
+    
+    @staticmethod
+    def _is_alive(driver: webdriver.Chrome) -> bool:
+        """Проверить, что браузер еще отвечает"""
+        try:
+            return len(driver.window_handles) > 0
+        except WebDriverException:
+            return False
+    
+    @staticmethod
+    def _reset(driver: webdriver.Chrome) -> bool:
+        """
+        Сбросить состояние браузера между тестами
+        
+        Cookie и хранилища origin сайта очищаются (CDP Storage.clearDataForOrigin,
+        HTTP кэш и service worker остаются теплыми), затем у теплого драйвера
+        восстанавливаются снятые при прогреве согласие на cookie и регион.
+        Если восстановить их не удалось, драйвер больше не считается теплым
+        (close_popups снова ждет всплывающие окна).
+        
+        Returns:
+            bool: True если сброс прошел успешно
+        """
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            
+            # sessionStorage принадлежит вкладке, поэтому очищается скриптом на текущей странице
+            driver.execute_script("try { window.sessionStorage.clear(); } catch (e) {}")
+            try:
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                    "origin": site_origin(),
+                    "storageTypes": "local_storage,indexeddb,websql"
+                })
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            except WebDriverException:
+                driver.warm_profile = False
+                driver.execute_script("try { window.localStorage.clear(); } catch (e) {}")
+                driver.delete_all_cookies()
+            driver.get("about:blank")
+            
+            if getattr(driver, "warm_profile", False):
+                state = profile_cache.site_state()
+                try:
+                    if state is None:
+                        raise WebDriverException("Нет снимка состояния теплого профиля")
+                    restore_site_state(driver, state)
+                except WebDriverException:
+                    driver.warm_profile = False
+            
+            width, height = settings.WINDOW_SIZE.split("x")
+            driver.set_window_size(int(width), int(height))
+            return True
+        except WebDriverException:
+            return False
@@ -0,0 +1,195 @@
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import platform
+import subprocess
+import threading
+from typing import Dict, Any, List, Optional
+from config.settings import settings
+
+
+CHROME_BINARIES: Dict[str, List[str]] = {
+    "win32": [
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe"
+    ],
+    "darwin": ["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"],
+    "linux": ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser"]
+}
+
+CHROMEDRIVER_PATHS: Dict[str, List[str]] = {
+    "win32": [
+        r"C:\Program Files\chromedriver-win64\chromedriver.exe",
+        r"C:\chromedriver\chromedriver.exe"
+    ],
+    "darwin": ["/opt/homebrew/bin/chromedriver", "/usr/local/bin/chromedriver"],
+    "linux": ["/usr/bin/chromedriver", "/usr/local/bin/chromedriver", "/usr/lib/chromium/chromedriver"]
+}
+
+
+def _platform_key() -> str:
+    """Ключ ОС для таблиц путей: win32, darwin или linux"""
+    if sys.platform.startswith("win"):
+        return "win32"
+    if sys.platform == "darwin":
+        return "darwin"
+    return "linux"
+
+
+def _major_version(output: str) -> Optional[str]:
+    """Старший номер версии из вывода "--version" (например "Google Chrome 120.0.6099.109" -> "120")"""
+    match = re.search(r"(\d+)\.\d+\.\d+(?:\.\d+)?", output or "")
+    return match.group(1) if match else None
+
+
+def _run_version(binary: str) -> Optional[str]:
+    """Старший номер версии программы или None, если ее нет"""
+    executable = binary if os.path.isabs(binary) else shutil.which(binary)
+    if not executable or not os.path.exists(executable):
+        return None
+    try:
+        result = subprocess.run([executable, "--version"], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return _major_version(result.stdout)
+
+
+class DriverResolver:
+    """
+    Поиск chromedriver с кэшированием
+    
+    Путь ищется один раз за процесс. Результат сохраняется в файл кэша
+    по ключу "хост -> старшая версия Chrome", поэтому следующие запуски
+    на этой машине не обращаются к webdriver-manager и работают без сети.
+    
+    Порядок поиска:
+        1. CHROME_DRIVER_PATH из настроек, если файл существует
+        2. кэш для текущей версии Chrome
+        3. стандартные пути chromedriver для ОС с подходящей версией
+        4. webdriver-manager (нужна сеть)
+        5. без сети - последний закэшированный путь для хоста
+    
+    Methods:
+        resolve(): Путь к chromedriver
+        report(): Откуда взят путь и сколько длился поиск
+    """
+    
+    def __init__(self, cache_file: str = settings.DRIVER_CACHE_FILE):
+        """
+        Инициализация
+        
+        Args:
+            cache_file: JSON файл кэша путей
+        """
+        self.cache_file = cache_file
+        self.host = platform.node() or "localhost"
+        self._lock = threading.Lock()
+        self._path: Optional[str] = None
+        self._report: Dict[str, Any] = {}
+    
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        """Загрузить кэш (пустой, если файла нет или он поврежден)"""
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+    
+    def _store(self, version: str, path: str) -> None:
+        """Записать путь для версии текущего хоста"""
+        data = self._load()
+        data.setdefault(self.host, {})[version] = path
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        tmp_path = f"{self.cache_file}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.cache_file)
+    
+    @staticmethod
+    def browser_version() -> Optional[str]:
+        """
+        Старшая версия установленного Chrome
+        
+        Returns:
+            Optional[str]: Например "120" или None, если Chrome не найден
+        """
+        if _platform_key() == "win32":
+            try:
+                result = subprocess.run(
+                    ["reg", "query", r"HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon", "/v", "version"],
+                    capture_output=True, text=True, timeout=10
+                )
+                version = _major_version(result.stdout)
+                if version:
+                    return version
+            except (OSError, subprocess.SubprocessError):
+                pass
+        for binary in CHROME_BINARIES[_platform_key()]:
+            version = _run_version(binary)
+            if version:
+                return version
+        return None
+    
+    def _find(self) -> Dict[str, Any]:
+        """Найти chromedriver по порядку из описания класса"""
+        if os.path.exists(settings.CHROME_DRIVER_PATH):
+            return {"path": settings.CHROME_DRIVER_PATH, "source": "settings"}
+        
+        version = self.browser_version()
+        cached = self._load().get(self.host, {})
+        if version and os.path.exists(cached.get(version, "")):
+            return {"path": cached[version], "source": "cache", "browser_version": version}
+        
+        for path in CHROMEDRIVER_PATHS[_platform_key()]:
+            if os.path.exists(path) and (version is None or _run_version(path) == version):
+                if version:
+                    self._store(version, path)
+                return {"path": path, "source": "system", "browser_version": version}
+        
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+            path = ChromeDriverManager().install()
+            if version:
+                self._store(version, path)
+            return {"path": path, "source": "webdriver-manager", "browser_version": version}
+        except Exception as e:
+            existing = [path for path in cached.values() if os.path.exists(path)]
+            if existing:
+                return {"path": existing[-1], "source": "cache-offline", "browser_version": version}
+            raise RuntimeError(f"Не удалось найти chromedriver: {e}") from e
+    
+    def resolve(self) -> str:
+        """
+        Путь к chromedriver (поиск выполняется один раз за процесс)
+        
+        Returns:
+            str: Путь к исполняемому файлу
+            
+        Raises:
+            RuntimeError: Если chromedriver не найден и скачать его нельзя
+        """
+        with self._lock:
+            if self._path is None:
+                start = time.perf_counter()
+                found = self._find()
+                found["elapsed"] = round(time.perf_counter() - start, 3)
+                self._report = found
+                self._path = found["path"]
+            return self._path
+    
+    def report(self) -> Dict[str, Any]:
+        """
+        Результат поиска
+        
+        Returns:
+            Dict[str, Any]: path, source (settings, cache, system, webdriver-manager,
+            cache-offline), browser_version и elapsed (секунды); пустой до resolve()
+        """
+        return dict(self._report)
+
+
+driver_resolver = DriverResolver()
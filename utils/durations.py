@@ -0,0 +1,199 @@
+import os
+import json
+import threading
+from typing import Dict, Any, Iterable, List, Optional
+from config.settings import settings
+
+
+class DurationStore:
+    """
+    Локальное хранилище исторической длительности тестов
+    
+    Длительность каждого теста хранится как экспоненциальное скользящее
+    среднее, чтобы единичный медленный прогон не ломал расписание.
+    Вместе с длительностью хранится исход последнего прогона и число падений.
+    
+    Methods:
+        get(nodeid, default): Ожидаемая длительность теста
+        record(nodeid, duration, outcome): Учесть очередной прогон
+        order(nodeids, mode): Порядок запуска тестов
+        estimate(nodeids): Оценка общей длительности
+        save(): Сохранить данные на диск
+    """
+    
+    SMOOTHING: float = 0.3
+    ORDER_MODES = ("file", "duration", "failed-first")
+    
+    def __init__(self, path: str = settings.DURATIONS_FILE):
+        """
+        Инициализация хранилища
+        
+        Args:
+            path: Путь к JSON файлу с длительностями
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict[str, Any]] = self._load()
+    
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Загрузить данные с диска (пустой словарь, если файла нет или он поврежден)"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+    
+    def get(self, nodeid: str, default: Optional[float] = None) -> Optional[float]:
+        """
+        Получить ожидаемую длительность теста
+        
+        Args:
+            nodeid: Идентификатор теста pytest
+            default: Значение для тестов без истории
+            
+        Returns:
+            Optional[float]: Длительность в секундах
+        """
+        entry = self._data.get(nodeid)
+        return entry["duration"] if entry else default
+    
+    def durations(self, nodeids: Iterable[str]) -> Dict[str, float]:
+        """
+        Получить длительности для набора тестов
+        
+        Тесты без истории получают медиану известных длительностей,
+        чтобы новые тесты не попадали всегда в конец расписания.
+        
+        Args:
+            nodeids: Идентификаторы тестов
+            
+        Returns:
+            Dict[str, float]: Длительность по каждому тесту
+        """
+        known = sorted(entry["duration"] for entry in self._data.values())
+        fallback = known[len(known) // 2] if known else 1.0
+        return {nodeid: self.get(nodeid, fallback) for nodeid in nodeids}
+    
+    def failed_last(self, nodeid: str) -> bool:
+        """
+        Проверить, упал ли тест в последнем прогоне
+        
+        Args:
+            nodeid: Идентификатор теста pytest
+            
+        Returns:
+            bool: True если последний исход - "failed"
+        """
+        entry = self._data.get(nodeid)
+        return bool(entry) and entry.get("last_outcome") == "failed"
+    
+    def order(self, nodeids: List[str], mode: str = "duration") -> List[str]:
+        """
+        Порядок запуска тестов по истории прогонов
+        
+        "duration" - сначала самые долгие (медленные тесты не оказываются
+        в конце прогона), "failed-first" - сначала упавшие в прошлый раз,
+        затем остальные, внутри групп самые быстрые первыми (быстрая
+        обратная связь), "file" - исходный порядок. Сортировка устойчивая.
+        
+        Args:
+            nodeids: Идентификаторы тестов в порядке сбора
+            mode: Режим из ORDER_MODES
+            
+        Returns:
+            List[str]: Идентификаторы в порядке запуска
+            
+        Raises:
+            ValueError: Если режим неизвестен
+        """
+        if mode not in self.ORDER_MODES:
+            raise ValueError(f"Неизвестный порядок тестов '{mode}', допустимо: {', '.join(self.ORDER_MODES)}")
+        if mode == "file":
+            return list(nodeids)
+        
+        durations = self.durations(nodeids)
+        if mode == "duration":
+            return sorted(nodeids, key=lambda nodeid: -durations[nodeid])
+        return sorted(nodeids, key=lambda nodeid: (not self.failed_last(nodeid), durations[nodeid]))
+    
+    def estimate(self, nodeids: Iterable[str]) -> Dict[str, Any]:
+        """
+        Оценить длительность прогона набора тестов
+        
+        Args:
+            nodeids: Идентификаторы тестов
+            
+        Returns:
+            Dict[str, Any]: total - сумма ожидаемых длительностей, longest - самый
+            долгий тест, known - тестов с историей, failed - упавших в прошлый раз
+        """
+        nodeids = list(nodeids)
+        durations = self.durations(nodeids)
+        return {
+            "total": sum(durations.values()),
+            "longest": max(durations.values(), default=0.0),
+            "tests": len(nodeids),
+            "known": sum(1 for nodeid in nodeids if nodeid in self._data),
+            "failed": sum(1 for nodeid in nodeids if self.failed_last(nodeid))
+        }
+    
+    def record(self, nodeid: str, duration: float, outcome: Optional[str] = None) -> None:
+        """
+        Учесть очередной прогон теста
+        
+        Args:
+            nodeid: Идентификатор теста pytest
+            duration: Длительность в секундах
+            outcome: Исход прогона ("passed" или "failed")
+        """
+        with self._lock:
+            entry = self._data.get(nodeid)
+            if entry is None:
+                entry = self._data[nodeid] = {"duration": duration, "runs": 1, "failures": 0}
+            else:
+                entry["duration"] += self.SMOOTHING * (duration - entry["duration"])
+                entry["runs"] += 1
+            if outcome is not None:
+                entry["last_outcome"] = outcome
+                if outcome == "failed":
+                    entry["failures"] = entry.get("failures", 0) + 1
+    
+    def save(self) -> None:
+        """Сохранить данные на диск"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class DurationRecorder:
+    """
+    Плагин pytest, записывающий длительность (setup + call + teardown)
+    и исход тестов в DurationStore
+    
+    Пропущенные тесты не записываются: их длительность не отражает
+    реальное время выполнения.
+    """
+    
+    def __init__(self, store: DurationStore):
+        self.store = store
+        self._pending: Dict[str, float] = {}
+        self._outcomes: Dict[str, str] = {}
+    
+    def pytest_runtest_logreport(self, report) -> None:
+        """Накопить длительность и исход фазы теста, записать итог после teardown"""
+        self._pending[report.nodeid] = self._pending.get(report.nodeid, 0.0) + report.duration
+        if report.failed:
+            self._outcomes[report.nodeid] = "failed"
+        elif report.skipped:
+            self._outcomes.setdefault(report.nodeid, "skipped")
+        if report.when != "teardown":
+            return
+        
+        duration = self._pending.pop(report.nodeid)
+        outcome = self._outcomes.pop(report.nodeid, "passed")
+        if outcome != "skipped":
+            self.store.record(report.nodeid, duration, outcome)
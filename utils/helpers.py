@@ -1,16 +1,182 @@
+import socket
+import threading
+import time
 import requests
 import allure
 from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 from config.settings import settings
 from config.test_data import test_data
 
 
+_connection_timings = threading.local()
+
+
+class _TimedConnectionMixin:
+    """Замер DNS, TCP и TLS этапов при установке нового соединения"""
+    
+    def _new_conn(self):
+        """Разрешить имя и открыть TCP соединение, замерив оба этапа отдельно"""
+        timings = getattr(_connection_timings, "current", None)
+        start = time.perf_counter()
+        resolved_host = self._dns_host
+        try:
+            resolved_host = socket.getaddrinfo(self._dns_host, self.port, type=socket.SOCK_STREAM)[0][4][0]
+        except (OSError, IndexError):
+            pass
+        dns_done = time.perf_counter()
+        
+        original_host, self._dns_host = self._dns_host, resolved_host
+        try:
+            sock = super()._new_conn()
+        finally:
+            self._dns_host = original_host
+        
+        if timings is not None:
+            timings["dns"] = dns_done - start
+            timings["connect"] = time.perf_counter() - dns_done
+            timings["reused"] = False
+        return sock
+    
+    def connect(self):
+        """Установить соединение; для HTTPS остаток времени приходится на TLS"""
+        timings = getattr(_connection_timings, "current", None)
+        start = time.perf_counter()
+        super().connect()
+        if timings is not None and not timings["reused"]:
+            timings["tls"] = max(0.0, time.perf_counter() - start - timings["dns"] - timings["connect"])
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter с пулом соединений, которые замеряют этапы подключения"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool
+        }
+
+
 class APIHelper:
-    """Класс-помощник для API тестов"""
+    """
+    Класс-помощник для API тестов
     
-    def __init__(self):
+    Все экземпляры используют одну requests.Session на процесс: соединения
+    переиспользуются (keep-alive), пул ограничен API_POOL_SIZE, неудачные
+    запросы повторяются с экспоненциальной задержкой.
+    """
+    
+    _session: Optional[requests.Session] = None
+    _session_lock = threading.Lock()
+    
+    def __init__(self, session: Optional[requests.Session] = None):
+        """
+        Инициализация помощника
+        
+        Args:
+            session: Отдельная сессия (по умолчанию общая сессия процесса)
+        """
         self.base_url = settings.BASE_URL
         self.headers = settings.get_api_headers()
+        self.session = session or self.get_session()
+    
+    @staticmethod
+    def create_session(pool_size: int = settings.API_POOL_SIZE,
+                       max_retries: int = settings.API_MAX_RETRIES) -> requests.Session:
+        """
+        Создать HTTP сессию с пулом соединений и замером этапов
+        
+        Args:
+            pool_size: Размер пула соединений на хост
+            max_retries: Число повторов при ошибках соединения и 502/503/504 (0 - без повторов)
+        
+        Returns:
+            requests.Session: Новая сессия
+        """
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=settings.API_BACKOFF_FACTOR,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False
+        )
+        adapter = TimedHTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["Connection"] = "keep-alive"
+        return session
+    
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """
+        Получить общую HTTP сессию (создается при первом обращении)
+        
+        Returns:
+            requests.Session: Сессия с пулом соединений и повторами
+        """
+        with cls._session_lock:
+            if cls._session is None:
+                cls._session = cls.create_session()
+            return cls._session
+    
+    @classmethod
+    def close_session(cls) -> None:
+        """Закрыть общую HTTP сессию и все ее соединения"""
+        with cls._session_lock:
+            if cls._session is not None:
+                cls._session.close()
+                cls._session = None
+    
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Выполнить запрос через сессию помощника с замером этапов
+        
+        Returns:
+            requests.Response: Ответ; в response.timings - dns, connect, tls,
+            ttfb, total (секунды) и reused (соединение взято из пула)
+        """
+        kwargs.setdefault("timeout", settings.API_TIMEOUT)
+        timings = {"dns": 0.0, "connect": 0.0, "tls": 0.0, "reused": True}
+        _connection_timings.current = timings
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        finally:
+            _connection_timings.current = None
+        
+        total = time.perf_counter() - start
+        handshake = timings["dns"] + timings["connect"] + timings["tls"]
+        timings["ttfb"] = max(0.0, response.elapsed.total_seconds() - handshake)
+        timings["total"] = total
+        response.timings = {
+            key: round(value, 4) if isinstance(value, float) else value
+            for key, value in timings.items()
+        }
+        return response
     
     @allure.step("Выполнить API поиск по запросу: {query}")
     def search_products(self, query: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
@@ -31,11 +197,11 @@ class APIHelper:
         params = {"q": query}
         
         try:
-            response = requests.get(
+            response = self.request(
+                "GET",
                 search_url,
                 params=params,
                 headers=headers,
-                timeout=10,
                 allow_redirects=True
             )
             
@@ -43,7 +209,8 @@ class APIHelper:
                 "status_code": response.status_code,
                 "headers": dict(response.headers),
                 "data": response.text,
-                "url": response.url
+                "url": response.url,
+                "timings": response.timings
             }
         except requests.exceptions.RequestException as e:
             return {
@@ -65,13 +232,14 @@ class APIHelper:
             Dict[str, Any]: Ответ API
         """
         try:
-            response = requests.request(method.upper(), url, **kwargs)
+            response = self.request(method.upper(), url, **kwargs)
             
             return {
                 "status_code": response.status_code,
                 "headers": dict(response.headers),
                 "data": response.text,
-                "url": response.url
+                "url": response.url,
+                "timings": response.timings
             }
         except requests.exceptions.RequestException as e:
             return {
@@ -88,16 +256,17 @@ class APIHelper:
             Dict[str, Any]: Результат проверки
         """
         try:
-            response = requests.get(
+            response = self.request(
+                "GET",
                 self.base_url,
-                headers=self.headers,
-                timeout=10
+                headers=self.headers
             )
             
             return {
                 "status_code": response.status_code,
                 "available": response.status_code == 200,
-                "url": response.url
+                "url": response.url,
+                "timings": response.timings
             }
         except requests.exceptions.RequestException as e:
             return {
@@ -0,0 +1,65 @@
+from typing import Any, Dict, Optional
+from selenium.webdriver.remote.command import Command
+
+
+class ImplicitWaitMeter:
+    """
+    Счетчик времени, потраченного на неявные ожидания
+    
+    Поиск элемента, который ничего не нашел при ненулевом implicit wait,
+    блокируется chromedriver на все время неявного ожидания. Счетчик
+    суммирует длительность таких команд, отслеживая текущее значение
+    implicit wait по командам setTimeouts.
+    
+    Methods:
+        reset(): Обнулить счетчик (перед каждым тестом)
+        summary(): Потраченное время и количество заблокированных поисков
+    """
+    
+    FIND_COMMANDS = {
+        Command.FIND_ELEMENT,
+        Command.FIND_ELEMENTS,
+        Command.FIND_CHILD_ELEMENT,
+        Command.FIND_CHILD_ELEMENTS
+    }
+    
+    def __init__(self, implicit_wait: float = 0.0):
+        """
+        Инициализация счетчика
+        
+        Args:
+            implicit_wait: Текущее значение implicit wait в секундах
+        """
+        self.implicit_wait = implicit_wait
+        self.reset()
+    
+    def reset(self) -> None:
+        """Обнулить счетчик"""
+        self.consumed = 0.0
+        self.blocked_calls = 0
+    
+    @staticmethod
+    def _is_empty(response: Optional[Dict[str, Any]]) -> bool:
+        """Проверить, что поиск ничего не нашел"""
+        if response is None:
+            return True
+        value = response.get("value")
+        return value == [] or (isinstance(value, dict) and "error" in value)
+    
+    def on_command(self, command: str, params: Optional[Dict[str, Any]],
+                   response: Optional[Dict[str, Any]], elapsed: float) -> None:
+        """Учесть команду WebDriver (слушатель CommandInterceptor)"""
+        if command == Command.SET_TIMEOUTS and params and params.get("implicit") is not None:
+            self.implicit_wait = params["implicit"] / 1000
+        elif command in self.FIND_COMMANDS and self.implicit_wait > 0 and self._is_empty(response):
+            self.consumed += elapsed
+            self.blocked_calls += 1
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Итог по неявным ожиданиям
+        
+        Returns:
+            Dict[str, Any]: consumed - секунды, blocked_calls - количество поисков
+        """
+        return {"consumed": round(self.consumed, 3), "blocked_calls": self.blocked_calls}
@@ -0,0 +1,358 @@
+"""
+JavaScript фрагменты, выполняемые в браузере через execute_script
+
+Локаторы передаются в скрипты как пары [by, value] в формате Selenium By.
+"""
+
+# Общие функции поиска и проверки элементов для всех скриптов
+DOM_HELPERS = """
+function __queryAll(by, value, root) {
+    root = root || document;
+    if (by === 'xpath') {
+        var snapshot = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var nodes = [];
+        for (var i = 0; i < snapshot.snapshotLength; i++) {
+            nodes.push(snapshot.snapshotItem(i));
+        }
+        return nodes;
+    }
+    var css = null;
+    if (by === 'css selector' || by === 'tag name') {
+        css = value;
+    } else if (by === 'id') {
+        css = '#' + CSS.escape(value);
+    } else if (by === 'class name') {
+        css = '.' + CSS.escape(value);
+    } else if (by === 'name') {
+        css = '[name="' + value.replace(/"/g, '\\\\"') + '"]';
+    }
+    return css === null ? [] : Array.prototype.slice.call(root.querySelectorAll(css));
+}
+
+function __isVisible(el) {
+    if (!el.isConnected) {
+        return false;
+    }
+    var style = window.getComputedStyle(el);
+    if (style.display === 'none' || style.visibility === 'hidden' || parseFloat(style.opacity) === 0) {
+        return false;
+    }
+    var rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+
+function __matches(el, condition, text) {
+    if (condition === 'visible' && !__isVisible(el)) {
+        return false;
+    }
+    if (condition === 'clickable' && (!__isVisible(el) || el.disabled)) {
+        return false;
+    }
+    if (text && (el.innerText || el.textContent || '').indexOf(text) === -1) {
+        return false;
+    }
+    return true;
+}
+
+function __resolveFirst(locators, condition, text) {
+    for (var i = 0; i < locators.length; i++) {
+        var nodes;
+        try {
+            nodes = __queryAll(locators[i][0], locators[i][1]);
+        } catch (e) {
+            continue;
+        }
+        for (var j = 0; j < nodes.length; j++) {
+            if (__matches(nodes[j], condition, text)) {
+                return [nodes[j], i];
+            }
+        }
+    }
+    return null;
+}
+"""
+
+# Первый подходящий элемент из списка локаторов за один вызов:
+# возвращает [элемент, индекс локатора] или null
+RESOLVE_FIRST = DOM_HELPERS + """
+return __resolveFirst(arguments[0], arguments[1], arguments[2]);
+"""
+
+# Ожидание условия в браузере за один блокирующий вызов execute_async_script.
+# Условие проверяется сразу и затем при каждой мутации DOM / смене readyState.
+# arguments[0] - описание условия (см. utils/waits.py), arguments[1] - таймаут в мс.
+# Возвращает результат условия или null по таймауту.
+MUTATION_WAIT = DOM_HELPERS + """
+var spec = arguments[0];
+var timeoutMs = arguments[1];
+var done = arguments[arguments.length - 1];
+
+function __evaluate(spec) {
+    if (spec.type === 'locators') {
+        return __resolveFirst(spec.locators, spec.condition, spec.text);
+    }
+    if (spec.type === 'ready_state') {
+        return spec.states.indexOf(document.readyState) !== -1 ? true : null;
+    }
+    if (spec.type === 'url_contains') {
+        var href = window.location.href.toLowerCase();
+        for (var i = 0; i < spec.values.length; i++) {
+            if (href.indexOf(spec.values[i]) !== -1) {
+                return true;
+            }
+        }
+        return null;
+    }
+    if (spec.type === 'any') {
+        for (var j = 0; j < spec.conditions.length; j++) {
+            var result = __evaluate(spec.conditions[j]);
+            if (result) {
+                return result;
+            }
+        }
+    }
+    return null;
+}
+
+var finished = false;
+var observer = null;
+var timer = null;
+var safetyTimer = null;
+
+function finish(result) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    if (observer) {
+        observer.disconnect();
+    }
+    clearTimeout(timer);
+    clearInterval(safetyTimer);
+    document.removeEventListener('readystatechange', check);
+    done(result);
+}
+
+function check() {
+    var result = null;
+    try {
+        result = __evaluate(spec);
+    } catch (e) {
+        result = null;
+    }
+    if (result) {
+        finish(result);
+    }
+}
+
+check();
+if (!finished) {
+    observer = new MutationObserver(check);
+    observer.observe(document.documentElement || document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+    document.addEventListener('readystatechange', check);
+    // CSS-анимации и переходы не порождают мутаций - редкая страховочная проверка
+    safetyTimer = setInterval(check, 250);
+    timer = setTimeout(function () { finish(null); }, timeoutMs);
+}
+"""
+
+# Извлечение данных всех карточек товаров за один вызов.
+# arguments[0] - параметры: cards (CSS карточки), links (CSS ссылки на товар или null),
+# title/price/quantity (списки CSS), available_texts/unavailable_texts (фразы наличия).
+# Возвращает список объектов {title, href, price, quantity, available}.
+EXTRACT_CARDS = """
+var options = arguments[0];
+
+function textOf(el) {
+    if (!el) {
+        return '';
+    }
+    if (el.tagName === 'INPUT') {
+        return (el.value || '').trim();
+    }
+    return (el.innerText || el.textContent || '').trim();
+}
+
+function firstText(root, selectors) {
+    for (var i = 0; i < (selectors || []).length; i++) {
+        try {
+            var value = textOf(root.querySelector(selectors[i]));
+            if (value) {
+                return value;
+            }
+        } catch (e) {}
+    }
+    return '';
+}
+
+function availability(card) {
+    var content = textOf(card);
+    for (var i = 0; i < (options.unavailable_texts || []).length; i++) {
+        if (content.indexOf(options.unavailable_texts[i]) !== -1) {
+            return false;
+        }
+    }
+    for (var j = 0; j < (options.available_texts || []).length; j++) {
+        if (content.indexOf(options.available_texts[j]) !== -1) {
+            return true;
+        }
+    }
+    return null;
+}
+
+function describe(card, href, title) {
+    var link = card ? card.querySelector('a[href]') : null;
+    return {
+        title: title || (card ? firstText(card, options.title) : ''),
+        href: href || (link ? link.href : ''),
+        price: card ? firstText(card, options.price) : '',
+        quantity: card ? firstText(card, options.quantity) : '',
+        available: card ? availability(card) : null
+    };
+}
+
+var products = [];
+if (options.links) {
+    var byHref = {};
+    var links = document.querySelectorAll(options.links);
+    for (var i = 0; i < links.length; i++) {
+        var link = links[i];
+        var product = byHref[link.href];
+        if (!product) {
+            var card = options.cards ? link.closest(options.cards) : null;
+            product = describe(card, link.href, textOf(link));
+            byHref[link.href] = product;
+            products.push(product);
+        } else if (!product.title) {
+            product.title = textOf(link);
+        }
+    }
+    if (products.length) {
+        return products;
+    }
+}
+
+var cards = options.cards ? document.querySelectorAll(options.cards) : [];
+for (var k = 0; k < cards.length; k++) {
+    var parent = cards[k].parentElement;
+    if (parent && parent.closest(options.cards)) {
+        continue;
+    }
+    products.push(describe(cards[k], '', ''));
+}
+return products;
+"""
+
+# Версия DOM: токен документа, счетчик мутаций (MutationObserver ставится
+# при первом вызове) и URL. Версия меняется при любой мутации DOM, смене URL
+# и переходе на новый документ - по ней проверяется актуальность кэша PageState.
+DOM_VERSION = """
+function __domVersion() {
+    var state = window.__domVersionState;
+    if (!state) {
+        state = window.__domVersionState = {token: Math.random().toString(36).slice(2), mutations: 0};
+        new MutationObserver(function () {
+            state.mutations++;
+        }).observe(document.documentElement, {childList: true, subtree: true, characterData: true, attributes: true});
+    }
+    return state.token + ':' + state.mutations + ':' + location.href;
+}
+"""
+
+# Состояние страницы по набору именованных запросов за один вызов (utils/page_state.py).
+# arguments[0] - запросы {имя: {type, ...}}, arguments[1] - версия DOM кэша,
+# arguments[2] - имена запросов, уже посчитанных для этой версии (не пересчитываются).
+# Возвращает {version, url, values: {имя: значение}}.
+PAGE_STATE = DOM_HELPERS + DOM_VERSION + "var __extractCards = function () {" + EXTRACT_CARDS + "};" + """
+function __topLevelTexts(css, limit) {
+    var texts = [];
+    var nodes = document.querySelectorAll(css);
+    for (var i = 0; i < nodes.length; i++) {
+        var parent = nodes[i].parentElement;
+        if (parent && parent.closest(css)) {
+            continue;
+        }
+        texts.push((nodes[i].textContent || '').replace(/\\s+/g, ' ').trim().slice(0, limit));
+    }
+    return texts;
+}
+
+function __count(locators) {
+    for (var i = 0; i < locators.length; i++) {
+        try {
+            var count = __queryAll(locators[i][0], locators[i][1]).length;
+            if (count) {
+                return count;
+            }
+        } catch (e) {}
+    }
+    return 0;
+}
+
+function __stateValue(query) {
+    if (query.type === 'count') {
+        return __count(query.locators);
+    }
+    if (query.type === 'present' || query.type === 'visible') {
+        return __resolveFirst(query.locators, query.type, null) !== null;
+    }
+    if (query.type === 'text') {
+        var found = __resolveFirst(query.locators, 'present', null);
+        return found ? (found[0].innerText || found[0].textContent || '').trim() : '';
+    }
+    if (query.type === 'cards') {
+        return __extractCards(query.options);
+    }
+    if (query.type === 'texts') {
+        return __topLevelTexts(query.css, query.limit);
+    }
+    return null;
+}
+
+var queries = arguments[0];
+var version = __domVersion();
+var skip = {};
+if (version === arguments[1]) {
+    for (var c = 0; c < (arguments[2] || []).length; c++) {
+        skip[arguments[2][c]] = true;
+    }
+}
+var values = {};
+for (var name in queries) {
+    if (!skip[name]) {
+        values[name] = __stateValue(queries[name]);
+    }
+}
+return {version: version, url: location.href, values: values};
+"""
+
+# Легкий снимок состояния страницы для буфера снимков (utils/snapshots.py):
+# URL, заголовок, readyState, число элементов, FNV-1a хэш текста страницы
+# (textContent, без пересчета раскладки), заголовки h1/h2 и размер окна.
+PAGE_SNAPSHOT = """
+var body = document.body;
+var text = body ? body.textContent.replace(/\\s+/g, ' ').slice(0, 50000) : '';
+var hash = 0x811c9dc5;
+for (var i = 0; i < text.length; i++) {
+    hash ^= text.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+}
+var headings = [];
+var nodes = document.querySelectorAll('h1, h2');
+for (var j = 0; j < nodes.length && headings.length < 3; j++) {
+    headings.push(nodes[j].textContent.trim().slice(0, 80));
+}
+return {
+    url: location.href,
+    title: document.title,
+    ready_state: document.readyState,
+    elements: document.getElementsByTagName('*').length,
+    text_length: text.length,
+    text_hash: (hash >>> 0).toString(16),
+    headings: headings,
+    width: window.innerWidth,
+    height: window.innerHeight
+};
+"""
@@ -0,0 +1,280 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+from typing import Dict, Any, List, Sequence
+from config.settings import settings
+from utils.helpers import APIHelper
+
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек в стиле HdrHistogram
+    
+    Значения хранятся в микросекундах в лог-линейных корзинах: до
+    sub_bucket_count микросекунд точно, дальше с относительной
+    погрешностью не больше 10^-significant_digits. Память не зависит
+    от числа замеров.
+    """
+    
+    def __init__(self, significant_digits: int = 2):
+        """
+        Инициализация гистограммы
+        
+        Args:
+            significant_digits: Число значащих цифр точности
+        """
+        self.sub_bucket_count = 2 ** math.ceil(math.log2(2 * 10 ** significant_digits))
+        self._sub_bucket_bits = self.sub_bucket_count.bit_length() - 1
+        self.counts: Dict[int, int] = {}
+        self.total_count = 0
+        self.min_value = 0
+        self.max_value = 0
+        self._sum = 0
+        self._lock = threading.Lock()
+    
+    def _bucket(self, value: int) -> int:
+        """Нижняя граница корзины для значения в микросекундах"""
+        shift = max(0, value.bit_length() - self._sub_bucket_bits)
+        return (value >> shift) << shift
+    
+    def _bucket_width(self, lower: int) -> int:
+        return 1 << max(0, lower.bit_length() - self._sub_bucket_bits)
+    
+    def record(self, seconds: float) -> None:
+        """
+        Записать значение
+        
+        Args:
+            seconds: Задержка в секундах
+        """
+        value = max(0, int(round(seconds * 1_000_000)))
+        lower = self._bucket(value)
+        with self._lock:
+            self.counts[lower] = self.counts.get(lower, 0) + 1
+            if not self.total_count or value < self.min_value:
+                self.min_value = value
+            self.max_value = max(self.max_value, value)
+            self.total_count += 1
+            self._sum += value
+    
+    def value_at_percentile(self, percent: float) -> float:
+        """
+        Значение перцентиля (верхняя граница корзины, не больше максимума)
+        
+        Args:
+            percent: Перцентиль от 0 до 100
+            
+        Returns:
+            float: Значение в секундах (0.0 для пустой гистограммы)
+        """
+        if not self.total_count:
+            return 0.0
+        target = max(1, math.ceil(percent / 100.0 * self.total_count))
+        seen = 0
+        for lower in sorted(self.counts):
+            seen += self.counts[lower]
+            if seen >= target:
+                highest = lower + self._bucket_width(lower) - 1
+                return min(highest, self.max_value) / 1_000_000
+        return self.max_value / 1_000_000
+    
+    def summary(self, percents: Sequence[float] = (50, 95, 99, 99.9)) -> Dict[str, float]:
+        """
+        Сводка в формате utils.stats.summarize
+        
+        Returns:
+            Dict[str, float]: count, min, max, mean и p50, p95, p99, p999 в секундах
+        """
+        result = {
+            "count": self.total_count,
+            "min": self.min_value / 1_000_000,
+            "max": self.max_value / 1_000_000,
+            "mean": self._sum / self.total_count / 1_000_000 if self.total_count else 0.0
+        }
+        for percent in percents:
+            result[f"p{percent:g}".replace(".", "")] = self.value_at_percentile(percent)
+        return result
+    
+    def buckets(self) -> List[List[float]]:
+        """
+        Непустые корзины
+        
+        Returns:
+            List[List[float]]: Пары [нижняя граница в секундах, количество]
+        """
+        return [[lower / 1_000_000, self.counts[lower]] for lower in sorted(self.counts)]
+
+
+class LoadGenerator:
+    """
+    Нагрузка на /search?q= через APIHelper с отдельной сессией
+    
+    Потоки (concurrency) отправляют запросы в течение duration секунд.
+    При rps > 0 запросы идут по расписанию с заданной частотой, и
+    задержка считается от запланированного момента отправки, чтобы
+    очередь при перегрузке не занижала хвост (coordinated omission).
+    При rps = 0 каждый поток отправляет запросы без пауз.
+    
+    У генератора своя сессия без повторов (повтор скрыл бы ошибку и
+    исказил задержку) с пулом соединений на concurrency потоков. Запрос,
+    не получивший ответа, считается ошибкой; такие ошибки считаются по
+    типам исключений (error_types в результате).
+    """
+    
+    def __init__(self, base_url: str, queries: Sequence[str],
+                 rps: float = settings.LOAD_RPS,
+                 concurrency: int = settings.LOAD_CONCURRENCY,
+                 duration: float = settings.LOAD_DURATION):
+        """
+        Инициализация генератора
+        
+        Args:
+            base_url: Адрес сайта или заглушки
+            queries: Поисковые запросы (берутся по кругу)
+            rps: Целевая частота запросов в секунду (0 - без ограничения)
+            concurrency: Число потоков
+            duration: Длительность нагрузки в секундах
+        """
+        if not queries:
+            raise ValueError("Нужен хотя бы один поисковый запрос")
+        
+        self.base_url = base_url.rstrip("/")
+        self.queries = list(queries)
+        self.rps = rps
+        self.concurrency = concurrency
+        self.duration = duration
+        self.api_helper = APIHelper(session=APIHelper.create_session(pool_size=concurrency, max_retries=0))
+        self.histogram = LatencyHistogram()
+        self.status_codes: Counter = Counter()
+        self.error_types: Counter = Counter()
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._sent = 0
+        self._deadline = 0.0
+        self._next_send = 0.0
+    
+    def _next_request(self):
+        """Следующий запрос: (запрос, запланированное время) или None по окончании"""
+        with self._lock:
+            now = time.perf_counter()
+            if self.rps > 0:
+                scheduled = self._next_send
+                self._next_send += 1.0 / self.rps
+            else:
+                scheduled = now
+            if scheduled >= self._deadline:
+                return None
+            query = self.queries[self._sent % len(self.queries)]
+            self._sent += 1
+            return query, scheduled
+    
+    def _worker(self) -> None:
+        headers = settings.get_api_headers()
+        while True:
+            next_request = self._next_request()
+            if next_request is None:
+                return
+            query, scheduled = next_request
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            
+            status_code = None
+            error_type = None
+            try:
+                response = self.api_helper.request(
+                    "GET", f"{self.base_url}/search", params={"q": query}, headers=headers
+                )
+                status_code = response.status_code
+            except Exception as error:
+                error_type = type(error).__name__
+            self.histogram.record(time.perf_counter() - scheduled)
+            
+            with self._lock:
+                if error_type is not None:
+                    self.error_types[error_type] += 1
+                    self.errors += 1
+                else:
+                    self.status_codes[str(status_code)] += 1
+                    if status_code >= 400:
+                        self.errors += 1
+    
+    def run(self) -> Dict[str, Any]:
+        """
+        Запустить нагрузку и дождаться окончания
+        
+        Returns:
+            Dict[str, Any]: Параметры, число запросов, throughput (запросов в
+            секунду), errors, error_rate, status_codes, error_types (запросы без
+            ответа по типам исключений), latency и histogram
+        """
+        start = time.perf_counter()
+        self._next_send = start
+        self._deadline = start + self.duration
+        threads = [
+            threading.Thread(target=self._worker, name=f"load-{index}", daemon=True)
+            for index in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        self.api_helper.session.close()
+        
+        requests_count = self.histogram.total_count
+        return {
+            "target": self.base_url,
+            "config": {"rps": self.rps, "concurrency": self.concurrency, "duration": self.duration},
+            "elapsed": round(elapsed, 3),
+            "requests": requests_count,
+            "throughput": round(requests_count / elapsed, 2) if elapsed else 0.0,
+            "errors": self.errors,
+            "error_rate": self.errors / requests_count if requests_count else 0.0,
+            "status_codes": dict(self.status_codes),
+            "error_types": dict(self.error_types),
+            "latency": self.histogram.summary(),
+            "histogram": self.histogram.buckets()
+        }
+
+
+def format_load_report(result: Dict[str, Any]) -> str:
+    """
+    Текстовая сводка результатов нагрузки
+    
+    Args:
+        result: Результат LoadGenerator.run
+        
+    Returns:
+        str: Сводка для вывода и Allure
+    """
+    latency = result["latency"]
+    lines = [
+        f"Цель: {result['target']}",
+        f"RPS: {result['config']['rps'] or 'без ограничения'}, потоков: {result['config']['concurrency']}, "
+        f"длительность: {result['config']['duration']} c",
+        f"Запросов: {result['requests']}, throughput: {result['throughput']} запросов/c",
+        f"Ошибок: {result['errors']} ({result['error_rate']:.2%}), статусы: {result['status_codes']}, "
+        f"исключения: {result['error_types'] or 'нет'}",
+        "Задержка, мс: " + ", ".join(
+            f"{key}={latency[key] * 1000:.1f}" for key in ("p50", "p95", "p99", "p999", "max")
+        )
+    ]
+    return "\n".join(lines)
+
+
+def write_load_report(result: Dict[str, Any], name: str = "load_test.json") -> str:
+    """
+    Сохранить результаты нагрузки в JSON в каталог отчетов
+    
+    Returns:
+        str: Путь к файлу отчета
+    """
+    os.makedirs(settings.REPORTS_DIR, exist_ok=True)
+    report_path = os.path.join(settings.REPORTS_DIR, name)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    return report_path
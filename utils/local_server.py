@@ -0,0 +1,100 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Type
+from urllib.parse import urlsplit, parse_qs
+from html import escape
+import time
+from config.settings import settings
+
+
+class LocalServer:
+    """
+    HTTP сервер на localhost в фоновом потоке
+    
+    Используется как заглушка сайта для офлайн запусков:
+    
+        with LocalServer(StubSearchHandler) as server:
+            helper.base_url = server.url
+    """
+    
+    def __init__(self, handler_class: Type[BaseHTTPRequestHandler], host: str = "127.0.0.1", port: int = 0):
+        """
+        Инициализация сервера
+        
+        Args:
+            handler_class: Класс обработчика запросов
+            host: Адрес для прослушивания
+            port: Порт (0 - любой свободный)
+        """
+        self.handler_class = handler_class
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        """Базовый URL запущенного сервера"""
+        if self._server is None:
+            raise RuntimeError("Сервер не запущен")
+        return f"http://{self.host}:{self._server.server_port}"
+    
+    def start(self) -> str:
+        """
+        Запустить сервер
+        
+        Returns:
+            str: Базовый URL сервера
+        """
+        self._server = ThreadingHTTPServer((self.host, self.port), self.handler_class)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="local-server", daemon=True)
+        self._thread.start()
+        return self.url
+    
+    def stop(self) -> None:
+        """Остановить сервер"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
+    
+    def __enter__(self) -> "LocalServer":
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.stop()
+
+
+class StubSearchHandler(BaseHTTPRequestHandler):
+    """
+    Заглушка сайта: главная страница и /search?q= с задержкой LOAD_STUB_DELAY
+    """
+    
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    delay: float = settings.LOAD_STUB_DELAY
+    
+    def do_GET(self) -> None:
+        parts = urlsplit(self.path)
+        if parts.path == "/":
+            self._send(200, "<html><head><title>Stub</title></head><body>Главная</body></html>")
+        elif parts.path == "/search":
+            query = parse_qs(parts.query).get("q", [""])[0]
+            time.sleep(self.delay)
+            self._send(200, f"<html><body><h1>Результаты поиска: {escape(query)}</h1></body></html>")
+        else:
+            self._send(404, "<html><body>Not Found</body></html>")
+    
+    def _send(self, status: int, body: str) -> None:
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def log_message(self, format: str, *args) -> None:
+        pass
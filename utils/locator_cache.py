@@ -0,0 +1,185 @@
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Tuple, Any, Optional
+from config.settings import settings
+from utils.file_lock import file_lock
+
+
+class LocatorCache:
+    """
+    Самообучающийся кэш сработавших локаторов
+    
+    Для каждого списка альтернативных локаторов (ключ вида
+    "MainPage.CART_BUTTONS") хранит число побед каждого селектора и время
+    последнего успеха. Селекторы с наибольшим рейтингом проверяются первыми,
+    а рейтинг селектора, который стоял выше победителя и не сработал,
+    уменьшается в LOCATOR_CACHE_DECAY раз. Если не сработал ни один
+    селектор списка, уменьшается рейтинг всех проверенных, иначе
+    "мертвый" селектор с большим рейтингом оставался бы первым навсегда.
+    
+    Methods:
+        order(key, locators): Порядок проверки локаторов
+        record_hit(key, locators, index, missed): Учесть сработавший локатор
+        record_miss(key, locators, missed): Учесть поиск без результата
+        save(): Сохранить кэш на диск
+        report(): Отчет по спискам локаторов
+    """
+    
+    def __init__(self, path: str = settings.LOCATOR_CACHE_FILE, decay: float = settings.LOCATOR_CACHE_DECAY):
+        """
+        Инициализация кэша
+        
+        Args:
+            path: Путь к JSON файлу кэша
+            decay: Множитель рейтинга для не сработавшего селектора
+        """
+        self.path = path
+        self.decay = decay
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict[str, Dict[str, Any]]] = self._load()
+        self._touched: set = set()
+    
+    def _load(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Загрузить кэш с диска (пустой, если файла нет или он поврежден)"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+    
+    @staticmethod
+    def selector_key(locator: Tuple[str, str]) -> str:
+        """
+        Строковый ключ локатора
+        
+        Args:
+            locator: Кортеж (By, locator)
+            
+        Returns:
+            str: Ключ вида "css selector=.cart-icon"
+        """
+        return f"{locator[0]}={locator[1]}"
+    
+    def order(self, key: str, locators: List[Tuple[str, str]]) -> List[int]:
+        """
+        Получить порядок проверки локаторов
+        
+        Args:
+            key: Ключ списка, например "MainPage.CART_BUTTONS"
+            locators: Исходный список локаторов
+            
+        Returns:
+            List[int]: Индексы локаторов, начиная с самых успешных
+        """
+        entries = self._data.get(key, {})
+        
+        def score(index: int) -> float:
+            entry = entries.get(self.selector_key(locators[index]))
+            return entry["score"] if entry else 0.0
+        
+        return sorted(range(len(locators)), key=lambda index: (-score(index), index))
+    
+    def record_hit(self, key: str, locators: List[Tuple[str, str]], index: int, missed: List[int]) -> None:
+        """
+        Учесть результат поиска по списку локаторов
+        
+        Args:
+            key: Ключ списка, например "MainPage.CART_BUTTONS"
+            locators: Исходный список локаторов
+            index: Индекс сработавшего локатора
+            missed: Индексы локаторов, проверенных раньше и не сработавших
+        """
+        with self._lock:
+            entries = self._data.setdefault(key, {})
+            self._touched.add(key)
+            
+            for missed_index in missed:
+                entry = entries.get(self.selector_key(locators[missed_index]))
+                if entry:
+                    entry["score"] *= self.decay
+                    entry["misses"] += 1
+            
+            entry = entries.setdefault(
+                self.selector_key(locators[index]),
+                {"wins": 0, "misses": 0, "score": 0.0, "last_success": None}
+            )
+            entry["wins"] += 1
+            entry["score"] += 1.0
+            entry["last_success"] = time.time()
+    
+    def record_miss(self, key: str, locators: List[Tuple[str, str]], missed: List[int]) -> None:
+        """
+        Учесть поиск, в котором не сработал ни один локатор
+        
+        Args:
+            key: Ключ списка, например "MainPage.CART_BUTTONS"
+            locators: Исходный список локаторов
+            missed: Индексы проверенных локаторов
+        """
+        with self._lock:
+            entries = self._data.get(key)
+            if not entries:
+                return
+            for missed_index in missed:
+                entry = entries.get(self.selector_key(locators[missed_index]))
+                if entry:
+                    entry["score"] *= self.decay
+                    entry["misses"] += 1
+                    self._touched.add(key)
+    
+    def save(self) -> None:
+        """
+        Сохранить кэш на диск
+        
+        Перезаписываются только списки, использованные в этом процессе;
+        слияние с файлом идет под межпроцессной блокировкой, поэтому
+        параллельные воркеры не затирают чужие данные.
+        """
+        with self._lock:
+            if not self._touched:
+                return
+            with file_lock(self.path):
+                data = self._load()
+                for key in self._touched:
+                    data[key] = self._data[key]
+                
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.path)
+    
+    def report(self, locator_lists: Optional[Dict[str, List[Tuple[str, str]]]] = None) -> Dict[str, Any]:
+        """
+        Отчет по спискам локаторов
+        
+        Args:
+            locator_lists: Полные списки локаторов по ключам - чтобы
+                отметить селекторы, которые ни разу не сработали
+            
+        Returns:
+            Dict[str, Any]: Для каждого ключа - статистика селекторов
+            по убыванию рейтинга и список "мертвых" селекторов
+        """
+        data = self._load()
+        data.update({key: self._data[key] for key in self._touched})
+        locator_lists = locator_lists or {}
+        
+        report = {}
+        for key in sorted(data):
+            entries = data.get(key, {})
+            all_selectors = [self.selector_key(locator) for locator in locator_lists.get(key, [])]
+            report[key] = {
+                "selectors": sorted(
+                    ({"selector": selector, **entry} for selector, entry in entries.items()),
+                    key=lambda entry: -entry["score"]
+                ),
+                "dead": [selector for selector in all_selectors if selector not in entries]
+            }
+        return report
+
+
+locator_cache = LocatorCache()
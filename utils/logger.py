@@ -0,0 +1,206 @@
+import os
+import json
+import queue
+import atexit
+import logging
+import logging.handlers
+from datetime import datetime
+from typing import Dict, Any, Optional
+from config.settings import settings
+
+
+ROOT_LOGGER = "chitai"
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class StructuredLogger:
+    """
+    Логгер с уровнями, ленивым форматированием и структурными полями
+    
+    Сообщение форматируется в стиле % только если уровень включен,
+    поэтому выключенный вызов в цикле стоит одной проверки уровня.
+    Дорогие аргументы (команды WebDriver) оборачиваются в проверку
+    is_enabled(DEBUG). Поля (page, locator, attempt, elapsed, ...)
+    передаются именованными аргументами и попадают в JSON запись:
+        
+        log.debug("Не удалось кликнуть: %s", e, locator=selector, attempt=i)
+    
+    Methods:
+        debug/info/warning/error(msg, *args, **fields): Записать сообщение
+        is_enabled(level): Включен ли уровень
+        bind(**fields): Логгер с дополнительными постоянными полями
+    """
+    
+    __slots__ = ("_logger", "_fields")
+    
+    def __init__(self, name: str, fields: Optional[Dict[str, Any]] = None):
+        """
+        Инициализация логгера
+        
+        Args:
+            name: Имя логгера внутри "chitai" (например "pages.MainPage")
+            fields: Поля, добавляемые к каждой записи
+        """
+        self._logger = logging.getLogger(f"{ROOT_LOGGER}.{name}")
+        self._fields = fields or {}
+    
+    def is_enabled(self, level: int) -> bool:
+        """Проверить, включен ли уровень (для защиты дорогих аргументов)"""
+        return self._logger.isEnabledFor(level)
+    
+    def bind(self, **fields) -> "StructuredLogger":
+        """
+        Получить логгер с дополнительными постоянными полями
+        
+        Returns:
+            StructuredLogger: Новый логгер с объединенными полями
+        """
+        bound = StructuredLogger.__new__(StructuredLogger)
+        bound._logger = self._logger
+        bound._fields = {**self._fields, **fields}
+        return bound
+    
+    def _log(self, level: int, msg: str, args: tuple, fields: Dict[str, Any]) -> None:
+        if not self._logger.isEnabledFor(level):
+            return
+        if self._fields:
+            fields = {**self._fields, **fields}
+        self._logger.log(level, msg, *args, extra={"fields": fields}, stacklevel=3)
+    
+    def debug(self, msg: str, *args, **fields) -> None:
+        self._log(DEBUG, msg, args, fields)
+    
+    def info(self, msg: str, *args, **fields) -> None:
+        self._log(INFO, msg, args, fields)
+    
+    def warning(self, msg: str, *args, **fields) -> None:
+        self._log(WARNING, msg, args, fields)
+    
+    def error(self, msg: str, *args, **fields) -> None:
+        self._log(ERROR, msg, args, fields)
+
+
+def get_logger(name: str, **fields) -> StructuredLogger:
+    """
+    Получить логгер фреймворка
+    
+    Args:
+        name: Имя логгера внутри "chitai"
+        **fields: Постоянные поля записей
+    
+    Returns:
+        StructuredLogger: Логгер
+    """
+    return StructuredLogger(name, fields)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Форматирование записи в одну JSON строку: время, уровень, логгер, сообщение и поля"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "worker": os.environ.get("PYTEST_XDIST_WORKER", "master")
+        }
+        for key, value in getattr(record, "fields", {}).items():
+            entry[key] = value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class FieldsFormatter(logging.Formatter):
+    """Читаемый формат для консоли и отчета pytest: сообщение и поля key=value"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " [" + " ".join(f"{key}={value}" for key, value in fields.items()) + "]"
+        return line
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler без форматирования в вызывающем потоке: запись форматирует поток QueueListener"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def log_file_path(path: str = settings.LOG_FILE) -> str:
+    """
+    Путь к файлу журнала текущего процесса (у воркеров xdist - свой файл)
+    
+    Args:
+        path: Базовый путь из настроек
+    
+    Returns:
+        str: Путь к файлу JSON lines
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if not worker:
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}-{worker}{extension}"
+
+
+def setup_logging(level: str = settings.LOG_LEVEL, path: Optional[str] = settings.LOG_FILE,
+                  console: bool = False) -> None:
+    """
+    Настроить журнал фреймворка
+    
+    Записи логгера "chitai" уходят в очередь, поток QueueListener пишет
+    их в файл JSON lines. Записи также передаются корневому логгеру,
+    поэтому pytest показывает их в отчете упавшего теста. Повторный
+    вызов перенастраивает журнал.
+    
+    Args:
+        level: Уровень ("DEBUG", "INFO", "WARNING", ...)
+        path: Файл JSON lines (None - без файла)
+        console: Дополнительно выводить записи в stderr
+    """
+    global _listener
+    
+    shutdown_logging()
+    logger = logging.getLogger(ROOT_LOGGER)
+    logger.setLevel(level.upper())
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    
+    if path:
+        path = log_file_path(path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        file_handler = logging.FileHandler(path, mode="w", encoding="utf-8")
+        file_handler.setFormatter(JsonLinesFormatter())
+        log_queue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(log_queue, file_handler)
+        _listener.start()
+        logger.addHandler(_DeferredQueueHandler(log_queue))
+    
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(FieldsFormatter("%(levelname)s %(name)s: %(message)s"))
+        logger.addHandler(console_handler)
+
+
+def shutdown_logging() -> None:
+    """Дописать очередь журнала в файл и остановить поток записи"""
+    global _listener
+    
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,170 @@
+from typing import Any, Dict, List, Optional, Tuple
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.common.exceptions import WebDriverException
+from utils.js_scripts import PAGE_STATE
+
+
+# Значения запросов, если скрипт состояния не выполнился
+DEFAULTS = {"count": 0, "present": False, "visible": False, "text": "", "cards": [], "texts": []}
+
+
+def count_query(locators: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """
+    Запрос: число элементов по первому локатору, у которого есть совпадения
+    
+    Args:
+        locators: Список кортежей (By, locator) в порядке приоритета
+    
+    Returns:
+        Dict[str, Any]: Описание запроса для PageState
+    """
+    return {"type": "count", "locators": [list(locator) for locator in locators]}
+
+
+def present_query(locators: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """
+    Запрос: есть ли в DOM элемент по одному из локаторов
+    
+    Args:
+        locators: Список кортежей (By, locator)
+    
+    Returns:
+        Dict[str, Any]: Описание запроса для PageState
+    """
+    return {"type": "present", "locators": [list(locator) for locator in locators]}
+
+
+def visible_query(locators: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """
+    Запрос: виден ли элемент по одному из локаторов
+    
+    Args:
+        locators: Список кортежей (By, locator)
+    
+    Returns:
+        Dict[str, Any]: Описание запроса для PageState
+    """
+    return {"type": "visible", "locators": [list(locator) for locator in locators]}
+
+
+def text_query(locators: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """
+    Запрос: текст первого найденного элемента ("" если элементов нет)
+    
+    Args:
+        locators: Список кортежей (By, locator) в порядке приоритета
+    
+    Returns:
+        Dict[str, Any]: Описание запроса для PageState
+    """
+    return {"type": "text", "locators": [list(locator) for locator in locators]}
+
+
+def cards_query(cards: Optional[str], links: Optional[str] = None,
+                title: Optional[List[str]] = None, price: Optional[List[str]] = None,
+                quantity: Optional[List[str]] = None,
+                available_texts: Optional[List[str]] = None,
+                unavailable_texts: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Запрос: данные карточек товаров (параметры как у BasePage.extract_cards)
+    
+    Returns:
+        Dict[str, Any]: Описание запроса для PageState
+    """
+    return {
+        "type": "cards",
+        "options": {
+            "cards": cards,
+            "links": links,
+            "title": title or [],
+            "price": price or [],
+            "quantity": quantity or [],
+            "available_texts": available_texts or [],
+            "unavailable_texts": unavailable_texts or []
+        }
+    }
+
+
+def texts_query(css: str, limit: int = 500) -> Dict[str, Any]:
+    """
+    Запрос: тексты элементов верхнего уровня по CSS селектору
+    
+    Args:
+        css: CSS селектор
+        limit: Максимальная длина текста элемента
+    
+    Returns:
+        Dict[str, Any]: Описание запроса для PageState
+    """
+    return {"type": "texts", "css": css, "limit": limit}
+
+
+class PageState:
+    """
+    Кэш состояния страницы, привязанный к версии DOM
+    
+    Значения именованных запросов (см. *_query) считаются в браузере
+    одним вызовом execute_script. Версия DOM - токен документа, счетчик
+    мутаций внедренного MutationObserver и URL. Пока версия не изменилась,
+    уже посчитанные значения не пересчитываются и не передаются: вызов
+    возвращает только версию. Новая версия сбрасывает весь кэш.
+    
+    Изменение свойств без мутации DOM (например value поля ввода при
+    наборе текста) версию не меняет.
+    
+    Methods:
+        query(queries): Значения запросов для текущего состояния страницы
+        invalidate(): Сбросить кэш
+    """
+    
+    def __init__(self, driver: WebDriver):
+        """
+        Инициализация кэша
+        
+        Args:
+            driver: WebDriver instance
+        """
+        self.driver = driver
+        self.hits = 0
+        self.misses = 0
+        self._version: Optional[str] = None
+        self._url = ""
+        self._values: Dict[str, Any] = {}
+    
+    def query(self, queries: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Получить значения запросов для текущего состояния страницы
+        
+        Args:
+            queries: Запросы по именам
+        
+        Returns:
+            Dict[str, Any]: url и значение каждого запроса по имени; значения
+            по умолчанию (DEFAULTS), если скрипт не выполнился
+        """
+        cached = [name for name in queries if name in self._values]
+        try:
+            state = self.driver.execute_script(PAGE_STATE, queries, self._version, cached)
+        except WebDriverException:
+            state = None
+        
+        if not state:
+            self.invalidate()
+            values = {name: DEFAULTS.get(query["type"]) for name, query in queries.items()}
+            return {"url": "", **values}
+        
+        if state["version"] == self._version:
+            self.hits += len(queries) - len(state["values"])
+            self._values.update(state["values"])
+        else:
+            self._version = state["version"]
+            self._values = dict(state["values"])
+        self.misses += len(state["values"])
+        self._url = state["url"]
+        return {"url": self._url, **{name: self._values[name] for name in queries}}
+    
+    def invalidate(self) -> None:
+        """Сбросить кэш (следующий запрос посчитает все значения заново)"""
+        self._version = None
+        self._url = ""
+        self._values = {}
@@ -0,0 +1,138 @@
+import os
+import shutil
+import tempfile
+import heapq
+from typing import Dict, Optional
+from config.settings import settings
+
+try:
+    from xdist.scheduler import LoadScopeScheduling
+except ImportError:
+    LoadScopeScheduling = None
+
+
+def worker_id() -> str:
+    """
+    Получить идентификатор воркера pytest-xdist
+    
+    Returns:
+        str: "gw0", "gw1", ... или "master" при запуске без xdist
+    """
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+def create_user_data_dir() -> str:
+    """
+    Создать отдельный каталог профиля Chrome для воркера
+    
+    Returns:
+        str: Путь к временному каталогу профиля
+    """
+    return tempfile.mkdtemp(prefix=f"chrome-profile-{worker_id()}-")
+
+
+def shard_by_duration(durations: Dict[str, float], shard_count: int) -> Dict[str, int]:
+    """
+    Распределить тесты по шардам с учетом их длительности
+    
+    Жадный алгоритм LPT: самый долгий из оставшихся тестов отдается
+    наименее загруженному шарду. Время всего прогона получается близким
+    к длительности самого медленного теста.
+    
+    Args:
+        durations: Ожидаемая длительность каждого теста
+        shard_count: Количество шардов (воркеров)
+        
+    Returns:
+        Dict[str, int]: Номер шарда для каждого теста
+    """
+    shard_count = max(1, shard_count)
+    loads = [(0.0, shard) for shard in range(shard_count)]
+    assignment = {}
+    
+    for nodeid in sorted(durations, key=lambda nodeid: (-durations[nodeid], nodeid)):
+        load, shard = heapq.heappop(loads)
+        assignment[nodeid] = shard
+        heapq.heappush(loads, (load + durations[nodeid], shard))
+    
+    return assignment
+
+
+if LoadScopeScheduling is not None:
+    
+    class DurationScheduling(LoadScopeScheduling):
+        """
+        Планировщик pytest-xdist, раздающий тесты по исторической длительности
+        
+        Каждый шард, построенный shard_by_duration(), отдается одному воркеру
+        целиком как единица работы LoadScopeScheduling.
+        """
+        
+        def __init__(self, config, log=None, store=None):
+            super().__init__(config, log)
+            from utils.durations import DurationStore
+            self._store = store or DurationStore()
+            self._shards: Optional[Dict[str, int]] = None
+        
+        def _split_scope(self, nodeid: str) -> str:
+            if self._shards is None:
+                durations = self._store.durations(self.collection)
+                self._shards = shard_by_duration(durations, len(self.nodes))
+                self._report_estimate(durations)
+            return f"shard-{self._shards.get(nodeid, 0)}"
+        
+        def _report_estimate(self, durations: Dict[str, float]) -> None:
+            """Вывести ожидаемую длительность прогона по загрузке шардов"""
+            loads = [0.0] * max(1, len(self.nodes))
+            for nodeid, shard in self._shards.items():
+                loads[shard] += durations[nodeid]
+            reporter = self.config.pluginmanager.get_plugin("terminalreporter")
+            if reporter is not None:
+                reporter.write_line(
+                    f"Ожидаемая длительность: {max(loads):.1f} c на {len(loads)} воркерах "
+                    f"(последовательно {sum(loads):.1f} c)"
+                )
+
+else:
+    DurationScheduling = None
+
+
+def worker_allure_dir(report_dir: str) -> str:
+    """
+    Получить каталог результатов Allure для текущего воркера
+    
+    Args:
+        report_dir: Общий каталог --alluredir
+        
+    Returns:
+        str: Подкаталог воркера
+    """
+    return os.path.join(report_dir, settings.ALLURE_WORKERS_DIR, worker_id())
+
+
+def merge_allure_results(report_dir: str) -> int:
+    """
+    Собрать результаты Allure всех воркеров в общий каталог
+    
+    Args:
+        report_dir: Общий каталог --alluredir
+        
+    Returns:
+        int: Количество перенесенных файлов
+    """
+    workers_root = os.path.join(report_dir, settings.ALLURE_WORKERS_DIR)
+    if not os.path.isdir(workers_root):
+        return 0
+    
+    moved = 0
+    for worker in sorted(os.listdir(workers_root)):
+        worker_dir = os.path.join(workers_root, worker)
+        for name in os.listdir(worker_dir):
+            target = os.path.join(report_dir, name)
+            if os.path.exists(target):
+                target = os.path.join(report_dir, f"{worker}-{name}")
+            shutil.move(os.path.join(worker_dir, name), target)
+            moved += 1
+    
+    shutil.rmtree(workers_root, ignore_errors=True)
+    return moved
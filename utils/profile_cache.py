@@ -0,0 +1,321 @@
+import os
+import json
+import time
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+from config.settings import settings
+
+
+SINGLETON_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile")
+
+SEED_CLICKS_SCRIPT = """
+for (const selector of arguments[0]) {
+    for (const el of document.querySelectorAll(selector)) {
+        try { el.click(); } catch (e) {}
+    }
+}
+"""
+
+LOCAL_STORAGE_SCRIPT = """
+const items = {};
+try {
+    for (let i = 0; i < localStorage.length; i++) {
+        const key = localStorage.key(i);
+        items[key] = localStorage.getItem(key);
+    }
+} catch (e) {}
+return items;
+"""
+
+# Поля CDP Network.CookieParam, которые переносятся из Network.getAllCookies
+COOKIE_PARAM_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+SERVICE_WORKER_READY_SCRIPT = """
+const done = arguments[arguments.length - 1];
+if (!('serviceWorker' in navigator)) { done(false); return; }
+Promise.race([
+    navigator.serviceWorker.ready.then(() => true),
+    new Promise(resolve => setTimeout(() => resolve(false), arguments[0]))
+]).then(done, () => done(false));
+"""
+
+
+class ProfileCache:
+    """
+    Шаблон "теплого" профиля Chrome
+    
+    Шаблон создается один раз: браузер с чистым профилем открывает
+    PROFILE_SEED_URLS, принимает cookie и подтверждает регион
+    (PROFILE_SEED_CLICKS), дожидается service worker; HTTP кэш профиля
+    при этом прогревается. Каждый новый драйвер получает копию шаблона
+    (copy-on-write через cp --reflink=auto, где поддерживается).
+    Шаблон пересоздается, если он старше PROFILE_TEMPLATE_MAX_AGE или
+    был снят для другого BASE_URL.
+    
+    Рядом с шаблоном хранится снимок принятых при прогреве cookie и
+    ключей localStorage (согласие, регион - PROFILE_STATE_KEYS): DriverPool
+    восстанавливает его после сброса драйвера между тестами.
+    
+    Methods:
+        is_fresh(): Проверить, что шаблон есть и актуален
+        ensure(seed_fn): Создать шаблон, если его нет
+        clone(target_dir): Скопировать шаблон в каталог профиля драйвера
+        write_site_state(profile_dir, state): Сохранить снимок состояния сайта
+        site_state(): Снимок состояния сайта из шаблона
+    """
+    
+    MARKER_FILE = "seed.json"
+    STATE_FILE = "site_state.json"
+    
+    def __init__(self, template_dir: str = settings.PROFILE_TEMPLATE_DIR,
+                 max_age: float = settings.PROFILE_TEMPLATE_MAX_AGE):
+        """
+        Инициализация кэша
+        
+        Args:
+            template_dir: Каталог шаблона профиля
+            max_age: Время жизни шаблона в секундах
+        """
+        self.template_dir = template_dir
+        self.max_age = max_age
+        self._seed_failed = False
+        self._site_state: Optional[Dict[str, Any]] = None
+    
+    @property
+    def _marker_path(self) -> str:
+        return os.path.join(self.template_dir, self.MARKER_FILE)
+    
+    def is_fresh(self) -> bool:
+        """
+        Проверить, что шаблон есть, снят для текущего BASE_URL и не устарел
+        
+        Returns:
+            bool: True если шаблон можно использовать (вместе со снимком состояния сайта)
+        """
+        try:
+            with open(self._marker_path, encoding="utf-8") as f:
+                marker = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return (
+            marker.get("base_url") == settings.BASE_URL
+            and time.time() - marker.get("seeded_at", 0) < self.max_age
+            and os.path.exists(os.path.join(self.template_dir, self.STATE_FILE))
+        )
+    
+    def ensure(self, seed_fn: Callable[[str], None]) -> bool:
+        """
+        Создать шаблон, если его нет или он устарел
+        
+        Параллельные воркеры ждут, пока шаблон создает один из них
+        (файл-блокировка рядом с шаблоном).
+        
+        Args:
+            seed_fn: Функция, прогревающая профиль в переданном каталоге
+            
+        Returns:
+            bool: True если шаблон готов, False если прогрев не удался
+            (повторно в этом процессе прогрев не запускается)
+        """
+        if self.is_fresh():
+            return True
+        if self._seed_failed:
+            return False
+        
+        parent_dir = os.path.dirname(os.path.abspath(self.template_dir))
+        os.makedirs(parent_dir, exist_ok=True)
+        lock_path = f"{self.template_dir}.lock"
+        deadline = time.time() + settings.PAGE_LOAD_TIMEOUT * 4
+        while True:
+            try:
+                lock_fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                if self._is_stale(lock_path):
+                    os.remove(lock_path)
+                    continue
+                if time.time() > deadline:
+                    return self.is_fresh()
+                time.sleep(0.5)
+                if self.is_fresh():
+                    return True
+        
+        try:
+            if self.is_fresh():
+                return True
+            seed_dir = tempfile.mkdtemp(prefix="chrome-profile-seed-", dir=parent_dir)
+            try:
+                seed_fn(seed_dir)
+            except Exception:
+                shutil.rmtree(seed_dir, ignore_errors=True)
+                self._seed_failed = True
+                return False
+            
+            self._remove_singletons(seed_dir)
+            with open(os.path.join(seed_dir, self.MARKER_FILE), "w", encoding="utf-8") as f:
+                json.dump({"base_url": settings.BASE_URL, "seeded_at": time.time()}, f)
+            
+            old_dir = f"{self.template_dir}.old"
+            shutil.rmtree(old_dir, ignore_errors=True)
+            if os.path.exists(self.template_dir):
+                os.replace(self.template_dir, old_dir)
+            os.replace(seed_dir, self.template_dir)
+            shutil.rmtree(old_dir, ignore_errors=True)
+            self._site_state = None
+            return True
+        finally:
+            os.close(lock_fd)
+            os.remove(lock_path)
+    
+    @staticmethod
+    def _is_stale(lock_path: str) -> bool:
+        """Блокировка осталась от упавшего процесса (старше времени прогрева)"""
+        try:
+            return time.time() - os.path.getmtime(lock_path) > settings.PAGE_LOAD_TIMEOUT * 4
+        except OSError:
+            return False
+    
+    def clone(self, target_dir: str) -> None:
+        """
+        Скопировать шаблон в каталог профиля
+        
+        На Linux используется cp --reflink=auto: на CoW файловых системах
+        (btrfs, xfs) копия создается без копирования данных.
+        
+        Args:
+            target_dir: Существующий пустой каталог профиля
+        """
+        if sys.platform.startswith("linux") and shutil.which("cp"):
+            result = subprocess.run(
+                ["cp", "-a", "--reflink=auto", f"{self.template_dir}/.", target_dir],
+                capture_output=True
+            )
+            if result.returncode == 0:
+                self._remove_singletons(target_dir)
+                return
+        
+        shutil.copytree(
+            self.template_dir, target_dir, symlinks=True, dirs_exist_ok=True,
+            ignore=shutil.ignore_patterns(*SINGLETON_FILES)
+        )
+    
+    def write_site_state(self, profile_dir: str, state: Dict[str, Any]) -> None:
+        """
+        Сохранить снимок состояния сайта в каталог прогреваемого профиля
+        
+        Args:
+            profile_dir: Каталог будущего шаблона профиля
+            state: Снимок из capture_site_state
+        """
+        with open(os.path.join(profile_dir, self.STATE_FILE), "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+    
+    def site_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Снимок принятых при прогреве cookie и ключей localStorage
+        
+        Returns:
+            Optional[Dict[str, Any]]: origin, cookies и local_storage или None,
+            если снимка нет (шаблон снят до его появления или поврежден)
+        """
+        if self._site_state is None:
+            try:
+                with open(os.path.join(self.template_dir, self.STATE_FILE), encoding="utf-8") as f:
+                    self._site_state = json.load(f)
+            except (OSError, ValueError):
+                return None
+        return self._site_state
+    
+    @staticmethod
+    def _remove_singletons(profile_dir: str) -> None:
+        """Удалить файлы блокировки Chrome, иначе копия профиля не запустится"""
+        for name in SINGLETON_FILES:
+            path = os.path.join(profile_dir, name)
+            if os.path.lexists(path):
+                os.remove(path)
+
+
+def seed_profile(driver) -> Dict[str, Any]:
+    """
+    Прогреть профиль: открыть PROFILE_SEED_URLS, принять cookie и регион, дождаться service worker
+    
+    Args:
+        driver: WebDriver, запущенный с прогреваемым каталогом профиля
+        
+    Returns:
+        Dict[str, Any]: Снимок принятого состояния сайта (capture_site_state)
+    """
+    for path in settings.PROFILE_SEED_URLS:
+        driver.get(f"{settings.BASE_URL}{path}")
+        time.sleep(settings.PROFILE_SEED_SETTLE_TIME)
+        driver.execute_script(SEED_CLICKS_SCRIPT, settings.PROFILE_SEED_CLICKS)
+        driver.execute_async_script(SERVICE_WORKER_READY_SCRIPT, settings.PROFILE_SEED_SETTLE_TIME * 1000)
+    return capture_site_state(driver)
+
+
+def site_origin() -> str:
+    """Origin сайта из текущего settings.BASE_URL, например https://www.chitai-gorod.ru"""
+    parts = urlsplit(settings.BASE_URL)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _is_state_key(name: str) -> bool:
+    """Имя cookie или ключа localStorage относится к согласию или региону (PROFILE_STATE_KEYS)"""
+    name = name.lower()
+    return any(part in name for part in settings.PROFILE_STATE_KEYS)
+
+
+def capture_site_state(driver) -> Dict[str, Any]:
+    """
+    Снять cookie и ключи localStorage согласия и региона
+    
+    Вызывается на странице сайта после прогрева. Сохраняются только
+    записи, имена которых содержат одну из PROFILE_STATE_KEYS: сессия
+    и корзина прогревающего браузера в тесты не переносятся.
+    
+    Args:
+        driver: WebDriver на странице сайта
+        
+    Returns:
+        Dict[str, Any]: origin, cookies (поля CDP Network.CookieParam) и local_storage
+    """
+    cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+    local_storage = driver.execute_script(LOCAL_STORAGE_SCRIPT) or {}
+    return {
+        "origin": site_origin(),
+        "cookies": [
+            {field: cookie[field] for field in COOKIE_PARAM_FIELDS
+             if field in cookie and not (field == "expires" and cookie.get("session"))}
+            for cookie in cookies if _is_state_key(cookie.get("name", ""))
+        ],
+        "local_storage": {key: value for key, value in local_storage.items() if _is_state_key(key)}
+    }
+
+
+def restore_site_state(driver, state: Dict[str, Any]) -> None:
+    """
+    Восстановить снимок согласия и региона после сброса драйвера
+    
+    Cookie ставятся через CDP Network.setCookies, ключи localStorage -
+    через DOMStorage.setDOMStorageItem для origin сайта, поэтому
+    открывать страницу сайта для восстановления не нужно.
+    
+    Args:
+        driver: WebDriver после сброса состояния
+        state: Снимок из capture_site_state
+        
+    Raises:
+        WebDriverException: Если команда CDP не выполнена
+    """
+    if state["cookies"]:
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": state["cookies"]})
+    storage_id = {"securityOrigin": state["origin"], "isLocalStorage": True}
+    for key, value in state["local_storage"].items():
+        driver.execute_cdp_cmd("DOMStorage.setDOMStorageItem", {"storageId": storage_id, "key": key, "value": value})
+
+
+profile_cache = ProfileCache()
@@ -0,0 +1,387 @@
+import os
+import re
+import json
+import time
+import inspect
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Iterator
+from config.settings import settings
+from utils.command_interceptor import is_instrumentation
+
+
+def _new_frame(name: str) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "wall": 0.0,
+        "commands": 0,
+        "command_time": 0.0,
+        "wait_time": 0.0,
+        "timeout_time": 0.0,
+        "failed": False,
+        "children": [],
+        "_start": time.perf_counter()
+    }
+
+
+class StepProfiler:
+    """
+    Профилировщик шагов page object
+    
+    Для каждого вызова метода страницы (step) записывается время
+    выполнения, число команд WebDriver и время в них, время явных
+    ожиданий и время ожиданий, закончившихся таймаутом. Метрики
+    инклюзивные: команда внутри вложенного шага учитывается во всех
+    шагах стека. Стек шагов свой у каждого потока.
+    
+    Является слушателем CommandInterceptor (on_command).
+    
+    Methods:
+        start(name): Начать профиль теста
+        stop(): Закончить профиль и вернуть дерево шагов
+        step(name): Контекстный менеджер шага
+        add_wait(elapsed, timed_out): Учесть явное ожидание
+    """
+    
+    def __init__(self, enabled: bool = settings.PROFILE_STEPS):
+        """
+        Инициализация профилировщика
+        
+        Args:
+            enabled: Включить сбор данных
+        """
+        self.enabled = enabled
+        self._local = threading.local()
+    
+    def _stack(self) -> List[Dict[str, Any]]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+    
+    @property
+    def active(self) -> bool:
+        """Идет профилирование теста в текущем потоке"""
+        return self.enabled and bool(self._stack())
+    
+    def current_step(self) -> Optional[str]:
+        """
+        Имя самого вложенного шага в текущем потоке
+        
+        Returns:
+            Optional[str]: Имя шага, None вне шагов страницы
+        """
+        stack = self._stack()
+        return stack[-1]["name"] if len(stack) > 1 else None
+    
+    def start(self, name: str) -> None:
+        """
+        Начать профиль теста (корневой шаг)
+        
+        Args:
+            name: Имя корня, обычно nodeid теста
+        """
+        self._local.stack = [_new_frame(name)]
+    
+    def stop(self) -> Optional[Dict[str, Any]]:
+        """
+        Закончить профиль теста
+        
+        Returns:
+            Optional[Dict[str, Any]]: Дерево шагов или None, если профиль не начат
+        """
+        stack = self._stack()
+        if not stack:
+            return None
+        root = stack[0]
+        self._finish(root)
+        self._local.stack = []
+        return root
+    
+    @staticmethod
+    def _finish(frame: Dict[str, Any]) -> None:
+        frame["wall"] = round(time.perf_counter() - frame.pop("_start"), 4)
+        for key in ("command_time", "wait_time", "timeout_time"):
+            frame[key] = round(frame[key], 4)
+    
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """
+        Шаг профиля, вложенный в текущий
+        
+        Args:
+            name: Имя шага, например "MainPage.open_cart"
+        """
+        stack = self._stack()
+        frame = _new_frame(name)
+        stack[-1]["children"].append(frame)
+        stack.append(frame)
+        try:
+            yield
+        except Exception:
+            frame["failed"] = True
+            raise
+        finally:
+            stack.pop()
+            self._finish(frame)
+    
+    def on_command(self, command: str, params: Optional[Dict[str, Any]],
+                   response: Optional[Dict[str, Any]], elapsed: float) -> None:
+        """Учесть команду WebDriver во всех шагах текущего стека (кроме служебных)"""
+        if is_instrumentation():
+            return
+        for frame in self._stack():
+            frame["commands"] += 1
+            frame["command_time"] += elapsed
+    
+    def add_wait(self, elapsed: float, timed_out: bool) -> None:
+        """
+        Учесть явное ожидание во всех шагах текущего стека
+        
+        Args:
+            elapsed: Длительность ожидания в секундах
+            timed_out: Ожидание закончилось таймаутом
+        """
+        for frame in self._stack():
+            frame["wait_time"] += elapsed
+            if timed_out:
+                frame["timeout_time"] += elapsed
+
+
+step_profiler = StepProfiler()
+
+_step_listeners: List[Any] = []
+_step_depth = threading.local()
+
+
+def add_step_listener(listener) -> None:
+    """
+    Подписаться на окончание шагов page object верхнего уровня
+    
+    Слушатель реализует on_step_end(page, step, failed) и вызывается,
+    когда завершается внешний (не вложенный) вызов метода страницы.
+    
+    Args:
+        listener: Слушатель шагов
+    """
+    if listener not in _step_listeners:
+        _step_listeners.append(listener)
+
+
+def remove_step_listener(listener) -> None:
+    """
+    Отписать слушателя шагов
+    
+    Args:
+        listener: Ранее добавленный слушатель
+    """
+    if listener in _step_listeners:
+        _step_listeners.remove(listener)
+
+
+def profiled(func):
+    """
+    Обернуть метод страницы шагом профиля "Класс.метод"
+    
+    Вне профилируемого теста и без слушателей шагов обертка просто вызывает метод.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not step_profiler.active and not _step_listeners:
+            return func(self, *args, **kwargs)
+        
+        name = f"{type(self).__name__}.{func.__name__}"
+        depth = getattr(_step_depth, "value", 0)
+        _step_depth.value = depth + 1
+        failed = False
+        try:
+            if not step_profiler.active:
+                return func(self, *args, **kwargs)
+            with step_profiler.step(name):
+                return func(self, *args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            _step_depth.value = depth
+            if depth == 0:
+                for listener in list(_step_listeners):
+                    listener.on_step_end(self, name, failed)
+    
+    wrapper._profiled = True
+    return wrapper
+
+
+def profile_class(cls, exclude=()) -> None:
+    """
+    Обернуть профилированием методы, объявленные в классе
+    
+    Пропускаются dunder-методы, staticmethod/classmethod, генераторы
+    и контекстные менеджеры (их время не совпадает со временем вызова).
+    
+    Args:
+        cls: Класс страницы
+        exclude: Имена методов, которые не нужно оборачивать
+    """
+    for name, value in list(vars(cls).items()):
+        if name.startswith("__") or name in exclude or not inspect.isfunction(value):
+            continue
+        if getattr(value, "_profiled", False) or inspect.isgeneratorfunction(inspect.unwrap(value)):
+            continue
+        setattr(cls, name, profiled(value))
+
+
+def merge_tree(frame: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Склеить одноименные соседние шаги (как в flame graph)
+    
+    Args:
+        frame: Дерево шагов из StepProfiler.stop
+        
+    Returns:
+        Dict[str, Any]: Дерево с полем calls и суммарными метриками
+    """
+    merged = {key: frame[key] for key in ("name", "wall", "commands", "command_time", "wait_time", "timeout_time")}
+    merged["calls"] = 1
+    merged["failed"] = int(frame.get("failed", False))
+    children: Dict[str, Dict[str, Any]] = {}
+    for child in frame["children"]:
+        node = merge_tree(child)
+        existing = children.get(node["name"])
+        if existing is None:
+            children[node["name"]] = node
+        else:
+            _merge_into(existing, node)
+    merged["children"] = sorted(children.values(), key=lambda node: -node["wall"])
+    return merged
+
+
+def _merge_into(target: Dict[str, Any], node: Dict[str, Any]) -> None:
+    for key in ("wall", "commands", "command_time", "wait_time", "timeout_time", "calls", "failed"):
+        target[key] += node[key]
+    by_name = {child["name"]: child for child in target["children"]}
+    for child in node["children"]:
+        if child["name"] in by_name:
+            _merge_into(by_name[child["name"]], child)
+        else:
+            target["children"].append(child)
+    target["children"].sort(key=lambda child: -child["wall"])
+
+
+def format_flame(tree: Dict[str, Any], width: int = 30) -> str:
+    """
+    Текстовый flame-отчет: шаги с отступом по вложенности и полосой доли времени
+    
+    Args:
+        tree: Результат merge_tree
+        width: Ширина полосы для корня
+        
+    Returns:
+        str: Отчет для Allure
+    """
+    total = tree["wall"] or 1.0
+    lines = []
+    
+    def walk(node: Dict[str, Any], depth: int) -> None:
+        bar = "█" * max(1, int(round(node["wall"] / total * width)))
+        line = (
+            f"{'  ' * depth}{node['name']} x{node['calls']}: {node['wall']:.2f} c {bar} | "
+            f"команд {node['commands']} ({node['command_time']:.2f} c), ожидания {node['wait_time']:.2f} c"
+        )
+        if node["timeout_time"]:
+            line += f", из них таймауты {node['timeout_time']:.2f} c"
+        if node["failed"]:
+            line += f", с исключением {node['failed']}"
+        lines.append(line)
+        for child in node["children"]:
+            walk(child, depth + 1)
+    
+    walk(tree, 0)
+    return "\n".join(lines)
+
+
+def folded_stacks(tree: Dict[str, Any]) -> List[str]:
+    """
+    Профиль в формате folded stacks (flamegraph.pl, speedscope)
+    
+    Args:
+        tree: Результат merge_tree
+        
+    Returns:
+        List[str]: Строки "корень;шаг;вложенный_шаг собственное_время_мс"
+    """
+    lines = []
+    
+    def walk(node: Dict[str, Any], path: List[str]) -> None:
+        path = path + [node["name"].replace(";", ",").replace(" ", "_")]
+        own_ms = int(round((node["wall"] - sum(child["wall"] for child in node["children"])) * 1000))
+        if own_ms > 0:
+            lines.append(f"{';'.join(path)} {own_ms}")
+        for child in node["children"]:
+            walk(child, path)
+    
+    walk(tree, [])
+    return lines
+
+
+def report_file_name(nodeid: str, extension: str = ".json") -> str:
+    """Имя файла отчета теста из его nodeid"""
+    return re.sub(r"[^\w.-]+", "_", nodeid).strip("_") + extension
+
+
+def write_profile(nodeid: str, tree: Dict[str, Any]) -> str:
+    """
+    Сохранить профиль теста в PROFILES_DIR
+    
+    Args:
+        nodeid: Идентификатор теста
+        tree: Результат merge_tree
+        
+    Returns:
+        str: Путь к JSON файлу
+    """
+    os.makedirs(settings.PROFILES_DIR, exist_ok=True)
+    path = os.path.join(settings.PROFILES_DIR, report_file_name(nodeid))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"test": nodeid, "profile": tree, "folded": folded_stacks(tree)}, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def summarize_profiles(profiles_dir: str = settings.PROFILES_DIR) -> Dict[str, Dict[str, Any]]:
+    """
+    Сводка по шагам всех профилей тестов
+    
+    Args:
+        profiles_dir: Каталог профилей тестов
+        
+    Returns:
+        Dict[str, Dict[str, Any]]: Шаг -> calls, failed, wall, commands, command_time,
+        wait_time, timeout_time; по убыванию wall
+    """
+    steps: Dict[str, Dict[str, Any]] = {}
+    
+    def walk(node: Dict[str, Any]) -> None:
+        stats = steps.setdefault(node["name"], {
+            "calls": 0, "failed": 0, "wall": 0.0, "commands": 0,
+            "command_time": 0.0, "wait_time": 0.0, "timeout_time": 0.0
+        })
+        for key in stats:
+            stats[key] += node[key]
+        for child in node["children"]:
+            walk(child)
+    
+    if os.path.isdir(profiles_dir):
+        for file_name in sorted(os.listdir(profiles_dir)):
+            try:
+                with open(os.path.join(profiles_dir, file_name), encoding="utf-8") as f:
+                    profile = json.load(f)["profile"]
+            except (OSError, ValueError, KeyError):
+                continue
+            for child in profile["children"]:
+                walk(child)
+    
+    return {
+        name: {key: round(value, 4) if isinstance(value, float) else value for key, value in stats.items()}
+        for name, stats in sorted(steps.items(), key=lambda item: -item[1]["wall"])
+    }
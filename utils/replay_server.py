@@ -0,0 +1,383 @@
+import base64
+import fnmatch
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler
+from typing import Dict, Any, Optional, List
+from urllib.parse import urlsplit, parse_qsl, urlencode
+import requests
+from config.settings import settings
+from utils.local_server import LocalServer
+from utils.file_lock import file_lock
+
+
+class ReplayArchive:
+    """
+    Архив записанных HTTP ответов (gzip JSON)
+    
+    Ответы хранятся по ключу "МЕТОД путь?запрос" с отсортированными
+    параметрами запроса, одинаковые тела хранятся один раз (по sha1).
+    Сохранение дописывает в архив только ответы, записанные в этом
+    процессе, под межпроцессной блокировкой файла, поэтому параллельные
+    воркеры не затирают друг друга.
+    """
+    
+    def __init__(self, path: str = settings.REPLAY_ARCHIVE):
+        """
+        Инициализация архива
+        
+        Args:
+            path: Путь к файлу архива
+        """
+        self.path = path
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._bodies: Dict[str, str] = {}
+        self._touched: set = set()
+        self._lock = threading.Lock()
+        self._load()
+    
+    @staticmethod
+    def key(method: str, path: str) -> str:
+        """
+        Ключ ответа в архиве
+        
+        Args:
+            method: HTTP метод
+            path: Путь с запросом (как в строке запроса HTTP)
+            
+        Returns:
+            str: Ключ с отсортированными параметрами запроса
+        """
+        parts = urlsplit(path)
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return f"{method.upper()} {parts.path or '/'}" + (f"?{query}" if query else "")
+    
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"entries": {}, "bodies": {}}
+    
+    def _load(self) -> None:
+        data = self._read()
+        self._entries = data.get("entries", {})
+        self._bodies = data.get("bodies", {})
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Получить записанный ответ
+        
+        Returns:
+            Optional[Dict[str, Any]]: status, headers и body (bytes) или None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return {
+            "status": entry["status"],
+            "headers": entry["headers"],
+            "body": base64.b64decode(self._bodies[entry["body"]])
+        }
+    
+    def put(self, key: str, status: int, headers: List[List[str]], body: bytes) -> None:
+        """
+        Записать ответ
+        
+        Args:
+            key: Ключ из ReplayArchive.key
+            status: HTTP статус
+            headers: Заголовки ответа списком пар [имя, значение]
+            body: Тело ответа
+        """
+        digest = hashlib.sha1(body).hexdigest()
+        with self._lock:
+            self._bodies[digest] = base64.b64encode(body).decode("ascii")
+            self._entries[key] = {"status": status, "headers": headers, "body": digest}
+            self._touched.add(key)
+    
+    def save(self) -> None:
+        """Сохранить ответы, записанные в этом процессе (слияние с архивом под блокировкой файла)"""
+        with self._lock:
+            if not self._touched:
+                return
+            with file_lock(self.path):
+                data = self._read()
+                for key in self._touched:
+                    entry = self._entries[key]
+                    data["entries"][key] = entry
+                    data["bodies"][entry["body"]] = self._bodies[entry["body"]]
+                
+                used = {entry["body"] for entry in data["entries"].values()}
+                data["bodies"] = {digest: body for digest, body in data["bodies"].items() if digest in used}
+                
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, sort_keys=True)
+                os.replace(tmp_path, self.path)
+            self._touched.clear()
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """
+    Обработчик запросов сервера записи/воспроизведения
+    
+    Атрибут server_state (ReplayServer) задается в подклассе, который
+    создает ReplayServer.
+    """
+    
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server_state: "ReplayServer" = None
+    
+    SKIPPED_HEADERS = {
+        "connection", "keep-alive", "transfer-encoding", "content-encoding",
+        "content-length", "strict-transport-security", "alt-svc"
+    }
+    
+    def _handle(self) -> None:
+        state = self.server_state
+        key = ReplayArchive.key(self.command, self.path)
+        
+        if state.mode == "record":
+            recorded = state.record(self, key)
+        else:
+            recorded = state.archive.get(key)
+        
+        if recorded is None:
+            state.miss(key)
+            self._send(404, [["Content-Type", "text/plain; charset=utf-8"], ["X-Replay-Miss", key]],
+                       f"Нет записанного ответа: {key}".encode("utf-8"))
+            return
+        
+        state.hit()
+        self._send(recorded["status"], state.rewrite_headers(recorded["headers"]),
+                   state.rewrite_body(recorded["headers"], recorded["body"]))
+    
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = _handle
+    
+    def do_HEAD(self) -> None:
+        self._handle()
+    
+    def _send(self, status: int, headers: List[List[str]], body: bytes) -> None:
+        self.send_response(status)
+        for name, value in headers:
+            if name.lower() not in self.SKIPPED_HEADERS:
+                self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+    
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class ReplayServer:
+    """
+    Локальный сервер записи и воспроизведения страниц сайта
+    
+    В режиме record запросы проксируются на upstream, ответы сохраняются
+    в архив. В режиме replay ответы отдаются только из архива, неизвестные
+    запросы получают 404 с заголовком X-Replay-Miss. Абсолютные ссылки на
+    upstream в текстовых ответах и в Location заменяются на адрес сервера.
+    
+    Ссылки на другие хосты из hosts (API, CDN сайта) заменяются на
+    "<адрес сервера>/__replay/<схема>/<хост>/...": такие запросы тоже
+    проходят через сервер, записываются и воспроизводятся, а для браузера
+    становятся запросами к тому же источнику. Остальные хосты при
+    воспроизведении недоступны (см. DriverFactory).
+    """
+    
+    TEXT_TYPES = ("text/", "javascript", "json", "xml")
+    PROXY_PREFIX = "/__replay"
+    ABSOLUTE_URL = re.compile(rb"(https?):(\\?/)\2([A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)+)")
+    PROTOCOL_RELATIVE_URL = re.compile(rb"(?<=[\"'(])(\\?/)\1([A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)+)")
+    
+    def __init__(self, mode: str = settings.REPLAY_MODE, archive_path: str = settings.REPLAY_ARCHIVE,
+                 upstream: str = settings.BASE_URL, hosts: Optional[List[str]] = None):
+        """
+        Инициализация сервера
+        
+        Args:
+            mode: "record" или "replay"
+            archive_path: Путь к архиву ответов
+            upstream: Адрес реального сайта
+            hosts: Шаблоны (fnmatch) сторонних хостов, проходящих через сервер
+                (по умолчанию settings.REPLAY_HOSTS)
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Неизвестный режим REPLAY_MODE: {mode}")
+        
+        self.mode = mode
+        self.upstream = upstream.rstrip("/")
+        self.hosts = settings.REPLAY_HOSTS if hosts is None else hosts
+        self.archive = ReplayArchive(archive_path)
+        self.hits = 0
+        self.misses: List[str] = []
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        handler_class = type("BoundReplayHandler", (ReplayHandler,), {"server_state": self})
+        self._server = LocalServer(handler_class)
+        self.url = ""
+    
+    def start(self) -> str:
+        """
+        Запустить сервер
+        
+        Returns:
+            str: Адрес сервера для Settings.BASE_URL
+        """
+        if self.mode == "record":
+            self._session = requests.Session()
+        self.url = self._server.start()
+        return self.url
+    
+    def stop(self) -> None:
+        """Остановить сервер и сохранить записанные ответы"""
+        self._server.stop()
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self.mode == "record":
+            self.archive.save()
+    
+    def hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+    
+    def miss(self, key: str) -> None:
+        with self._lock:
+            self.misses.append(key)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Статистика сервера
+        
+        Returns:
+            Dict[str, Any]: mode, hits, misses (уникальные ключи) и entries (ответов в архиве)
+        """
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": sorted(set(self.misses)),
+            "entries": len(self.archive)
+        }
+    
+    def record(self, handler: BaseHTTPRequestHandler, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Переслать запрос на upstream и записать ответ
+        
+        Returns:
+            Optional[Dict[str, Any]]: Ответ в формате ReplayArchive.get или None при ошибке сети
+        """
+        headers = {
+            name: value.replace(self.url, self.upstream)
+            for name, value in handler.headers.items()
+            if name.lower() not in ("host", "connection", "accept-encoding", "content-length")
+        }
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else None
+        try:
+            response = self._session.request(
+                handler.command, self.target_url(handler.path), headers=headers, data=body,
+                allow_redirects=False, timeout=settings.API_TIMEOUT
+            )
+        except requests.exceptions.RequestException:
+            return None
+        
+        response_headers = [[name, value] for name, value in response.headers.items()
+                            if name.lower() not in ReplayHandler.SKIPPED_HEADERS]
+        self.archive.put(key, response.status_code, response_headers, response.content)
+        return {"status": response.status_code, "headers": response_headers, "body": response.content}
+    
+    def is_proxied(self, host: str) -> bool:
+        """Проходит ли сторонний хост через сервер (совпадает с шаблоном из hosts)"""
+        host = host.lower().split(":")[0]
+        return host != urlsplit(self.upstream).netloc and any(
+            fnmatch.fnmatch(host, pattern) for pattern in self.hosts
+        )
+    
+    def target_url(self, path: str) -> str:
+        """
+        Адрес, на который пересылается запрос при записи
+        
+        Args:
+            path: Путь запроса к серверу
+            
+        Returns:
+            str: Адрес на upstream или на стороннем хосте для путей /__replay/<схема>/<хост>/...
+        """
+        if path.startswith(self.PROXY_PREFIX + "/"):
+            scheme, _, rest = path[len(self.PROXY_PREFIX) + 1:].partition("/")
+            host, slash, tail = rest.partition("/")
+            if scheme in ("http", "https") and self.is_proxied(host.split("?")[0]):
+                return f"{scheme}://{host}{slash}{tail}"
+        return f"{self.upstream}{path}"
+    
+    def _rewrite_foreign(self, body: bytes) -> bytes:
+        """Заменить ссылки на сторонние хосты из hosts на пути /__replay/ сервера"""
+        local = urlsplit(self.url).netloc.encode()
+        prefix = self.PROXY_PREFIX.strip("/").encode()
+        
+        def absolute(match):
+            scheme, slash, host = match.groups()
+            if not self.is_proxied(host.decode("ascii")):
+                return match.group(0)
+            return b"http:" + slash * 2 + local + slash + prefix + slash + scheme + slash + host
+        
+        def protocol_relative(match):
+            slash, host = match.groups()
+            if not self.is_proxied(host.decode("ascii")):
+                return match.group(0)
+            return slash * 2 + local + slash + prefix + slash + b"https" + slash + host
+        
+        body = self.ABSOLUTE_URL.sub(absolute, body)
+        return self.PROTOCOL_RELATIVE_URL.sub(protocol_relative, body)
+    
+    def rewrite_headers(self, headers: List[List[str]]) -> List[List[str]]:
+        """Заменить upstream и сторонние хосты на адрес сервера в Location и убрать Domain/Secure из cookies"""
+        rewritten = []
+        for name, value in headers:
+            lowered = name.lower()
+            if lowered == "location":
+                value = self._rewrite_foreign(value.replace(self.upstream, self.url).encode()).decode()
+            elif lowered == "set-cookie":
+                value = re.sub(r";\s*(Domain=[^;]*|Secure)", "", value, flags=re.IGNORECASE)
+            rewritten.append([name, value])
+        return rewritten
+    
+    def rewrite_body(self, headers: List[List[str]], body: bytes) -> bytes:
+        """Заменить абсолютные ссылки на upstream и сторонние хосты из hosts в текстовых ответах"""
+        content_type = next((value for name, value in headers if name.lower() == "content-type"), "")
+        if not any(text_type in content_type for text_type in self.TEXT_TYPES):
+            return body
+        
+        upstream = self.upstream.encode()
+        local = self.url.encode()
+        body = body.replace(upstream, local)
+        body = body.replace(upstream.replace(b"/", b"\\/"), local.replace(b"/", b"\\/"))
+        body = body.replace(b"//" + urlsplit(self.upstream).netloc.encode(), b"//" + urlsplit(self.url).netloc.encode())
+        return self._rewrite_foreign(body)
+
+
+def write_replay_report(server: ReplayServer) -> str:
+    """
+    Сохранить статистику сервера записи/воспроизведения в каталог отчетов
+    
+    Returns:
+        str: Путь к файлу отчета
+    """
+    os.makedirs(settings.REPORTS_DIR, exist_ok=True)
+    report_path = os.path.join(settings.REPORTS_DIR, "replay.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(server.stats(), f, ensure_ascii=False, indent=2)
+    return report_path
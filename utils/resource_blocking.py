@@ -0,0 +1,319 @@
+import os
+import json
+import threading
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlsplit
+from selenium.common.exceptions import WebDriverException
+from config.settings import settings
+from utils.parallel import worker_id
+from utils.file_lock import file_lock
+
+
+RESOURCE_TYPE_EXTENSIONS: Dict[str, List[str]] = {
+    "image": ["jpg", "jpeg", "png", "gif", "webp", "avif", "svg", "ico"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "media": ["mp4", "webm", "ogg", "mp3", "m3u8"],
+    "stylesheet": ["css"],
+    "script": ["js"]
+}
+
+
+def blocked_url_patterns(url_patterns: Optional[List[str]] = None,
+                         resource_types: Optional[List[str]] = None) -> List[str]:
+    """
+    Шаблоны URL для Network.setBlockedURLs
+    
+    CDP блокирует только по URL, поэтому типы ресурсов переводятся в
+    шаблоны по расширению файла (с query-строкой и без).
+    
+    Args:
+        url_patterns: Шаблоны URL (по умолчанию BLOCKED_URL_PATTERNS)
+        resource_types: Типы ресурсов (по умолчанию BLOCKED_RESOURCE_TYPES)
+        
+    Returns:
+        List[str]: Шаблоны с подстановкой *
+        
+    Raises:
+        ValueError: Если указан неизвестный тип ресурса
+    """
+    patterns = list(settings.BLOCKED_URL_PATTERNS if url_patterns is None else url_patterns)
+    for resource_type in settings.BLOCKED_RESOURCE_TYPES if resource_types is None else resource_types:
+        if resource_type not in RESOURCE_TYPE_EXTENSIONS:
+            raise ValueError(f"Неизвестный тип ресурса: {resource_type}")
+        for extension in RESOURCE_TYPE_EXTENSIONS[resource_type]:
+            patterns.extend([f"*.{extension}", f"*.{extension}?*"])
+    return patterns
+
+
+def apply_blocking(driver) -> List[str]:
+    """
+    Включить блокировку ресурсов в браузере (если BLOCK_RESOURCES включен)
+    
+    Args:
+        driver: Chrome WebDriver
+        
+    Returns:
+        List[str]: Примененные шаблоны (пустой список, если блокировка выключена)
+    """
+    if not settings.BLOCK_RESOURCES:
+        return []
+    patterns = blocked_url_patterns()
+    if patterns:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    return patterns
+
+
+class ResourceMonitor:
+    """
+    Учет загруженных и заблокированных запросов по страницам
+    
+    Данные берутся из performance лога Chrome, который включается только
+    с RESOURCE_REPORT=1 (иначе collect ничего не делает). Заблокированный
+    запрос не скачивается, поэтому сэкономленные байты оцениваются по
+    размерам тех же URL, загруженных раньше: encodedDataLength, а для
+    ответов из кэша - Content-Length из Network.responseReceived. Размеры
+    накапливаются калибровочным запуском с BLOCK_RESOURCES=0; для URL без
+    известного размера растет счетчик unknown_size. Хранятся последние
+    RESOURCE_SIZES_LIMIT размеров. Запрос, начало и окончание которого
+    пришли в разных порциях лога, учитывается: начатые запросы хранятся
+    по драйверам до окончания.
+    
+    Сохранение под межпроцессной блокировкой дописывает к накопительному
+    файлу (все запуски) только изменения этого процесса, а статистику
+    текущего запуска пишет отдельно в run_dir (файл на воркер xdist).
+    
+    Methods:
+        collect(driver): Разобрать новые записи лога, вернуть сводку по страницам
+        forget(driver): Забыть незавершенные запросы закрытого драйвера
+        format_report(pages): Текстовый отчет
+        summary(): Статистика текущего запуска по страницам (всех процессов)
+        save(): Сохранить данные на диск
+    """
+    
+    COUNTERS = ("requests", "blocked", "bytes_loaded", "bytes_saved", "unknown_size")
+    
+    def __init__(self, path: str = settings.RESOURCES_FILE, run_dir: str = settings.RESOURCES_RUN_DIR,
+                 enabled: bool = settings.RESOURCE_REPORT, max_sizes: int = settings.RESOURCE_SIZES_LIMIT):
+        """
+        Инициализация монитора
+        
+        Args:
+            path: Путь к JSON файлу со статистикой и размерами ресурсов
+            run_dir: Каталог статистики текущего запуска
+            enabled: Разбирать performance лог
+            max_sizes: Сколько последних размеров URL хранить
+        """
+        self.path = path
+        self.run_dir = run_dir
+        self.enabled = enabled
+        self.max_sizes = max_sizes
+        self._lock = threading.Lock()
+        self._data = self._load()
+        self._delta: Dict[str, Dict[str, Any]] = {}
+        self._run: Dict[str, Dict[str, Any]] = {}
+        self._pending: Dict[int, Dict[str, Dict[str, str]]] = {}
+        self._touched_sizes: set = set()
+    
+    def _load(self) -> Dict[str, Any]:
+        """Загрузить данные с диска (пустые, если файла нет или он поврежден)"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                return {"pages": data.get("pages", {}), "sizes": data.get("sizes", {})}
+        except (OSError, ValueError):
+            pass
+        return {"pages": {}, "sizes": {}}
+    
+    @staticmethod
+    def url_key(url: str) -> str:
+        """URL без query-строки и фрагмента"""
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}{parts.path}"
+    
+    def _remember_size(self, sizes: Dict[str, int], url: str, size: int) -> None:
+        """Запомнить размер URL последним, вытеснив самые старые сверх max_sizes"""
+        sizes.pop(url, None)
+        sizes[url] = size
+        for old_url in list(sizes)[:max(0, len(sizes) - self.max_sizes)]:
+            del sizes[old_url]
+    
+    @staticmethod
+    def _content_length(response: Dict[str, Any]) -> int:
+        """Content-Length из заголовков ответа (0, если заголовка нет)"""
+        for name, value in response.get("headers", {}).items():
+            if name.lower() == "content-length":
+                try:
+                    return int(value)
+                except (TypeError, ValueError):
+                    return 0
+        return 0
+    
+    @classmethod
+    def _empty_stats(cls) -> Dict[str, Any]:
+        stats = {counter: 0 for counter in cls.COUNTERS}
+        stats["blocked_by_type"] = {}
+        return stats
+    
+    @classmethod
+    def _add(cls, target: Dict[str, Any], stats: Dict[str, Any]) -> None:
+        for counter in cls.COUNTERS:
+            target[counter] = target.get(counter, 0) + stats[counter]
+        by_type = target.setdefault("blocked_by_type", {})
+        for resource_type, count in stats["blocked_by_type"].items():
+            by_type[resource_type] = by_type.get(resource_type, 0) + count
+    
+    def collect(self, driver) -> Dict[str, Dict[str, Any]]:
+        """
+        Разобрать новые записи performance лога
+        
+        Args:
+            driver: Chrome WebDriver с включенным performance логом
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: Страница (URL документа без query) -> requests,
+            blocked, bytes_loaded, bytes_saved, unknown_size, blocked_by_type
+            (пустой словарь, если RESOURCE_REPORT выключен)
+        """
+        if not self.enabled:
+            return {}
+        try:
+            entries = driver.get_log("performance")
+        except WebDriverException:
+            return {}
+        
+        pages: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            requests = self._pending.setdefault(id(driver), {})
+            for entry in entries:
+                try:
+                    message = json.loads(entry["message"])["message"]
+                except (KeyError, ValueError):
+                    continue
+                method = message.get("method")
+                params = message.get("params", {})
+                
+                if method == "Network.requestWillBeSent":
+                    requests[params["requestId"]] = {
+                        "url": params["request"]["url"],
+                        "page": self.url_key(params.get("documentURL", "")),
+                        "type": params.get("type", "Other")
+                    }
+                    continue
+                
+                if method == "Network.responseReceived":
+                    request = requests.get(params.get("requestId"))
+                    if request is not None:
+                        request["content_length"] = self._content_length(params.get("response", {}))
+                    continue
+                
+                if method not in ("Network.loadingFinished", "Network.loadingFailed"):
+                    continue
+                request = requests.pop(params.get("requestId"), None)
+                if request is None:
+                    continue
+                
+                stats = pages.setdefault(request["page"], self._empty_stats())
+                stats["requests"] += 1
+                url = self.url_key(request["url"])
+                if method == "Network.loadingFinished":
+                    loaded = int(params.get("encodedDataLength", 0))
+                    stats["bytes_loaded"] += loaded
+                    size = loaded or request.get("content_length", 0)
+                    if size:
+                        self._remember_size(self._data["sizes"], url, size)
+                        self._touched_sizes.add(url)
+                elif params.get("blockedReason") == "inspector":
+                    stats["blocked"] += 1
+                    resource_type = params.get("type", request["type"])
+                    stats["blocked_by_type"][resource_type] = stats["blocked_by_type"].get(resource_type, 0) + 1
+                    size = self._data["sizes"].get(url)
+                    if size is None:
+                        stats["unknown_size"] += 1
+                    else:
+                        stats["bytes_saved"] += size
+            
+            for page, stats in pages.items():
+                self._add(self._data["pages"].setdefault(page, self._empty_stats()), stats)
+                self._add(self._delta.setdefault(page, self._empty_stats()), stats)
+                self._add(self._run.setdefault(page, self._empty_stats()), stats)
+        return pages
+    
+    def forget(self, driver) -> None:
+        """Забыть незавершенные запросы драйвера (вызывается при его закрытии)"""
+        with self._lock:
+            self._pending.pop(id(driver), None)
+    
+    @staticmethod
+    def format_report(pages: Dict[str, Dict[str, Any]]) -> str:
+        """
+        Текстовый отчет по страницам
+        
+        Args:
+            pages: Результат collect или summary
+            
+        Returns:
+            str: По строке на страницу
+        """
+        lines = []
+        for page, stats in sorted(pages.items(), key=lambda item: -item[1]["bytes_saved"]):
+            line = f"{page}: заблокировано {stats['blocked']} из {stats['requests']} запросов"
+            if stats["blocked_by_type"]:
+                line += " (" + ", ".join(
+                    f"{name}: {count}" for name, count in sorted(stats["blocked_by_type"].items())
+                ) + ")"
+            line += f", сэкономлено {stats['bytes_saved'] / 1024:.1f} КБ"
+            if stats["unknown_size"]:
+                line += f", размер неизвестен у {stats['unknown_size']}"
+            lines.append(line)
+        return "\n".join(lines)
+    
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Статистика текущего запуска по страницам, включая воркеры xdist
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Страница -> счетчики, по убыванию bytes_saved
+        """
+        pages: Dict[str, Dict[str, Any]] = {}
+        if os.path.isdir(self.run_dir):
+            for file_name in os.listdir(self.run_dir):
+                try:
+                    with open(os.path.join(self.run_dir, file_name), encoding="utf-8") as f:
+                        run = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                for page, stats in run.items():
+                    self._add(pages.setdefault(page, self._empty_stats()), stats)
+        return dict(sorted(pages.items(), key=lambda item: -item[1]["bytes_saved"]))
+    
+    def save(self) -> None:
+        """Сохранить изменения этого процесса в накопительный файл и статистику запуска в run_dir"""
+        with self._lock:
+            if not self._delta and not self._touched_sizes:
+                return
+            if self._run:
+                os.makedirs(self.run_dir, exist_ok=True)
+                with open(os.path.join(self.run_dir, f"{worker_id()}.json"), "w", encoding="utf-8") as f:
+                    json.dump(self._run, f, ensure_ascii=False, indent=2, sort_keys=True)
+            
+            with file_lock(self.path):
+                data = self._load()
+                for page, stats in self._delta.items():
+                    self._add(data["pages"].setdefault(page, self._empty_stats()), stats)
+                for url, size in self._data["sizes"].items():
+                    if url in self._touched_sizes:
+                        self._remember_size(data["sizes"], url, size)
+                
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.path)
+            self._data = data
+            self._delta = {}
+            self._touched_sizes = set()
+
+
+resource_monitor = ResourceMonitor()
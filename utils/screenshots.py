@@ -0,0 +1,273 @@
+import io
+import os
+import re
+import hashlib
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Any, List, Optional, Tuple
+import allure
+from selenium.common.exceptions import WebDriverException
+from config.settings import settings
+from utils.parallel import worker_id
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+FORMATS = {
+    "png": ("PNG", "png", allure.attachment_type.PNG),
+    "jpeg": ("JPEG", "jpg", allure.attachment_type.JPG),
+    "webp": ("WEBP", "webp", "image/webp")
+}
+
+
+def dhash(image, size: int = 8) -> int:
+    """
+    Перцептивный хэш кадра (difference hash)
+    
+    Кадр уменьшается до (size + 1) x size в оттенках серого, каждый бит -
+    сравнение соседних пикселей строки. Похожие кадры дают хэши с малым
+    расстоянием Хэмминга.
+    
+    Args:
+        image: Изображение PIL
+        size: Размер хэша по стороне (64 бита при size=8)
+    
+    Returns:
+        int: Хэш кадра
+    """
+    pixels = list(image.convert("L").resize((size + 1, size), Image.BILINEAR).getdata())
+    value = 0
+    for row in range(size):
+        for column in range(size):
+            left = pixels[row * (size + 1) + column]
+            right = pixels[row * (size + 1) + column + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+class ScreenshotService:
+    """
+    Фоновый конвейер скриншотов
+    
+    Тестовый поток ждет только команду снятия скриншота; декодирование,
+    проверка на дубликат, уменьшение, сжатие и запись на диск выполняются
+    в пуле потоков. Вложения в Allure добавляются в flush() из тестового
+    потока, в конце каждой фазы теста.
+    
+    Кадр, почти совпадающий (по dHash) с уже сохраненным кадром того же
+    теста, не сохраняется - его имя добавляется к имени сохраненного.
+    Кадр, снятый с dedup=False (скриншот падения), сохраняется всегда.
+    Каталог ограничен storage_limit байт: при превышении удаляются самые
+    старые кадры, уже приложенные к отчету (кадры текущего теста не
+    удаляются до flush()). Без Pillow кадры сохраняются как PNG,
+    дубликатами считаются только побайтно одинаковые.
+    
+    Methods:
+        capture(driver, name, dedup): Снять скриншот
+        flush(): Дождаться обработки и приложить кадры к отчету
+        summary(): Статистика за сессию
+        shutdown(): Остановить пул потоков
+    """
+    
+    def __init__(self, directory: str = settings.SCREENSHOTS_DIR,
+                 image_format: str = settings.SCREENSHOT_FORMAT,
+                 max_width: int = settings.SCREENSHOT_MAX_WIDTH,
+                 quality: int = settings.SCREENSHOT_QUALITY,
+                 hash_size: int = settings.SCREENSHOT_HASH_SIZE,
+                 dedup_distance: int = settings.SCREENSHOT_DEDUP_DISTANCE,
+                 storage_limit: int = int(settings.SCREENSHOT_STORAGE_LIMIT_MB * 1024 * 1024),
+                 workers: int = settings.SCREENSHOT_WORKERS):
+        """
+        Инициализация сервиса
+        
+        Args:
+            directory: Каталог для кадров
+            image_format: "png", "jpeg" или "webp"
+            max_width: Максимальная ширина кадра (0 - без уменьшения)
+            quality: Качество сжатия JPEG/WebP
+            hash_size: Размер dHash по стороне
+            dedup_distance: Максимальное расстояние dHash для дубликатов
+            storage_limit: Лимит размера каталога в байтах
+            workers: Число потоков обработки
+        
+        Raises:
+            ValueError: Если формат неизвестен
+        """
+        if image_format not in FORMATS:
+            raise ValueError(f"Неизвестный формат скриншотов '{image_format}', допустимо: {', '.join(FORMATS)}")
+        self.directory = directory
+        self.image_format = image_format if Image is not None else "png"
+        self.max_width = max_width
+        self.quality = quality
+        self.hash_size = hash_size
+        self.dedup_distance = dedup_distance
+        self.storage_limit = storage_limit
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending: List[Future] = []
+        self._kept: List[Dict[str, Any]] = []
+        self._unflushed: List[Tuple[str, int]] = []
+        self._files: deque = deque()
+        self._stored_bytes = 0
+        self._sequence = 0
+        self._stats = {"captured": 0, "duplicates": 0, "evicted": 0, "raw_bytes": 0, "written_bytes": 0}
+    
+    def capture(self, driver, name: str = "screenshot", dedup: bool = True) -> bool:
+        """
+        Снять скриншот и передать его в фоновую обработку
+        
+        Args:
+            driver: Экземпляр WebDriver
+            name: Название кадра
+            dedup: Можно ли заменить кадр почти совпадающим (False - сохранить всегда)
+        
+        Returns:
+            bool: True если скриншот снят
+        """
+        try:
+            png = driver.get_screenshot_as_png()
+        except WebDriverException:
+            return False
+        
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="screenshots")
+            self._sequence += 1
+            self._stats["captured"] += 1
+            self._stats["raw_bytes"] += len(png)
+            self._pending.append(self._executor.submit(self._process, png, name, self._sequence, dedup))
+        return True
+    
+    def _process(self, png: bytes, name: str, sequence: int, dedup: bool = True) -> Dict[str, Any]:
+        """Проверить кадр на дубликат, сжать и записать на диск (в пуле потоков)"""
+        image = Image.open(io.BytesIO(png)) if Image is not None else None
+        fingerprint = dhash(image, self.hash_size) if image is not None else hashlib.sha1(png).hexdigest()
+        
+        with self._lock:
+            original = self._find_duplicate(fingerprint) if dedup else None
+            if original is not None:
+                original["aliases"].append(name)
+                self._stats["duplicates"] += 1
+                return {"name": name, "duplicate_of": original["name"]}
+            frame = {"name": name, "fingerprint": fingerprint, "aliases": [], "path": None}
+            self._kept.append(frame)
+        
+        data = self._encode(png, image)
+        _, extension, _ = FORMATS[self.image_format]
+        safe_name = re.sub(r"[^\w.-]+", "_", name)
+        path = os.path.join(self.directory, f"{worker_id()}-{sequence:05d}-{safe_name}.{extension}")
+        os.makedirs(self.directory, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        
+        with self._lock:
+            frame["path"] = path
+            self._unflushed.append((path, len(data)))
+            self._stored_bytes += len(data)
+            self._stats["written_bytes"] += len(data)
+        return frame
+    
+    def _find_duplicate(self, fingerprint) -> Optional[Dict[str, Any]]:
+        """Найти сохраненный кадр текущего теста, почти совпадающий с новым"""
+        for frame in self._kept:
+            if isinstance(fingerprint, int):
+                if bin(frame["fingerprint"] ^ fingerprint).count("1") <= self.dedup_distance:
+                    return frame
+            elif frame["fingerprint"] == fingerprint:
+                return frame
+        return None
+    
+    def _encode(self, png: bytes, image) -> bytes:
+        """Уменьшить кадр до max_width и сжать в выбранный формат"""
+        if image is None:
+            return png
+        resized = bool(self.max_width) and image.width > self.max_width
+        if not resized and self.image_format == "png":
+            return png
+        if resized:
+            height = round(image.height * self.max_width / image.width)
+            image = image.resize((self.max_width, height), Image.LANCZOS)
+        
+        pil_format, _, _ = FORMATS[self.image_format]
+        buffer = io.BytesIO()
+        if self.image_format == "png":
+            image.save(buffer, pil_format, optimize=True)
+        else:
+            image.convert("RGB").save(buffer, pil_format, quality=self.quality)
+        return buffer.getvalue()
+    
+    def _evict(self) -> None:
+        """Удалить самые старые приложенные кадры, пока каталог больше лимита (под self._lock)"""
+        while self._stored_bytes > self.storage_limit and self._files:
+            path, size = self._files.popleft()
+            self._stored_bytes -= size
+            self._stats["evicted"] += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    def flush(self) -> int:
+        """
+        Дождаться обработки снятых кадров и приложить их к отчету Allure
+        
+        Вызывается из тестового потока; после flush() проверка на дубликаты
+        начинается заново (кадры следующего теста сравниваются только между собой).
+        
+        Returns:
+            int: Количество приложенных кадров
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+        
+        frames = []
+        for future in pending:
+            try:
+                frames.append(future.result())
+            except Exception:
+                continue
+        
+        _, extension, attachment_type = FORMATS[self.image_format]
+        attached = 0
+        for frame in frames:
+            path = frame.get("path")
+            if not path or not os.path.exists(path):
+                continue
+            name = " = ".join([frame["name"]] + frame["aliases"])
+            allure.attach.file(path, name=name, attachment_type=attachment_type, extension=extension)
+            attached += 1
+        
+        with self._lock:
+            self._kept = []
+            self._files.extend(self._unflushed)
+            self._unflushed = []
+            self._evict()
+        return attached
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Статистика скриншотов за сессию
+        
+        Returns:
+            Dict[str, Any]: captured, duplicates, evicted, raw_bytes (PNG от браузера),
+            written_bytes (записано на диск), stored_bytes (занято сейчас), format
+        """
+        with self._lock:
+            return dict(self._stats, stored_bytes=self._stored_bytes, format=self.image_format)
+    
+    def shutdown(self) -> None:
+        """Дождаться фоновой обработки и остановить пул потоков"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+screenshot_service = ScreenshotService()
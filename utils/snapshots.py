@@ -0,0 +1,199 @@
+import json
+import html
+import time
+import threading
+from collections import deque
+from typing import Dict, Any, List, Optional
+import allure
+from selenium.common.exceptions import WebDriverException
+from config.settings import settings
+from utils.js_scripts import PAGE_SNAPSHOT
+from utils.command_interceptor import instrumentation
+
+
+class SnapshotBuffer:
+    """
+    Кольцевой буфер легких снимков состояния страницы
+    
+    После каждого шага page object верхнего уровня (слушатель шагов
+    профилировщика, on_step_end) в буфер записывается снимок: URL и
+    дайджест DOM, хвост консоли браузера и миниатюра JPEG через CDP.
+    Хранятся только последние size снимков. При падении теста буфер
+    прикладывается к Allure (flush), иначе отбрасывается (discard).
+    Буфер свой у каждого потока.
+    
+    Снимок стоит до трех команд WebDriver на шаг (скрипт, лог консоли,
+    миниатюра CDP); они помечены как служебные (instrumentation) и не
+    учитываются в трассе команд, бюджете и профиле шагов.
+    
+    Methods:
+        start(): Начать запись снимков теста
+        on_step_end(page, step, failed): Снимок после шага
+        snapshot(driver, step, failed): Снять снимок
+        flush(): Приложить буфер к отчету
+        discard(): Очистить буфер
+    """
+    
+    def __init__(self, size: int = settings.SNAPSHOT_BUFFER_SIZE,
+                 console_lines: int = settings.SNAPSHOT_CONSOLE_LINES,
+                 thumbnail_scale: float = settings.SNAPSHOT_THUMBNAIL_SCALE,
+                 thumbnail_quality: int = settings.SNAPSHOT_THUMBNAIL_QUALITY):
+        """
+        Инициализация буфера
+        
+        Args:
+            size: Количество хранимых снимков
+            console_lines: Количество последних сообщений консоли в снимке
+            thumbnail_scale: Масштаб миниатюры относительно окна (0 - без миниатюр)
+            thumbnail_quality: Качество JPEG миниатюры
+        """
+        self.size = size
+        self.console_lines = console_lines
+        self.thumbnail_scale = thumbnail_scale
+        self.thumbnail_quality = thumbnail_quality
+        self._local = threading.local()
+    
+    @property
+    def active(self) -> bool:
+        """Идет запись снимков теста в текущем потоке"""
+        return getattr(self._local, "snapshots", None) is not None
+    
+    def start(self) -> None:
+        """Начать запись снимков теста"""
+        self._local.snapshots = deque(maxlen=self.size)
+        self._local.console = deque(maxlen=self.console_lines)
+        self._local.started = time.perf_counter()
+        self._local.driver = None
+    
+    def on_step_end(self, page, step: str, failed: bool) -> None:
+        """Снять снимок после шага page object верхнего уровня"""
+        if self.active:
+            self.snapshot(page.driver, step, failed)
+    
+    def snapshot(self, driver, step: str, failed: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Снять снимок состояния страницы и добавить его в буфер
+        
+        Args:
+            driver: Экземпляр WebDriver
+            step: Имя шага, после которого снят снимок
+            failed: Шаг завершился исключением
+        
+        Returns:
+            Optional[Dict[str, Any]]: Снимок или None, если запись не начата
+        """
+        if not self.active:
+            return None
+        self._local.driver = driver
+        
+        with instrumentation():
+            try:
+                dom = driver.execute_script(PAGE_SNAPSHOT) or {}
+            except WebDriverException as e:
+                dom = {"error": e.msg or type(e).__name__}
+            snapshot = {
+                "step": step,
+                "failed": failed,
+                "time": round(time.perf_counter() - self._local.started, 3),
+                "dom": dom,
+                "console": self._console_tail(driver),
+                "thumbnail": self._thumbnail(driver, dom)
+            }
+        self._local.snapshots.append(snapshot)
+        return snapshot
+    
+    def _console_tail(self, driver) -> List[str]:
+        """Дочитать новые сообщения консоли браузера и вернуть последние console_lines"""
+        console = self._local.console
+        try:
+            for entry in driver.get_log("browser"):
+                console.append(f"{entry.get('level', '')} {entry.get('message', '')}")
+        except (WebDriverException, ValueError):
+            pass
+        return list(console)
+    
+    def _thumbnail(self, driver, dom: Dict[str, Any]) -> Optional[str]:
+        """Миниатюра окна в JPEG (base64) через CDP Page.captureScreenshot"""
+        if not self.thumbnail_scale or not dom.get("width"):
+            return None
+        params = {
+            "format": "jpeg",
+            "quality": self.thumbnail_quality,
+            "clip": {"x": 0, "y": 0, "width": dom["width"], "height": dom["height"], "scale": self.thumbnail_scale}
+        }
+        try:
+            return driver.execute_cdp_cmd("Page.captureScreenshot", params)["data"]
+        except (WebDriverException, AttributeError, KeyError):
+            return None
+    
+    def flush(self, name: str = "Snapshots") -> int:
+        """
+        Приложить снимки к отчету Allure и очистить буфер
+        
+        Перед вложением снимается финальный снимок (состояние на момент
+        падения), если в тесте уже был драйвер.
+        
+        Args:
+            name: Название вложения
+        
+        Returns:
+            int: Количество приложенных снимков
+        """
+        if not self.active:
+            return 0
+        if self._local.driver is not None:
+            self.snapshot(self._local.driver, "failure")
+        snapshots = list(self._local.snapshots)
+        self.discard()
+        if not snapshots:
+            return 0
+        
+        allure.attach(format_snapshots(snapshots), name=name, attachment_type=allure.attachment_type.HTML)
+        return len(snapshots)
+    
+    def discard(self) -> None:
+        """Отбросить снимки и закончить запись"""
+        self._local.snapshots = None
+        self._local.console = None
+        self._local.driver = None
+
+
+snapshot_buffer = SnapshotBuffer()
+
+
+def format_snapshots(snapshots: List[Dict[str, Any]]) -> str:
+    """
+    HTML отчет по снимкам: шаг, дайджест DOM, консоль и миниатюра
+    
+    Args:
+        snapshots: Снимки в порядке записи
+    
+    Returns:
+        str: HTML документ
+    """
+    rows = []
+    for snapshot in snapshots:
+        dom = {key: value for key, value in snapshot["dom"].items() if key not in ("width", "height")}
+        image = (
+            f'<img src="data:image/jpeg;base64,{snapshot["thumbnail"]}">' if snapshot["thumbnail"] else ""
+        )
+        status = "✗" if snapshot["failed"] else ""
+        console = "\n".join(snapshot["console"])
+        rows.append(
+            "<tr>"
+            f"<td>{snapshot['time']:.3f} c</td>"
+            f"<td>{status} {html.escape(snapshot['step'])}</td>"
+            f"<td><pre>{html.escape(json.dumps(dom, ensure_ascii=False, indent=1))}</pre></td>"
+            f"<td><pre>{html.escape(console)}</pre></td>"
+            f"<td>{image}</td>"
+            "</tr>"
+        )
+    return (
+        "<html><head><meta charset='utf-8'><style>"
+        "table{border-collapse:collapse;font:12px monospace}td,th{border:1px solid #ccc;padding:4px;"
+        "vertical-align:top}pre{margin:0;white-space:pre-wrap;max-width:480px}"
+        "</style></head><body><table>"
+        "<tr><th>Время</th><th>Шаг</th><th>DOM</th><th>Консоль</th><th>Миниатюра</th></tr>"
+        + "".join(rows)
+        + "</table></body></html>"
+    )
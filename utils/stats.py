@@ -0,0 +1,47 @@
+import math
+from typing import Dict, Iterable, List, Sequence
+
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    """
+    Вычислить перцентиль с линейной интерполяцией
+    
+    Args:
+        values: Набор значений
+        percent: Перцентиль от 0 до 100
+        
+    Returns:
+        float: Значение перцентиля (0.0 для пустого набора)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * percent / 100.0
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return float(ordered[int(rank)])
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(values: Iterable[float], percents: List[float] = (50, 95, 99)) -> Dict[str, float]:
+    """
+    Сводка по набору значений: количество, минимум, максимум, среднее и перцентили
+    
+    Args:
+        values: Набор значений
+        percents: Перцентили для расчета
+        
+    Returns:
+        Dict[str, float]: Ключи count, min, max, mean и p50, p95, ...
+    """
+    ordered = sorted(values)
+    summary = {
+        "count": len(ordered),
+        "min": ordered[0] if ordered else 0.0,
+        "max": ordered[-1] if ordered else 0.0,
+        "mean": sum(ordered) / len(ordered) if ordered else 0.0
+    }
+    for percent in percents:
+        summary[f"p{percent:g}".replace(".", "")] = percentile(ordered, percent)
+    return summary
@@ -0,0 +1,200 @@
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+from config.settings import settings
+from utils.stats import summarize
+from utils.file_lock import file_lock
+
+
+class TimingStore:
+    """
+    Хранилище наблюдаемых длительностей ожиданий
+    
+    Ключ записи - "хост|страница|локатор|исход", где исход "found" или
+    "timeout", а хост берется из текущего settings.BASE_URL без порта:
+    задержки сервера воспроизведения или локального сайта не укорачивают
+    ожидания на живом сайте, а случайный порт локального сервера не
+    создает новый ключ в каждом запуске. Для каждого ключа хранятся последние TIMING_MAX_SAMPLES
+    значений, по которым считаются p50/p95/p99 и предлагается таймаут ожидания.
+    
+    Methods:
+        record(page, locator, outcome, elapsed): Учесть длительность ожидания
+        suggest_timeout(page, locator, default): Таймаут по наблюдаемым задержкам
+        summary(): Перцентили по всем ключам
+        save(): Сохранить данные на диск
+    """
+    
+    def __init__(self, path: str = settings.TIMINGS_FILE, max_samples: int = settings.TIMING_MAX_SAMPLES):
+        """
+        Инициализация хранилища
+        
+        Args:
+            path: Путь к JSON файлу с длительностями
+            max_samples: Количество последних значений на ключ
+        """
+        self.path = path
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._data: Dict[str, List[float]] = self._load()
+        self._touched: set = set()
+    
+    def _load(self) -> Dict[str, List[float]]:
+        """Загрузить данные с диска (пустой словарь, если файла нет или он поврежден)"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+    
+    @staticmethod
+    def key(page: str, locator: str, outcome: str) -> str:
+        """Ключ записи вида "www.chitai-gorod.ru|SearchPage|xpath=//div|found\""""
+        return f"{urlsplit(settings.BASE_URL).hostname}|{page}|{locator}|{outcome}"
+    
+    def samples(self, page: str, locator: str, outcome: str) -> List[float]:
+        """
+        Получить наблюдаемые длительности
+        
+        Args:
+            page: Имя класса страницы
+            locator: Строковое представление локатора или ожидания
+            outcome: "found" или "timeout"
+            
+        Returns:
+            List[float]: Длительности в секундах
+        """
+        return self._data.get(self.key(page, locator, outcome), [])
+    
+    def record(self, page: str, locator: str, outcome: str, elapsed: float) -> None:
+        """
+        Учесть длительность ожидания
+        
+        Args:
+            page: Имя класса страницы
+            locator: Строковое представление локатора или ожидания
+            outcome: "found" или "timeout"
+            elapsed: Длительность в секундах
+        """
+        key = self.key(page, locator, outcome)
+        with self._lock:
+            samples = self._data.setdefault(key, [])
+            samples.append(round(elapsed, 4))
+            del samples[:-self.max_samples]
+            self._touched.add(key)
+    
+    def suggest_timeout(self, page: str, locator: str, default: float) -> float:
+        """
+        Предложить таймаут ожидания по наблюдаемым задержкам
+        
+        Когда по ключу накоплено TIMING_MIN_SAMPLES исходов (найден или
+        таймаут), таймаут равен p99 времени появления с запасом
+        TIMEOUT_SAFETY_MARGIN, но не меньше TIMEOUT_FLOOR. Для отрицательных
+        проверок, где элемент почти никогда не появляется, это TIMEOUT_FLOOR,
+        который расширяется только поздними успешными ожиданиями из истории.
+        Таймаут никогда не превышает заданный вызывающим кодом.
+        
+        Args:
+            page: Имя класса страницы
+            locator: Строковое представление локатора или ожидания
+            default: Таймаут, заданный вызывающим кодом
+            
+        Returns:
+            float: Таймаут в секундах
+        """
+        found = self.samples(page, locator, "found")
+        observed = len(found) + len(self.samples(page, locator, "timeout"))
+        if observed < settings.TIMING_MIN_SAMPLES:
+            return default
+        
+        learned = summarize(found)["p99"] * settings.TIMEOUT_SAFETY_MARGIN if found else 0.0
+        return min(default, max(settings.TIMEOUT_FLOOR, learned))
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Перцентили по всем ключам
+        
+        Returns:
+            Dict[str, Dict[str, float]]: count, min, max, mean, p50, p95, p99 по ключам
+        """
+        return {key: summarize(samples) for key, samples in sorted(self._data.items())}
+    
+    def save(self) -> None:
+        """
+        Сохранить на диск ключи, обновленные в этом процессе
+        
+        Слияние с файлом идет под межпроцессной блокировкой, поэтому
+        параллельные воркеры не затирают замеры друг друга.
+        """
+        with self._lock:
+            if not self._touched:
+                return
+            with file_lock(self.path):
+                data = self._load()
+                for key in self._touched:
+                    data[key] = self._data[key]
+                
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, sort_keys=True)
+                os.replace(tmp_path, self.path)
+
+
+class TimeBudget:
+    """
+    Общий бюджет времени на ожидания в рамках одного теста
+    
+    Methods:
+        start(seconds): Начать отсчет бюджета
+        stop(): Снять ограничение
+        remaining(): Оставшееся время
+        clamp(timeout): Ограничить таймаут остатком бюджета
+    """
+    
+    def __init__(self):
+        self._deadline: Optional[float] = None
+    
+    def start(self, seconds: Optional[float]) -> None:
+        """
+        Начать отсчет бюджета
+        
+        Args:
+            seconds: Бюджет в секундах (None или 0 - без ограничения)
+        """
+        self._deadline = time.monotonic() + seconds if seconds else None
+    
+    def stop(self) -> None:
+        """Снять ограничение"""
+        self._deadline = None
+    
+    def remaining(self) -> Optional[float]:
+        """
+        Оставшееся время
+        
+        Returns:
+            Optional[float]: Секунды до конца бюджета или None без ограничения
+        """
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+    
+    def clamp(self, timeout: float) -> float:
+        """
+        Ограничить таймаут остатком бюджета
+        
+        Args:
+            timeout: Желаемый таймаут в секундах
+            
+        Returns:
+            float: Таймаут не больше оставшегося бюджета
+        """
+        remaining = self.remaining()
+        return timeout if remaining is None else min(timeout, remaining)
+
+
+timing_store = TimingStore()
+test_budget = TimeBudget()
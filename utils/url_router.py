@@ -0,0 +1,95 @@
+from typing import Dict, Optional
+from urllib.parse import quote, urljoin
+from config.settings import settings
+
+
+NAVIGATION_MODES = ("ui", "fast")
+
+
+class UrlRouter:
+    """
+    Адреса логических страниц сайта для прямых переходов
+    
+    В режиме "fast" page object и тесты переходят к странице, путь к
+    которой через интерфейс не проверяется, сразу по адресу: результаты
+    поиска, карточка товара, корзина. В режиме "ui" (по умолчанию)
+    используется прежний путь через главную страницу и поле поиска.
+    
+    Адреса строятся от settings.BASE_URL в момент вызова: conftest и
+    бенчмарки подменяют BASE_URL (сервер воспроизведения, локальный сайт)
+    после импорта модуля.
+    
+    Methods:
+        home(), search(query), product(slug), cart(): Адрес страницы
+    """
+    
+    def __init__(self, base_url: Optional[str] = None, mode: str = settings.NAVIGATION_MODE,
+                 routes: Optional[Dict[str, str]] = None):
+        """
+        Инициализация маршрутизатора
+        
+        Args:
+            base_url: Адрес сайта (по умолчанию текущий settings.BASE_URL)
+            mode: "ui" или "fast"
+            routes: Шаблоны адресов по страницам (по умолчанию settings.ROUTES)
+        
+        Raises:
+            ValueError: Если режим неизвестен
+        """
+        if mode not in NAVIGATION_MODES:
+            raise ValueError(f"Неизвестный режим NAVIGATION_MODE: {mode}")
+        self._base_url = base_url
+        self.mode = mode
+        self.routes = routes if routes is not None else settings.ROUTES
+    
+    @property
+    def base_url(self) -> str:
+        """Адрес сайта без завершающего "/" """
+        return (self._base_url or settings.BASE_URL).rstrip("/")
+    
+    @property
+    def fast(self) -> bool:
+        """Прямые переходы по адресу вместо пути через интерфейс"""
+        return self.mode == "fast"
+    
+    def _url(self, route: str, **params: str) -> str:
+        """Подставить экранированные параметры в шаблон страницы"""
+        values = {key: quote(str(value), safe="") for key, value in params.items()}
+        return urljoin(self.base_url + "/", self.routes[route].format(**values).lstrip("/"))
+    
+    def home(self) -> str:
+        """Адрес главной страницы"""
+        return self._url("home")
+    
+    def search(self, query: str) -> str:
+        """
+        Адрес результатов поиска
+        
+        Args:
+            query: Поисковый запрос
+        
+        Returns:
+            str: Адрес страницы поиска
+        """
+        return self._url("search", query=query)
+    
+    def product(self, slug: str) -> str:
+        """
+        Адрес карточки товара
+        
+        Args:
+            slug: Идентификатор товара из адреса или полный href ссылки на товар
+        
+        Returns:
+            str: Адрес карточки товара
+        """
+        if slug.startswith(("http://", "https://", "/")):
+            return urljoin(self.base_url + "/", slug)
+        return self._url("product", slug=slug)
+    
+    def cart(self) -> str:
+        """Адрес корзины"""
+        return self._url("cart")
+
+
+url_router = UrlRouter()
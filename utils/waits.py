@@ -0,0 +1,148 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.common.exceptions import (
+    TimeoutException, WebDriverException, JavascriptException, StaleElementReferenceException
+)
+from config.settings import settings
+from utils.js_scripts import MUTATION_WAIT
+
+
+def locators_spec(locators: List[Tuple[str, str]], condition: str = "present",
+                  text: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Условие: найден элемент по одному из локаторов
+    
+    Args:
+        locators: Список кортежей (By, locator) в порядке приоритета
+        condition: "present", "visible" или "clickable"
+        text: Подстрока, которую должен содержать текст элемента
+        
+    Returns:
+        Dict[str, Any]: Описание условия для MutationWait
+    """
+    return {
+        "type": "locators",
+        "locators": [list(locator) for locator in locators],
+        "condition": condition,
+        "text": text
+    }
+
+
+def ready_state_spec(states: List[str]) -> Dict[str, Any]:
+    """
+    Условие: document.readyState принял одно из значений
+    
+    Args:
+        states: Допустимые значения readyState
+        
+    Returns:
+        Dict[str, Any]: Описание условия для MutationWait
+    """
+    return {"type": "ready_state", "states": list(states)}
+
+
+def url_contains_spec(values: List[str]) -> Dict[str, Any]:
+    """
+    Условие: URL страницы содержит одну из подстрок (без учета регистра)
+    
+    Args:
+        values: Подстроки URL
+        
+    Returns:
+        Dict[str, Any]: Описание условия для MutationWait
+    """
+    return {"type": "url_contains", "values": [value.lower() for value in values]}
+
+
+def any_spec(*specs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Условие: выполнено хотя бы одно из условий
+    
+    Returns:
+        Dict[str, Any]: Описание условия для MutationWait
+    """
+    return {"type": "any", "conditions": list(specs)}
+
+
+class MutationWait:
+    """
+    Ожидание условия в браузере по событиям MutationObserver
+    
+    В отличие от WebDriverWait, который каждые 500 мс отправляет отдельную
+    команду в chromedriver, условие проверяется внутри страницы при каждом
+    изменении DOM, а Python ждет один блокирующий вызов execute_async_script.
+    
+    Methods:
+        until(spec, message): Дождаться выполнения условия
+    """
+    
+    NAVIGATION_RETRY_DELAY: float = 0.1
+    NAVIGATION_ERRORS = (JavascriptException, StaleElementReferenceException)
+    NAVIGATION_MESSAGES = ("document unloaded", "script timeout")
+    
+    def __init__(self, driver: WebDriver, timeout: float):
+        """
+        Инициализация ожидания
+        
+        Args:
+            driver: WebDriver instance
+            timeout: Время ожидания в секундах
+        """
+        self.driver = driver
+        self.timeout = timeout
+    
+    def until(self, spec: Dict[str, Any], message: str = "") -> Any:
+        """
+        Дождаться выполнения условия
+        
+        Если во время ожидания страница перезагрузилась (скрипт прерывается
+        навигацией), ожидание продолжается на новой странице в пределах
+        оставшегося времени. Остальные ошибки WebDriver (закрытая сессия,
+        закрытое окно) пробрасываются сразу, а не превращаются в таймаут.
+        
+        Args:
+            spec: Описание условия (locators_spec, ready_state_spec, ...)
+            message: Сообщение для TimeoutException
+            
+        Returns:
+            Any: Результат условия ([элемент, индекс] для локаторов, иначе True)
+            
+        Raises:
+            TimeoutException: Если условие не выполнилось за timeout
+            WebDriverException: Ошибка, не связанная с навигацией
+        """
+        deadline = time.monotonic() + self.timeout
+        script_timeout_raised = self.timeout + 1 > settings.SCRIPT_TIMEOUT
+        if script_timeout_raised:
+            self.driver.set_script_timeout(self.timeout + 1)
+        
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    result = self.driver.execute_async_script(MUTATION_WAIT, spec, max(int(remaining * 1000), 0))
+                    if result:
+                        return result
+                    break
+                except TimeoutException:
+                    break
+                except WebDriverException as e:
+                    if not self._is_navigation_error(e):
+                        raise
+                    if time.monotonic() + self.NAVIGATION_RETRY_DELAY >= deadline:
+                        break
+                    time.sleep(self.NAVIGATION_RETRY_DELAY)
+        finally:
+            if script_timeout_raised:
+                self.driver.set_script_timeout(settings.SCRIPT_TIMEOUT)
+        
+        raise TimeoutException(message)
+    
+    @classmethod
+    def _is_navigation_error(cls, error: WebDriverException) -> bool:
+        """Ошибка скрипта из-за смены документа (повторяется на новой странице)"""
+        if isinstance(error, cls.NAVIGATION_ERRORS):
+            return True
+        message = (error.msg or "").lower()
+        return any(fragment in message for fragment in cls.NAVIGATION_MESSAGES)